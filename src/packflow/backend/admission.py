@@ -0,0 +1,228 @@
+import random
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .batching import AdaptiveBatchSizer
+from .configuration import AdmissionConfig, SheddingPolicies
+
+
+class AdmissionQueue:
+    """
+    Bounded queue between a source of work and the inference backend.
+
+    When the queue is full, the configured policy decides what happens to new items:
+
+      - ``block``: the producer waits for room (backpressure), optionally up to
+        ``block_timeout_s`` after which the item is shed with reason ``"timeout"``
+      - ``drop_oldest``: the oldest queued item is shed to make room
+      - ``drop_newest``: the new item is shed
+      - ``sample``: the new item is admitted with probability ``sample_rate``, shedding
+        the oldest queued item; otherwise the new item is shed
+
+    Without a ``max_queue_size`` the queue is unbounded and never sheds.
+
+    Parameters
+    ----------
+    config : AdmissionConfig
+
+    on_shed : Callable[[Any, str], None], optional
+        Called with every shed item and the reason it was shed
+
+    weight : Callable[[Any], int], optional
+        Number of records an item represents (e.g. the size of a batch), used for the
+        shed counters. Defaults to one record per item.
+    """
+
+    def __init__(
+        self,
+        config: Optional[AdmissionConfig] = None,
+        on_shed: Optional[Callable[[Any, str], None]] = None,
+        weight: Optional[Callable[[Any], int]] = None,
+    ):
+        self.config = config or AdmissionConfig()
+        self.on_shed = on_shed
+        self.weight = weight or (lambda item: 1)
+
+        self.shed_records = Counter()
+        self.last_wait_ms = 0.0
+
+        self._items = deque()
+        self._closed = False
+        self._random = random.Random()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def __repr__(self):  # pragma: no cover
+        return f"{self.__class__.__name__}(depth={len(self)}, policy={self.config.policy.value})"
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _full(self) -> bool:
+        return (
+            self.config.max_queue_size is not None
+            and len(self._items) >= self.config.max_queue_size
+        )
+
+    def put(self, item: Any) -> bool:
+        """
+        Offer an item to the queue.
+
+        Returns
+        -------
+        bool
+            True if the item was admitted, False if it was shed or the queue is closed
+        """
+        shed = []
+        admitted = True
+        with self._lock:
+            if self._closed:
+                return False
+
+            if self._full():
+                policy = self.config.policy
+                if policy == SheddingPolicies.BLOCK:
+                    deadline = (
+                        None
+                        if self.config.block_timeout_s is None
+                        else time.monotonic() + self.config.block_timeout_s
+                    )
+                    while self._full() and not self._closed:
+                        remaining = (
+                            None if deadline is None else deadline - time.monotonic()
+                        )
+                        if remaining is not None and remaining <= 0:
+                            break
+                        self._not_full.wait(remaining)
+                    if self._closed:
+                        return False
+                    if self._full():
+                        shed.append((item, "timeout"))
+                        admitted = False
+                elif policy == SheddingPolicies.DROP_NEWEST:
+                    shed.append((item, "drop_newest"))
+                    admitted = False
+                elif policy == SheddingPolicies.DROP_OLDEST:
+                    shed.append((self._items.popleft()[1], "drop_oldest"))
+                elif self._random.random() < self.config.sample_rate:
+                    shed.append((self._items.popleft()[1], "sampled"))
+                else:
+                    shed.append((item, "sampled"))
+                    admitted = False
+
+            if admitted:
+                self._items.append((time.monotonic(), item))
+                self._not_empty.notify()
+
+            for shed_item, reason in shed:
+                self.shed_records[reason] += self.weight(shed_item)
+
+        for shed_item, reason in shed:
+            if self.on_shed is not None:
+                self.on_shed(shed_item, reason)
+
+        return admitted
+
+    def get_batch(self, max_items: int, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Take up to ``max_items`` items from the queue without waiting to fill the batch.
+
+        Blocks until at least one item is available, the queue is closed, or the timeout
+        expires.
+
+        Returns
+        -------
+        List[Any]
+            The items, oldest first. Empty if the queue is closed and drained, or on timeout.
+        """
+        with self._lock:
+            if not self._items and not self._closed:
+                self._not_empty.wait_for(
+                    lambda: self._items or self._closed, timeout=timeout
+                )
+
+            n_items = min(max_items, len(self._items))
+            if not n_items:
+                return []
+
+            now = time.monotonic()
+            self.last_wait_ms = round((now - self._items[0][0]) * 1000, 5)
+            batch = [self._items.popleft()[1] for _ in range(n_items)]
+            self._not_full.notify_all()
+
+        return batch
+
+    def close(self):
+        """Stop admitting items. Items already queued can still be taken."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Current queue depth, the wait of the last batch taken, and shed counts by reason."""
+        return dict(
+            queue_depth=len(self._items),
+            queue_wait_ms=self.last_wait_ms,
+            shed_records=dict(self.shed_records),
+        )
+
+
+def admitted_batches(
+    records: Iterable[dict], queue: AdmissionQueue, sizer: AdaptiveBatchSizer
+) -> Iterator[List[dict]]:
+    """
+    Micro-batch a source of records through an admission queue.
+
+    A background thread pulls records from the source into the queue, so the source is only
+    slowed down (``block``) or shed from (other policies) when the backend falls behind.
+
+    Parameters
+    ----------
+    records : Iterable[dict]
+        Source of input records
+
+    queue : AdmissionQueue
+
+    sizer : AdaptiveBatchSizer
+        Controller deciding the maximum size of each batch
+
+    Yields
+    ------
+    List[dict]
+        Batches of admitted records
+    """
+    errors = []
+
+    def produce():
+        try:
+            for record in records:
+                if queue.closed:
+                    return
+                queue.put(record)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            queue.close()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            batch = queue.get_batch(sizer.batch_size)
+            if not batch:
+                break
+            yield batch
+    finally:
+        queue.close()
+
+    if errors:
+        raise errors[0]
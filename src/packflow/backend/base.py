@@ -1,16 +1,65 @@
+import functools
+import itertools
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, List, Union
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 
 import packflow.exceptions as exceptions
 from packflow.logger import get_logger
-
-from .configuration import BackendConfig, load_backend_configuration
-from .metrics import ExecutionMetrics
+from packflow.utils import RecordView, columns_to_records
+
+from .admission import AdmissionQueue, admitted_batches
+from .batching import AdaptiveBatchSizer, micro_batches
+from .concurrency import SubBatchPool, batch_length, concat_batches, split_batch
+from .configuration import (
+    BackendConfig,
+    ErrorModes,
+    OutputModes,
+    load_backend_configuration,
+)
+from .metrics import AggregatedMetrics, CallMetrics, ExecutionMetrics
 from .preprocessors import get_preprocessor
-from .validation import InferenceBackendValidator
+from .validation import InferenceBackendValidator, OutputGuard
+from .watchdog import Watchdog
+
+# The backend whose call is in progress in the current context, and the metrics of the call
+_call_metrics: ContextVar[Optional[Tuple["InferenceBackend", CallMetrics]]] = (
+    ContextVar("packflow_call_metrics", default=None)
+)
+
+# A backend and the metrics measured outside of it, recorded in its calls in the current context
+_reported_metrics: ContextVar[Optional[Tuple["InferenceBackend", Dict[str, Any]]]] = (
+    ContextVar("packflow_reported_metrics", default=None)
+)
+
+# Artifacts shared by the backends built in the current context, by name
+_shared_artifacts: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "packflow_shared_artifacts", default=None
+)
+
+
+@contextmanager
+def share_artifacts(artifacts: Dict[str, Any]):
+    """
+    Share the artifacts loaded with :meth:`InferenceBackend.shared_artifact` between the
+    backends built within the context, e.g. the replicas of a
+    :class:`~packflow.serving.ReplicaPool`.
+
+    Parameters
+    ----------
+    artifacts : Dict[str, Any]
+        The artifacts loaded so far, by name. It is filled as backends load artifacts.
+    """
+    token = _shared_artifacts.set(artifacts)
+    try:
+        yield artifacts
+    finally:
+        _shared_artifacts.reset(token)
 
 
 class InferenceBackend(ABC):
@@ -18,11 +67,37 @@ class InferenceBackend(ABC):
 
     backend_config_model: BackendConfig | type[BackendConfig] = BackendConfig
 
+    #: Whether several calls can run concurrently on a single instance (e.g. from a thread
+    #: pool). Set it to True when the user-defined steps do not mutate shared state, for
+    #: instance when ``execute`` only runs a model that releases the GIL.
+    thread_safe: bool = False
+
     def __init__(self, **kwargs):
         self.logger = get_logger()
         self.config = load_backend_configuration(self.backend_config_model, **kwargs)
         self._preprocessor = get_preprocessor(self.config)
-        self._execution_metrics = dict(execution_times={})
+        # Metrics of the latest completed call. Each call records into its own CallMetrics,
+        # found through a context variable, and publishes it here when it completes.
+        self._execution_metrics = CallMetrics()
+        # Metrics of the latest completed calls, appended without any lock
+        self._completed_calls = deque(maxlen=self.config.metrics_window)
+        self._verbose_calls = itertools.count(1)
+        self._verbose_logged_at = float("-inf")
+        self._batch_sizer = AdaptiveBatchSizer(self.config.batching)
+        self._output_guard = (
+            OutputGuard(self.config.output_guard)
+            if self.config.output_guard.enabled
+            else None
+        )
+        deadlines = self.config.deadlines
+        self._watchdog = None
+        if deadlines.call_ms is not None or deadlines.stages:
+            self._watchdog = Watchdog(deadlines)
+        self._sub_batch_pool = (
+            SubBatchPool(self.config.concurrency)
+            if self.config.concurrency.max_workers > 1
+            else None
+        )
         self._initialize()
 
     def __repr__(self):  # pragma: no cover
@@ -56,37 +131,418 @@ class InferenceBackend(ABC):
 
         inputs = [inputs] if input_is_dict else inputs
 
-        self._execution_metrics["batch_size"] = len(inputs)
+        outputs, _ = self._call(self._run_records, inputs)
+
+        if input_is_dict:
+            outputs = outputs[0]
+
+        return outputs
+
+    @property
+    def _metrics(self) -> CallMetrics:
+        """The metrics of the call in progress in the current context."""
+        current = _call_metrics.get()
+        if current is not None and current[0] is self:
+            return current[1]
+        return self._execution_metrics
+
+    def _call(self, method: Callable, data: Any) -> Tuple[List[dict], CallMetrics]:
+        """Run a pipeline call with its own metrics, published once the call completes.
+
+        Calls can run concurrently: each one records into a separate :class:`CallMetrics`
+        held in a context variable, and the latest completed call replaces
+        ``_execution_metrics`` with a single reference assignment, without any lock. Completed
+        calls are also appended to a bounded deque, which is atomic, for
+        :meth:`get_aggregated_metrics`.
+        """
+        metrics = CallMetrics()
+        reported = _reported_metrics.get()
+        if reported is not None and reported[0] is self:
+            metrics.update(**reported[1])
+        token = _call_metrics.set((self, metrics))
+        if self._watchdog is not None:
+            self._watchdog.start_call()
+        try:
+            outputs = method(data)
+        finally:
+            if self._watchdog is not None:
+                self._watchdog.end_call()
+            _call_metrics.reset(token)
+
+        self._execution_metrics = metrics
+        self._completed_calls.append(metrics)
+        return outputs, metrics
+
+    @contextmanager
+    def report_metrics(self, **metrics):
+        """Record metrics measured outside of the backend in the calls made within the context.
+
+        Callers that queue requests for the backend (e.g. the worker server) use it to report
+        their queue metrics with the call that runs each request, even when other calls run
+        concurrently.
+
+        Parameters
+        ----------
+        **metrics
+            Fields of :class:`ExecutionMetrics`, e.g. ``queue_depth`` or ``queue_wait_ms``
+
+        Examples
+        --------
+        >>> with backend.report_metrics(**queue.metrics()):
+        ...     outputs = backend(records)
+        """
+        token = _reported_metrics.set((self, metrics))
+        try:
+            yield
+        finally:
+            _reported_metrics.reset(token)
+
+    def _run_records(self, inputs: List[dict]) -> List[dict]:
+        """Run the pipeline on a batch of records, according to ``error_mode``."""
+        if self.config.error_mode is ErrorModes.ISOLATE:
+            return self._isolate_errors(inputs)
+        return self._process_records(inputs)
+
+    def _process_records(self, inputs: List[dict]) -> List[dict]:
+        """Run the entire pipeline, including the preprocessor, on a batch of records."""
+        self._metrics.batch_size = len(inputs)
 
         preprocessed = self._execute_and_profile_step(self._preprocess, inputs)
 
-        if hasattr(self, "transform_inputs"):
-            features = self._execute_and_profile_step(
-                self.transform_inputs, preprocessed
+        return self._run_pipeline(preprocessed, inputs)
+
+    def _isolate_errors(self, inputs: List[dict]) -> List[dict]:
+        """Run the pipeline on a batch of records, isolating the records that fail.
+
+        The batch is run as a whole first. If it fails, it is split in halves that are run
+        separately, recursively, until the failing records are isolated. Each of them is
+        replaced by an error record, while the rest of the batch is processed in sub-batches
+        that are as large as possible. The number of isolated records and of additional
+        pipeline calls are reported in the metrics, and execution times are summed over all
+        calls.
+
+        Timeouts are not split: when a deadline expires, isolation stops and every record
+        that has no output yet is replaced by an error record for the timeout.
+        """
+        metrics = self._metrics
+        times = {}
+        n_calls = 0
+        n_isolated = 0
+
+        def run(batch):
+            nonlocal n_calls
+            n_calls += 1
+            try:
+                outputs = self._process_records(batch)
+                if len(outputs) != len(batch):
+                    raise exceptions.InferenceBackendRuntimeError(
+                        f"Expected {len(batch)} outputs, received {len(outputs)}"
+                    )
+                return outputs
+            finally:
+                for step, time_ms in metrics.execution_times.items():
+                    times[step] = times.get(step, 0.0) + time_ms
+                metrics.execution_times = {}
+
+        outputs = [None] * len(inputs)
+        # Stack of failed sub-batches, as (start index, end index, error)
+        failed = []
+        timeout = None
+        try:
+            outputs = run(inputs)
+        except exceptions.InferenceBackendTimeoutError as e:
+            timeout = e
+        except exceptions.InferenceBackendRuntimeError as e:
+            failed.append((0, len(inputs), e))
+        layout_counts = metrics.layout_counts
+
+        while failed and timeout is None:
+            start, end, error = failed.pop()
+            if end - start == 1:
+                outputs[start] = self._error_record(inputs[start], error)
+                n_isolated += 1
+                self.logger.warning(
+                    f"Isolated the record at index {start} of the batch: {error}"
+                )
+                continue
+            middle = (start + end) // 2
+            for sub_start, sub_end in ((start, middle), (middle, end)):
+                try:
+                    outputs[sub_start:sub_end] = run(inputs[sub_start:sub_end])
+                except exceptions.InferenceBackendTimeoutError as sub_timeout:
+                    timeout = sub_timeout
+                    break
+                except exceptions.InferenceBackendRuntimeError as sub_error:
+                    failed.append((sub_start, sub_end, sub_error))
+
+        if timeout is not None:
+            # Splitting further would hit the deadline again for every sub-batch (and keep
+            # the caller waiting past it), so the records without outputs fail as timed out
+            pending = [i for i, output in enumerate(outputs) if output is None]
+            for i in pending:
+                outputs[i] = self._error_record(inputs[i], timeout)
+            n_isolated += len(pending)
+            self.logger.warning(
+                f"Marked {len(pending)} records of the batch as timed out: {timeout}"
             )
+
+        times.setdefault("preprocess", 0.0)
+        times.setdefault("execute", 0.0)
+        metrics.update(
+            batch_size=len(inputs),
+            execution_times=times,
+            layout_counts=layout_counts,
+            isolated_records=n_isolated,
+            isolation_calls=n_calls - 1,
+        )
+        return outputs
+
+    def _error_record(self, record: dict, error: Exception) -> dict:
+        """Build the output of a record isolated by ``error_mode='isolate'``."""
+        cause = error.__cause__ or error
+        output = {"error": {"type": type(cause).__name__, "message": str(error)}}
+        if (
+            self.config.output_mode is OutputModes.ENRICH
+            or self.config.passthrough_fields
+        ):
+            output = self._merge_outputs(([record], [output]))[0]
+        return output
+
+    def run_features(self, features: Any) -> List[dict]:
+        """Execute the inference pipeline on data that has already been preprocessed.
+
+        The internal preprocessor is skipped and ``features`` are passed directly to
+        ``transform_inputs()`` (or ``execute()`` if it is not defined). This is useful when
+        the data already arrives in the format the preprocessor would produce, such as a
+        numpy array for backends configured with ``input_format="numpy"``. Since there are no
+        input records, ``output_mode`` and ``passthrough_fields`` do not apply.
+
+        Parameters
+        ----------
+        features : Any
+            A sized batch of features (e.g. Records or a 2D numpy array)
+
+        Returns
+        -------
+        List[dict]
+            Output records, one per row of ``features``
+        """
+        outputs, _ = self._call(self._run_features, features)
+        return outputs
+
+    def _run_features(self, features: Any) -> List[dict]:
+        self._metrics.update(
+            batch_size=len(features), execution_times={"preprocess": 0.0}
+        )
+        return self._run_pipeline(features)
+
+    def execute_features(self, features: Any) -> Any:
+        """Run ``transform_inputs()`` (if defined) and ``execute()`` on preprocessed data.
+
+        Like :meth:`run_features`, but the pipeline stops after ``execute()`` and its raw
+        result is returned: ``transform_outputs()`` and output conversion are skipped. This
+        is used for offline scoring to arrays, where the output of ``execute()`` is written
+        for each row. Metrics, deadlines, and ``concurrency`` apply as for any other call.
+
+        Parameters
+        ----------
+        features : Any
+            A sized batch of features (e.g. a 2D numpy array)
+
+        Returns
+        -------
+        Any
+            The output of ``execute()``
+        """
+        results, _ = self._call(self._execute_features, features)
+        return results
+
+    def _execute_features(self, features: Any) -> Any:
+        self._metrics.update(
+            batch_size=len(features), execution_times={"preprocess": 0.0}
+        )
+        if self._sub_batch_pool is None:
+            results = self._run_steps(features, transform_outputs=False)
         else:
-            features = preprocessed
+            results = self._run_steps_concurrently(features, transform_outputs=False)
 
-        results = self._execute_and_profile_step(self.execute, features)
+        if self.config.verbose:
+            self._log_metrics()
+
+        return results
 
-        if hasattr(self, "transform_outputs"):
-            outputs = self._execute_and_profile_step(self.transform_outputs, results)
+    def _run_pipeline(
+        self, preprocessed: Any, records: Optional[List[dict]] = None
+    ) -> List[dict]:
+        """Run the user-defined steps of the pipeline on preprocessed data.
+
+        When the input ``records`` are provided, outputs are merged with them according to
+        ``output_mode`` and ``passthrough_fields``.
+        """
+        if self._sub_batch_pool is None:
+            outputs = self._run_steps(preprocessed)
         else:
-            outputs = results
+            outputs = self._run_steps_concurrently(preprocessed)
+
+        if self.config.output_fields and not isinstance(outputs, list):
+            outputs = self._execute_and_profile_step(self._convert_outputs, outputs)
 
         if not isinstance(outputs, list):
             raise exceptions.InferenceBackendRuntimeError(
                 f"Output of inference backend is not a list. Received type: {type(outputs)}"
             )
 
-        if input_is_dict:
-            outputs = outputs[0]
+        if self._output_guard is not None:
+            outputs = self._execute_and_profile_step(self._guard_outputs, outputs)
+
+        if records is not None and (
+            self.config.output_mode is OutputModes.ENRICH
+            or self.config.passthrough_fields
+        ):
+            outputs = self._execute_and_profile_step(
+                self._merge_outputs, (records, outputs)
+            )
+
+        if self.config.record_views:
+            # Views over input records returned as outputs are materialized for serialization
+            outputs = [
+                o.materialize() if isinstance(o, RecordView) else o for o in outputs
+            ]
 
         if self.config.verbose:
-            self.logger.debug(f"{self.get_metrics().__repr__()}")
+            self._log_metrics()
 
         return outputs
 
+    def _run_steps(self, preprocessed: Any, transform_outputs: bool = True) -> Any:
+        """Run transform_inputs (if defined), execute, and transform_outputs (if defined).
+
+        ``transform_outputs=False`` stops after execute.
+        """
+        if hasattr(self, "transform_inputs"):
+            features = self._execute_and_profile_step(
+                self.transform_inputs, preprocessed
+            )
+        else:
+            features = preprocessed
+
+        results = self._execute_and_profile_step(self.execute, features)
+
+        if transform_outputs and hasattr(self, "transform_outputs"):
+            return self._execute_and_profile_step(self.transform_outputs, results)
+        return results
+
+    def _run_steps_concurrently(
+        self, preprocessed: Any, transform_outputs: bool = True
+    ) -> Any:
+        """Run the user-defined steps on sub-batches in the sub-batch pool.
+
+        When the backend is ``thread_safe``, every step runs on the sub-batches. Otherwise,
+        only ``execute`` does, and the transforms run on the whole batch. Batches that are too
+        small, or that cannot be split, run in the calling thread as usual.
+        """
+        pool = self._sub_batch_pool
+        if self.thread_safe:
+            parts = split_batch(preprocessed, pool.n_parts(batch_length(preprocessed)))
+            run_steps = functools.partial(
+                self._run_steps, transform_outputs=transform_outputs
+            )
+            if parts is None or len(parts) == 1:
+                return run_steps(preprocessed)
+            return concat_batches(self._map_sub_batches(run_steps, parts))
+
+        if hasattr(self, "transform_inputs"):
+            features = self._execute_and_profile_step(
+                self.transform_inputs, preprocessed
+            )
+        else:
+            features = preprocessed
+
+        parts = split_batch(features, pool.n_parts(batch_length(features)))
+        if parts is None or len(parts) == 1:
+            results = self._execute_and_profile_step(self.execute, features)
+        else:
+            results = concat_batches(self._map_sub_batches(self._execute, parts))
+
+        if transform_outputs and hasattr(self, "transform_outputs"):
+            return self._execute_and_profile_step(self.transform_outputs, results)
+        return results
+
+    def _execute(self, features: Any) -> Any:
+        return self._execute_and_profile_step(self.execute, features)
+
+    def _map_sub_batches(self, method: Callable, parts: List[Any]) -> List[Any]:
+        """Run a method on sub-batches in the sub-batch pool.
+
+        Each sub-batch records its execution times separately, and each step of the call
+        reports the time of its slowest sub-batch. Sub-batches share the call deadline.
+        """
+        deadline = None if self._watchdog is None else self._watchdog.call_deadline
+
+        def run(part):
+            metrics = CallMetrics()
+            token = _call_metrics.set((self, metrics))
+            # Sub-batches running in pool threads continue the call's deadline
+            continues_call = (
+                deadline is not None and self._watchdog.call_deadline != deadline
+            )
+            if continues_call:
+                self._watchdog.start_call(deadline)
+            try:
+                return method(part), metrics.execution_times
+            finally:
+                if continues_call:
+                    self._watchdog.end_call()
+                _call_metrics.reset(token)
+
+        results = self._sub_batch_pool.map(run, parts)
+
+        times = self._metrics.execution_times
+        for _, part_times in results:
+            for step, time_ms in part_times.items():
+                times[step] = max(times.get(step, 0.0), time_ms)
+        return [outputs for outputs, _ in results]
+
+    def stream(self, records: Iterable[dict]) -> Iterator[dict]:
+        """Execute the inference pipeline over a stream of records using micro-batches.
+
+        Records are pulled from the iterable in batches sized by the backend's
+        :class:`~packflow.backend.batching.AdaptiveBatchSizer`. When ``batching.target_p99_ms``
+        is configured, the batch size is adjusted after each batch based on the execution
+        times gathered for that batch, and the current choice is reported as
+        ``target_batch_size`` in :meth:`get_metrics`.
+
+        When ``admission.max_queue_size`` is configured, records are pulled from the source
+        into a bounded :class:`~packflow.backend.admission.AdmissionQueue` that applies
+        backpressure or sheds records according to ``admission.policy``. Queue depth, wait
+        time, and shed counts are reported in :meth:`get_metrics`.
+
+        Parameters
+        ----------
+        records : Iterable[dict]
+            A (possibly unbounded) iterable of input records
+
+        Yields
+        ------
+        dict
+            Output records, in the same order as the inputs
+        """
+        if self.config.admission.max_queue_size is None:
+            queue = None
+            batches = micro_batches(records, self._batch_sizer)
+        else:
+            queue = AdmissionQueue(self.config.admission)
+            batches = admitted_batches(records, queue, self._batch_sizer)
+
+        for batch in batches:
+            outputs, metrics = self._call(self._run_records, batch)
+            metrics.target_batch_size = self._batch_sizer.observe(
+                len(batch), metrics.total_execution_time()
+            )
+            if queue is not None:
+                metrics.update(**queue.metrics())
+            yield from outputs
+
     def _initialize(self):
         """Metrics wrapper for user-defined initialize function"""
         start = time.perf_counter()
@@ -105,7 +561,73 @@ class InferenceBackend(ABC):
         """
         Run the internally configured data preprocessor
         """
-        return self._preprocessor(raw_inputs)
+        preprocessed = self._preprocessor(raw_inputs)
+        self._metrics.layout_counts = self._preprocessor.layout_counts
+        return preprocessed
+
+    def _convert_outputs(self, outputs: Any) -> List[dict]:
+        """
+        Convert columnar outputs (a dict of columns or a 2D array) to records with the
+        configured ``output_fields``
+        """
+        return columns_to_records(outputs, self.config.output_fields)
+
+    def _guard_outputs(self, outputs: List[dict]) -> List[dict]:
+        """Check outputs against the output schema learned by the output guard"""
+        return self._output_guard(outputs, self._metrics.batch_size)
+
+    def _merge_outputs(self, batch: Tuple[List[dict], List[dict]]) -> List[dict]:
+        """
+        Merge output records with the input records they were computed from.
+
+        With ``output_mode='enrich'``, outputs are merged into the input records (under
+        ``output_key``, if set), which are returned in place of the outputs. The input records
+        are updated in place, or wrapped in views when ``record_views`` is set. Otherwise,
+        ``passthrough_fields`` are copied by reference from the input records to the outputs.
+        """
+        records, outputs = batch
+        if len(outputs) != len(records):
+            raise ValueError(
+                f"Expected {len(records)} output records to merge with the inputs, "
+                f"received {len(outputs)}"
+            )
+
+        key = self.config.output_key
+        if key is not None:
+            outputs = [{key: output} for output in outputs]
+
+        if self.config.output_mode is OutputModes.REPLACE:
+            fields = self.config.passthrough_fields
+            for record, output in zip(records, outputs):
+                for field in fields:
+                    if field in record:
+                        output[field] = record[field]
+            return outputs
+
+        if self.config.record_views:
+            # Output fields are read first, so they take precedence over input fields
+            return [
+                RecordView(output, record) for record, output in zip(records, outputs)
+            ]
+
+        for record, output in zip(records, outputs):
+            record.update(output)
+        return records
+
+    def _log_metrics(self):
+        """Log the metrics of the call, sampled according to the verbose settings"""
+        # Counting with next() on itertools.count is atomic, so calls are sampled without a lock
+        if next(self._verbose_calls) % self.config.verbose_every_n_calls:
+            return
+
+        now = time.monotonic()
+        interval = self.config.verbose_interval_s
+        if interval is not None and now - self._verbose_logged_at < interval:
+            return
+
+        self._verbose_logged_at = now
+        # The metrics are only formatted if the message is emitted
+        self.logger.opt(lazy=True).debug("{}", self._metrics.__repr__)
 
     def _execute_and_profile_step(self, method: Callable, data: Any) -> Any:
         """
@@ -135,7 +657,12 @@ class InferenceBackend(ABC):
         start = time.perf_counter()
 
         try:
-            result = method(data)
+            if self._watchdog is None:
+                result = method(data)
+            else:
+                result = self._watchdog.run(name, method, data)
+        except exceptions.InferenceBackendTimeoutError:
+            raise
         except Exception as e:
             raise exceptions.InferenceBackendRuntimeError(
                 f"{name}() failed with the following error: {e}"
@@ -143,7 +670,7 @@ class InferenceBackend(ABC):
 
         time_ms = (time.perf_counter() - start) * 1000
 
-        self._execution_metrics["execution_times"][name] = round(time_ms, 5)
+        self._metrics.execution_times[name] = round(time_ms, 5)
 
         return result
 
@@ -156,6 +683,33 @@ class InferenceBackend(ABC):
         """
         return
 
+    def shared_artifact(self, name: str, load: Callable[[], Any]) -> Any:
+        """Load a read-only artifact (e.g. model weights) that backend instances can share.
+
+        Backends built within :func:`share_artifacts`, such as the replicas of a
+        :class:`~packflow.serving.ReplicaPool`, only load each artifact once: the first one
+        calls ``load()`` and the others get the same object. Otherwise, ``load()`` is called.
+
+        Parameters
+        ----------
+        name : str
+            The name of the artifact, unique among the artifacts of the backend
+
+        load : Callable[[], Any]
+            Loads the artifact
+
+        Returns
+        -------
+        Any
+            The artifact. It is shared between instances, so it must not be modified.
+        """
+        artifacts = _shared_artifacts.get()
+        if artifacts is None:
+            return load()
+        if name not in artifacts:
+            artifacts[name] = load()
+        return artifacts[name]
+
     # def transform_inputs(self, inputs: Union[List[dict], Any]) -> Any:
     #     """Preprocessing steps or other transformations before running inference.
     #
@@ -246,7 +800,34 @@ class InferenceBackend(ABC):
         -------
         ExecutionMetrics
         """
-        return ExecutionMetrics(**self._execution_metrics)
+        metrics = self._execution_metrics.to_model()
+        if self._watchdog is not None:
+            metrics.timeouts = self._watchdog.timeouts
+        return metrics
+
+    def get_aggregated_metrics(self) -> AggregatedMetrics:
+        """
+        Metrics aggregated over the latest completed calls (see ``metrics_window``)
+
+        Returns
+        -------
+        AggregatedMetrics
+        """
+        # Copying the deque is atomic, so calls completing concurrently are not blocked
+        return AggregatedMetrics.from_calls(list(self._completed_calls))
+
+    def close(self) -> None:
+        """
+        Stop the threads of the backend: the stage threads used to enforce ``deadlines`` and
+        the sub-batch pool used for ``concurrency``.
+
+        Steps in progress complete. The backend can still be called afterwards, in which case
+        the threads it needs are started again.
+        """
+        if self._watchdog is not None:
+            self._watchdog.close()
+        if self._sub_batch_pool is not None:
+            self._sub_batch_pool.close()
 
     def ready(self) -> bool:
         """
@@ -0,0 +1,147 @@
+import itertools
+import math
+from collections import deque
+from typing import Iterable, Iterator, List, Optional
+
+from packflow.logger import get_logger
+
+from .configuration import BatchingConfig
+
+logger = get_logger()
+
+
+class AdaptiveBatchSizer:
+    """
+    Controller that picks the micro-batch size for the streaming path.
+
+    Without a ``target_p99_ms`` the configured ``batch_size`` is used as-is. With a target,
+    the controller tracks the latency of the most recent batches and adjusts the batch size
+    after every ``window`` observations:
+
+      - p99 above the target: shrink proportionally to the overshoot
+      - p99 comfortably below the target: grow (at most doubling per adjustment)
+
+    A single batch that takes more than twice the target shrinks the batch size immediately
+    so that a sudden slowdown (e.g. wider records or a busy host) does not have to wait for
+    a full window.
+    """
+
+    #: Fraction of the target that the p99 must stay under before growing the batch size.
+    GROWTH_HEADROOM = 0.8
+
+    def __init__(self, config: Optional[BatchingConfig] = None):
+        self.config = config or BatchingConfig()
+        self.batch_size = min(
+            max(self.config.batch_size, self.config.min_batch_size),
+            self.config.max_batch_size,
+        )
+        self._latencies = deque(maxlen=self.config.window)
+
+    def __repr__(self):  # pragma: no cover
+        return (
+            f"{self.__class__.__name__}(batch_size={self.batch_size}, p99={self.p99()})"
+        )
+
+    @property
+    def adaptive(self) -> bool:
+        """Whether the batch size is driven by a latency target."""
+        return self.config.target_p99_ms is not None
+
+    def p99(self) -> Optional[float]:
+        """
+        The 99th percentile latency (ms) of the batches observed at the current batch size.
+
+        Returns
+        -------
+        Optional[float]
+            None if no batches have been observed since the last adjustment.
+        """
+        if not self._latencies:
+            return None
+
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(0.99 * len(ordered)) - 1)
+        return ordered[index]
+
+    def observe(self, batch_size: int, latency_ms: float) -> int:
+        """
+        Record the latency of an executed batch and adjust the batch size if needed.
+
+        Parameters
+        ----------
+        batch_size : int
+            The number of records in the executed batch
+
+        latency_ms : float
+            The total execution time of the batch in milliseconds
+
+        Returns
+        -------
+        int
+            The batch size to use for the next batch
+        """
+        if not self.adaptive:
+            return self.batch_size
+
+        # A short final batch says little about the cost of a full one
+        if batch_size < self.batch_size:
+            return self.batch_size
+
+        target = self.config.target_p99_ms
+        self._latencies.append(latency_ms)
+
+        if latency_ms > 2 * target:
+            self._resize(self.batch_size * target / latency_ms)
+        elif len(self._latencies) == self._latencies.maxlen:
+            p99 = self.p99()
+            if p99 > target:
+                self._resize(self.batch_size * target / p99)
+            elif p99 < target * self.GROWTH_HEADROOM:
+                self._resize(
+                    self.batch_size * min(2.0, target * self.GROWTH_HEADROOM / p99)
+                )
+
+        return self.batch_size
+
+    def _resize(self, batch_size: float):
+        """Clamp and apply a new batch size, discarding latencies observed at the old size."""
+        new_size = int(
+            min(max(batch_size, self.config.min_batch_size), self.config.max_batch_size)
+        )
+        if new_size != self.batch_size:
+            logger.debug(
+                f"Adjusting micro-batch size from {self.batch_size} to {new_size} "
+                f"(target p99: {self.config.target_p99_ms} ms, observed p99: {self.p99()} ms)"
+            )
+            self.batch_size = new_size
+        self._latencies.clear()
+
+
+def micro_batches(
+    records: Iterable[dict], sizer: AdaptiveBatchSizer
+) -> Iterator[List[dict]]:
+    """
+    Group a (possibly unbounded) iterable of records into micro-batches.
+
+    The size of each batch is read from the sizer right before the batch is pulled, so
+    adjustments made between batches take effect immediately.
+
+    Parameters
+    ----------
+    records : Iterable[dict]
+        Source of input records
+
+    sizer : AdaptiveBatchSizer
+        Controller deciding the size of each batch
+
+    Yields
+    ------
+    List[dict]
+        Batches of at most ``sizer.batch_size`` records
+    """
+    iterator = iter(records)
+    while True:
+        batch = list(itertools.islice(iterator, sizer.batch_size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,289 @@
+import hashlib
+import linecache
+from collections.abc import Mapping
+from typing import Callable, Dict, List, Optional
+
+from .configuration import BackendConfig
+
+_MISSING = object()
+
+RecordTransformer = Callable[[List[dict], Callable[[dict], dict]], List[dict]]
+
+
+class _SourceWriter:
+    """Accumulate indented lines of generated source."""
+
+    def __init__(self):
+        self.lines = []
+        self.indent = 0
+        self.counter = 0
+
+    def __call__(self, line: str):
+        self.lines.append("    " * self.indent + line)
+
+    def var(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    @property
+    def source(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+class _PathNode:
+    """Trie of delimiter-separated field paths."""
+
+    def __init__(self):
+        self.children: Dict[str, "_PathNode"] = {}
+        self.value_var: Optional[str] = None
+
+    def insert(self, segments: List[str], value_var: str):
+        node = self
+        for segment in segments:
+            node = node.children.setdefault(segment, _PathNode())
+        node.value_var = value_var
+
+    def descendant_paths(self, delimiter: str, depth: int = 0) -> List[str]:
+        """Paths of all descendants, joined with the delimiter."""
+        paths = []
+        for segment, child in self.children.items():
+            if depth:
+                paths.append(segment)
+            paths.extend(
+                segment + delimiter + path
+                for path in child.descendant_paths(delimiter, depth + 1)
+            )
+        return paths
+
+
+def _is_index(segment: str) -> bool:
+    return segment.isdecimal() and str(int(segment)) == segment
+
+
+def _bail(w: _SourceWriter):
+    w("append(fallback(r))")
+    w("continue")
+
+
+def _emit_flattened_node(
+    w: _SourceWriter,
+    var: str,
+    node: _PathNode,
+    delimiter: str,
+    flatten_lists: bool,
+    is_root: bool = False,
+):
+    """
+    Emit the lookups below a value present at the path of ``node``.
+
+    Mirrors ``flatten_dict`` with ``keep_empty_types=(dict, list)``: non-empty containers are
+    never leaves, and nested keys are only reachable through plain dicts (and lists when
+    ``flatten_lists`` is set). Any shape that could make the flattened result differ from a
+    direct walk (keys containing the delimiter, non-string keys, other container types)
+    falls back to the generic path.
+    """
+    if node.value_var is not None:
+        w(f"if not (isinstance({var}, _FLATTENABLE) and {var}):")
+        w(f"    {node.value_var} = {var}")
+
+    if not node.children:
+        return
+
+    # The root is already known to be a dict
+    if not is_root:
+        w(f"if type({var}) is dict:")
+        w.indent += 1
+
+    # Literal keys containing the delimiter would produce the same flattened keys
+    alternates = node.descendant_paths(delimiter)
+    if alternates:
+        w(f"if {' or '.join(f'{path!r} in {var}' for path in alternates)}:")
+        w.indent += 1
+        _bail(w)
+        w.indent -= 1
+
+    for segment, child in node.children.items():
+        child_var = w.var("c")
+        w(f"{child_var} = {var}.get({segment!r}, _MISSING)")
+        if not is_root and _is_index(segment):
+            # Nested integer keys are formatted into the flattened key as well
+            w(f"if {child_var} is _MISSING and {int(segment)} in {var}:")
+            w.indent += 1
+            _bail(w)
+            w.indent -= 1
+        w(f"if {child_var} is not _MISSING:")
+        w.indent += 1
+        _emit_flattened_node(w, child_var, child, delimiter, flatten_lists)
+        w.indent -= 1
+
+    if is_root:
+        return
+    w.indent -= 1
+
+    indices = [segment for segment in node.children if _is_index(segment)]
+    if flatten_lists and indices:
+        w(f"elif type({var}) is list:")
+        w.indent += 1
+        for segment in indices:
+            child_var = w.var("c")
+            w(f"if len({var}) > {int(segment)}:")
+            w(f"    {child_var} = {var}[{int(segment)}]")
+            w.indent += 1
+            _emit_flattened_node(
+                w, child_var, node.children[segment], delimiter, flatten_lists
+            )
+            w.indent -= 1
+        w.indent -= 1
+
+    w(f"elif isinstance({var}, _FLATTENABLE) and type({var}) is not list:")
+    w.indent += 1
+    _bail(w)
+    w.indent -= 1
+
+
+def _emit_direct_lookup(w: _SourceWriter, value_var: str, path: str, delimiter: str):
+    """Inline ``packflow.utils.get_nested_field_direct(r, path, delimiter)``."""
+    if delimiter not in path:
+        w(f"{value_var} = r.get({path!r})")
+        return
+
+    w(f"{value_var} = r.get({path!r}, _MISSING)")
+    w(f"if {value_var} is _MISSING:")
+    w(f"    {value_var} = None")
+    w.indent += 1
+    var = "r"
+    *parents, last = path.split(delimiter)
+    for segment in parents:
+        child_var = w.var("c")
+        w(f"{child_var} = {var}.get({segment!r})")
+        w(f"if isinstance({child_var}, dict):")
+        w.indent += 1
+        var = child_var
+    w(f"{value_var} = {var}.get({last!r})")
+    w.indent -= len(parents) + 1
+
+
+def generate_records_transformer_source(config: BackendConfig) -> Optional[str]:
+    """
+    Generate the source of a records transformer specialized for a configuration.
+
+    The generated ``transform(records, fallback)`` function applies the renaming, filtering
+    and (optionally) flattening of the ``RecordsPreprocessor`` with literal key lookups and
+    no configuration checks. Records it cannot handle exactly are passed to ``fallback``.
+
+    Parameters
+    ----------
+    config : BackendConfig
+
+    Returns
+    -------
+    str or None
+        The source code, or None if the configuration is not supported. Only
+        configurations with ``feature_names`` are supported, and without flattening,
+        output field names may not contain the delimiter.
+    """
+    delimiter = config.nested_field_delimiter
+    if not config.feature_names or not delimiter:
+        return None
+
+    if not all(
+        isinstance(key, str) and isinstance(new_key, str)
+        for key, new_key in config.rename_fields.items()
+    ):
+        return None
+
+    if not config.flatten_nested_inputs and any(
+        delimiter in field
+        for field in (*config.rename_fields.values(), *config.feature_names)
+    ):
+        return None
+
+    # One local variable per distinct input field
+    value_vars = {}
+    for field in (*config.rename_fields, *config.feature_names):
+        value_vars.setdefault(field, f"v{len(value_vars)}")
+
+    w = _SourceWriter()
+    w("def transform(records, fallback):")
+    w.indent += 1
+    w("out = []")
+    w("append = out.append")
+    w("for r in records:")
+    w.indent += 1
+    w("if type(r) is not dict:")
+    w.indent += 1
+    _bail(w)
+    w.indent -= 1
+    w(" = ".join(value_vars.values()) + " = None")
+
+    if config.flatten_nested_inputs:
+        root = _PathNode()
+        for field, value_var in value_vars.items():
+            root.insert(field.split(delimiter), value_var)
+        _emit_flattened_node(
+            w, "r", root, delimiter, config.flatten_lists, is_root=True
+        )
+    else:
+        for field, value_var in value_vars.items():
+            _emit_direct_lookup(w, value_var, field, delimiter)
+
+    w("o = {}")
+    for field, new_key in config.rename_fields.items():
+        value_var = value_vars[field]
+        w(f"if {value_var} is not None:")
+        w(f"    o[{new_key!r}] = {value_var}")
+
+    renamed = set(config.rename_fields.values())
+    emitted = set()
+    for feature in config.feature_names:
+        if feature in emitted:
+            continue
+        emitted.add(feature)
+        value_var = value_vars[feature]
+        condition = f"{value_var} is not None"
+        if feature in renamed:
+            condition += f" and {feature!r} not in o"
+        w(f"if {condition}:")
+        w(f"    o[{feature!r}] = {value_var}")
+
+    w("append(o)")
+    w.indent -= 1
+    w("return out")
+    return w.source
+
+
+def compile_records_transformer(config: BackendConfig) -> Optional[RecordTransformer]:
+    """
+    Compile a records transformer specialized for a configuration.
+
+    See :func:`generate_records_transformer_source`. The generated source is available as
+    the ``source`` attribute of the returned function, and shows up in tracebacks.
+
+    Returns
+    -------
+    Callable or None
+        ``transform(records, fallback) -> list[dict]``, or None if the configuration is not
+        supported
+    """
+    source = generate_records_transformer_source(config)
+    if source is None:
+        return None
+
+    digest = hashlib.sha1(source.encode("utf-8")).hexdigest()[:12]
+    filename = f"<packflow-transformer-{digest}>"
+    linecache.cache[filename] = (
+        len(source),
+        None,
+        source.splitlines(keepends=True),
+        filename,
+    )
+
+    namespace = {
+        "_MISSING": _MISSING,
+        "_FLATTENABLE": (Mapping, list) if config.flatten_lists else (Mapping,),
+    }
+    exec(compile(source, filename, "exec"), namespace)
+
+    transform = namespace["transform"]
+    transform.source = source
+    return transform
@@ -0,0 +1,149 @@
+import contextvars
+import threading
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+import packflow.exceptions as exceptions
+
+from .configuration import ConcurrencyConfig
+
+
+def batch_length(data: Any) -> Optional[int]:
+    """
+    Number of rows of a batch, or None if it cannot be determined.
+
+    Arrays (and array-likes with a ``shape``) have one row per item of their first axis,
+    mappings of columns have one row per item of their columns, which must all have the
+    same length.
+    """
+    if isinstance(data, Mapping):
+        lengths = {batch_length(column) for column in data.values()}
+        if len(lengths) != 1:
+            return None
+        return lengths.pop()
+
+    shape = getattr(data, "shape", None)
+    if shape:
+        return shape[0]
+
+    if isinstance(data, (list, tuple)):
+        return len(data)
+    return None
+
+
+def split_batch(data: Any, n_parts: int) -> Optional[List[Any]]:
+    """
+    Split a batch into contiguous sub-batches of (nearly) equal sizes.
+
+    Parameters
+    ----------
+    data : Any
+        A list, array, or mapping of columns (see :func:`batch_length`)
+
+    n_parts : int
+        Number of sub-batches
+
+    Returns
+    -------
+    List[Any] or None
+        The sub-batches, in order, or None if the batch cannot be split
+    """
+    n_rows = batch_length(data)
+    if n_rows is None:
+        return None
+
+    bounds = [n_rows * i // n_parts for i in range(n_parts + 1)]
+    slices = [slice(start, stop) for start, stop in zip(bounds, bounds[1:])]
+    if isinstance(data, Mapping):
+        return [{key: column[s] for key, column in data.items()} for s in slices]
+    return [data[s] for s in slices]
+
+
+def concat_batches(parts: List[Any]) -> Any:
+    """
+    Reassemble the results of sub-batches, in order.
+
+    Lists are concatenated, numpy arrays are concatenated along their first axis, and
+    mappings and tuples are reassembled item by item.
+
+    Raises
+    ------
+    InferenceBackendRuntimeError
+        If the results cannot be reassembled
+    """
+    first = parts[0]
+    if isinstance(first, list):
+        return [row for part in parts for row in part]
+    if isinstance(first, np.ndarray):
+        return np.concatenate(parts)
+    if isinstance(first, Mapping):
+        return {key: concat_batches([part[key] for part in parts]) for key in first}
+    if isinstance(first, tuple):
+        return tuple(concat_batches(list(items)) for items in zip(*parts))
+    raise exceptions.InferenceBackendRuntimeError(
+        f"Cannot reassemble sub-batch results of type {type(first)}. Return lists, numpy "
+        f"arrays, or mappings or tuples of them, or disable `concurrency`."
+    )
+
+
+class SubBatchPool:
+    """
+    Run a step on sub-batches of a large batch in a managed thread pool.
+
+    Batches are split into at most ``max_workers`` sub-batches of at least
+    ``min_sub_batch_size`` rows. Each sub-batch runs in a copy of the caller's context, so
+    that it sees its context variables. The threads are started on first use and shared
+    by all calls, so the pool only pays off for steps that release the GIL.
+
+    Parameters
+    ----------
+    config : ConcurrencyConfig
+    """
+
+    def __init__(self, config: ConcurrencyConfig):
+        self.config = config
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def n_parts(self, n_rows: Optional[int]) -> int:
+        """Number of sub-batches to split a batch of ``n_rows`` rows into."""
+        if not n_rows:
+            return 1
+        return max(
+            1, min(self.config.max_workers, n_rows // self.config.min_sub_batch_size)
+        )
+
+    def map(self, method: Callable, parts: List[Any]) -> List[Any]:
+        """
+        Run ``method`` on each sub-batch concurrently and return the results in order.
+
+        The first sub-batch runs in the calling thread. If sub-batches fail, the exception of
+        the first failed sub-batch (in batch order) is raised once all of them completed.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.config.max_workers - 1, thread_name_prefix="packflow-sub-batch"
+                )
+            executor = self._executor
+
+        futures = [
+            executor.submit(contextvars.copy_context().run, method, part)
+            for part in parts[1:]
+        ]
+        try:
+            first = method(parts[0])
+        finally:
+            # Sub-batches are never left running after the call
+            wait(futures)
+        return [first] + [future.result() for future in futures]
+
+    def close(self):
+        """Shut down the threads of the pool once they are idle."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
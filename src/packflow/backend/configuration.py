@@ -1,11 +1,12 @@
 import enum
+import ipaddress
 import json
 import os
 from pathlib import Path
-from typing import List
+from typing import Annotated, Dict, List, Literal, Optional, Union
 
 from deepmerge import Merger
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 from packflow import constants
 from packflow.logger import get_logger
@@ -19,6 +20,179 @@ class InputFormats(enum.Enum):
     PASSTHROUGH = "passthrough"
     RECORDS = "records"
     NUMPY = "numpy"
+    COLUMNAR = "columnar"
+
+
+class OutputModes(enum.Enum):
+    """See :ref:`Output Modes<output-modes>` for details."""
+
+    REPLACE = "replace"
+    ENRICH = "enrich"
+
+
+class ErrorModes(enum.Enum):
+    """See :ref:`Error Isolation<error-isolation>` for details."""
+
+    RAISE = "raise"
+    ISOLATE = "isolate"
+
+
+class BatchingConfig(BaseModel):
+    """See :ref:`Micro-Batching<micro-batching>` for details."""
+
+    batch_size: int = Field(default=64, ge=1)
+    target_p99_ms: Optional[float] = Field(default=None, gt=0)
+    min_batch_size: int = Field(default=1, ge=1)
+    max_batch_size: int = Field(default=4096, ge=1)
+    window: int = Field(default=32, ge=1)
+
+    @model_validator(mode="after")
+    def check_batch_size_bounds(self):
+        if self.min_batch_size > self.max_batch_size:
+            raise ValueError(
+                f"min_batch_size ({self.min_batch_size}) cannot be larger than "
+                f"max_batch_size ({self.max_batch_size})"
+            )
+        return self
+
+
+class SheddingPolicies(enum.Enum):
+    """See :ref:`Admission Control<admission-control>` for details."""
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    SAMPLE = "sample"
+
+
+class AdmissionConfig(BaseModel):
+    """See :ref:`Admission Control<admission-control>` for details."""
+
+    max_queue_size: Optional[int] = Field(default=None, ge=1)
+    policy: SheddingPolicies = SheddingPolicies.BLOCK
+    sample_rate: float = Field(default=0.1, gt=0, le=1)
+    block_timeout_s: Optional[float] = Field(default=None, gt=0)
+
+
+PipelineStep = Literal[
+    "preprocess",
+    "transform_inputs",
+    "execute",
+    "transform_outputs",
+    "convert_outputs",
+    "guard_outputs",
+    "merge_outputs",
+]
+
+
+class DeadlinesConfig(BaseModel):
+    """See :ref:`Deadlines<deadlines>` for details."""
+
+    call_ms: Optional[float] = Field(default=None, gt=0)
+    stages: Dict[PipelineStep, Annotated[float, Field(gt=0)]] = {}
+
+
+class ConcurrencyConfig(BaseModel):
+    """See :ref:`Concurrency<concurrency>` for details."""
+
+    max_workers: int = Field(default=1, ge=1)
+    min_sub_batch_size: int = Field(default=256, ge=1)
+
+
+class OutputGuardConfig(BaseModel):
+    """See :ref:`Output Guard<output-guard>` for details."""
+
+    enabled: bool = False
+    learn_batches: int = Field(default=1, ge=1)
+    sample_rate: float = Field(default=0.001, ge=0, le=1)
+
+
+class NumericFeature(BaseModel):
+    """See :ref:`Feature Schema<feature-schema>` for details."""
+
+    type: Literal["numeric"] = "numeric"
+    dtype: str = "float32"
+    fill_value: Union[int, float] = 0
+
+
+class CategoricalFeature(BaseModel):
+    """See :ref:`Feature Schema<feature-schema>` for details."""
+
+    type: Literal["categorical"] = "categorical"
+    vocabulary: List[Union[str, int, float, bool]]
+    dtype: str = "int32"
+
+    @model_validator(mode="after")
+    def check_vocabulary(self):
+        if len(set(self.vocabulary)) != len(self.vocabulary):
+            raise ValueError(
+                f"vocabulary contains duplicated values: {self.vocabulary}"
+            )
+        return self
+
+
+class SequenceFeature(BaseModel):
+    """See :ref:`Feature Schema<feature-schema>` for details."""
+
+    type: Literal["sequence"] = "sequence"
+    max_length: int = Field(ge=1)
+    pad_value: Union[int, float, str] = 0
+    dtype: Optional[str] = None
+
+
+TimeUnit = Literal["s", "ms", "us", "ns"]
+
+
+class TimestampFeature(BaseModel):
+    """See :ref:`Feature Schema<feature-schema>` for details."""
+
+    type: Literal["timestamp"] = "timestamp"
+    output: Literal["epoch", "datetime64"] = "epoch"
+    unit: TimeUnit = "s"
+    epoch_unit: TimeUnit = "s"
+    parts: List[Literal["hour", "minute", "day_of_week", "day_of_month", "month"]] = []
+
+
+class IPFeature(BaseModel):
+    """See :ref:`Feature Schema<feature-schema>` for details."""
+
+    type: Literal["ip"] = "ip"
+    version: Literal[4, 6] = 4
+    networks: List[str] = []
+
+    @model_validator(mode="after")
+    def check_networks(self):
+        for network in self.networks:
+            if ipaddress.ip_network(network, strict=False).version > self.version:
+                raise ValueError(
+                    f"{network} is not an IPv{self.version} network. Set version=6 "
+                    f"to use IPv6 networks."
+                )
+        return self
+
+
+class HashedFeature(BaseModel):
+    """See :ref:`Feature Schema<feature-schema>` for details."""
+
+    type: Literal["hashed"] = "hashed"
+    n_features: int = Field(ge=1)
+    seed: int = Field(default=0, ge=0, lt=2**32)
+    alternate_sign: bool = False
+    sparse: bool = False
+    dtype: str = "float32"
+
+
+FeatureSpec = Annotated[
+    Union[
+        NumericFeature,
+        CategoricalFeature,
+        SequenceFeature,
+        TimestampFeature,
+        IPFeature,
+        HashedFeature,
+    ],
+    Field(discriminator="type"),
+]
 
 
 class BackendConfig(BaseModel):
@@ -26,6 +200,9 @@ class BackendConfig(BaseModel):
 
     # Base configurations - controls some runtime logging behaviors
     verbose: bool = False
+    verbose_every_n_calls: int = Field(default=1, ge=1)
+    verbose_interval_s: Optional[float] = Field(default=None, gt=0)
+    metrics_window: int = Field(default=100, ge=1)
 
     # Data Requirements - controls preprocessor behavior.
     input_format: InputFormats = InputFormats.RECORDS
@@ -35,6 +212,46 @@ class BackendConfig(BaseModel):
     flatten_lists: bool = False
     nested_field_delimiter: str = "."
     ignore_delimiter_collisions: bool = False
+    compile_preprocessor: bool = False
+    record_views: bool = False
+    feature_schema: Dict[str, FeatureSpec] = {}
+    numpy_dtype: Optional[str] = None
+
+    # Output Requirements - controls how outputs are returned.
+    output_fields: List[str] = []
+    output_mode: OutputModes = OutputModes.REPLACE
+    output_key: Optional[str] = None
+    passthrough_fields: List[str] = []
+
+    # Runtime behaviors - controls micro-batching and admission in the streaming/serving paths.
+    batching: BatchingConfig = BatchingConfig()
+    admission: AdmissionConfig = AdmissionConfig()
+    output_guard: OutputGuardConfig = OutputGuardConfig()
+    error_mode: ErrorModes = ErrorModes.RAISE
+    deadlines: DeadlinesConfig = DeadlinesConfig()
+    concurrency: ConcurrencyConfig = ConcurrencyConfig()
+
+    @model_validator(mode="after")
+    def check_feature_schema(self):
+        unknown = [
+            name for name in self.feature_schema if name not in self.feature_names
+        ]
+        if unknown:
+            raise ValueError(
+                f"feature_schema contains fields that are not in feature_names: {unknown}"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def check_output_mode(self):
+        if self.output_mode is OutputModes.REPLACE and self.output_key is not None:
+            raise ValueError("output_key is only supported with output_mode='enrich'")
+        if self.output_mode is OutputModes.ENRICH and self.passthrough_fields:
+            raise ValueError(
+                "passthrough_fields is not supported with output_mode='enrich', "
+                "where every input field is already returned"
+            )
+        return self
 
 
 def load_backend_configuration(
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, model_validator
 
@@ -8,6 +8,9 @@ class ExecutionTimes(BaseModel):
     transform_inputs: Optional[float] = None
     execute: float
     transform_outputs: Optional[float] = None
+    convert_outputs: Optional[float] = None
+    guard_outputs: Optional[float] = None
+    merge_outputs: Optional[float] = None
 
     def total(self):
         """
@@ -20,8 +23,102 @@ class ExecutionMetrics(BaseModel):
     batch_size: int
     execution_times: ExecutionTimes
     total_execution_time: float = None
+    target_batch_size: Optional[int] = None
+    queue_depth: Optional[int] = None
+    queue_wait_ms: Optional[float] = None
+    shed_records: Optional[Dict[str, int]] = None
+    layout_counts: Optional[Dict[str, int]] = None
+    isolated_records: Optional[int] = None
+    isolation_calls: Optional[int] = None
+    timeouts: Optional[int] = None
 
     @model_validator(mode="after")
     def calculate_total_execution_time(self):
         self.total_execution_time = self.execution_times.total()
         return self
+
+
+class CallMetrics:
+    """
+    Metrics of a single call of a backend, as a plain struct.
+
+    Steps record into the object of their call without any validation. It is converted to
+    an :class:`ExecutionMetrics` model only when needed (see
+    :meth:`InferenceBackend.get_metrics`).
+    """
+
+    __slots__ = (
+        "batch_size",
+        "execution_times",
+        "target_batch_size",
+        "queue_depth",
+        "queue_wait_ms",
+        "shed_records",
+        "layout_counts",
+        "isolated_records",
+        "isolation_calls",
+    )
+
+    def __init__(self):
+        self.batch_size: Optional[int] = None
+        self.execution_times: Dict[str, float] = {}
+        self.target_batch_size: Optional[int] = None
+        self.queue_depth: Optional[int] = None
+        self.queue_wait_ms: Optional[float] = None
+        self.shed_records: Optional[Dict[str, int]] = None
+        self.layout_counts: Optional[Dict[str, int]] = None
+        self.isolated_records: Optional[int] = None
+        self.isolation_calls: Optional[int] = None
+
+    def __repr__(self):
+        fields = ", ".join(
+            f"{name}={getattr(self, name)!r}"
+            for name in self.__slots__
+            if getattr(self, name) is not None
+        )
+        return f"{self.__class__.__name__}({fields}, total_execution_time={self.total_execution_time()!r})"
+
+    def update(self, **metrics):
+        """Set several metrics at once, e.g. ``update(**queue.metrics())``."""
+        for name, value in metrics.items():
+            setattr(self, name, value)
+
+    def total_execution_time(self) -> float:
+        """The sum of the execution times of the steps of the call."""
+        return sum(self.execution_times.values())
+
+    def to_model(self) -> ExecutionMetrics:
+        """Validate the metrics as an :class:`ExecutionMetrics` model."""
+        return ExecutionMetrics(
+            **{name: getattr(self, name) for name in self.__slots__}
+        )
+
+
+class AggregatedMetrics(BaseModel):
+    """Metrics aggregated over the latest calls of a backend."""
+
+    calls: int
+    records: int
+    mean_execution_times: Dict[str, float]
+    mean_total_execution_time: float
+    max_total_execution_time: float
+
+    @classmethod
+    def from_calls(cls, calls: List[CallMetrics]) -> "AggregatedMetrics":
+        """Aggregate the metrics of completed calls."""
+        times: Dict[str, float] = {}
+        totals = []
+        for call in calls:
+            for step, time_ms in call.execution_times.items():
+                times[step] = times.get(step, 0.0) + time_ms
+            totals.append(call.total_execution_time())
+        n_calls = len(calls)
+        return cls(
+            calls=n_calls,
+            records=sum(call.batch_size or 0 for call in calls),
+            mean_execution_times={
+                step: total / n_calls for step, total in times.items()
+            },
+            mean_total_execution_time=sum(totals) / n_calls if n_calls else 0.0,
+            max_total_execution_time=max(totals, default=0.0),
+        )
@@ -0,0 +1,265 @@
+import math
+import mmap
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional, TextIO, Tuple, Union
+
+import numpy as np
+
+import packflow.exceptions as exceptions
+from packflow.logger import get_logger
+from packflow.utils import NDJSONSink
+
+logger = get_logger()
+
+DEFAULT_CHUNK_SIZE = 65_536
+
+
+def open_features(
+    path: Union[str, Path],
+    dtype: Optional[str] = None,
+    n_features: Optional[int] = None,
+    offset: int = 0,
+) -> np.memmap:
+    """
+    Open a feature matrix on disk as a read-only memory map.
+
+    Parameters
+    ----------
+    path : str or Path
+        A ``.npy`` file, or a raw binary matrix in C order
+
+    dtype : str, optional
+        Data type of a raw binary matrix. Ignored for ``.npy`` files.
+
+    n_features : int, optional
+        Number of columns of a raw binary matrix. Ignored for ``.npy`` files.
+
+    offset : int
+        Byte offset of the matrix in a raw binary file
+
+    Returns
+    -------
+    np.memmap
+    """
+    path = Path(path)
+
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r")
+
+    if dtype is None or n_features is None:
+        raise ValueError(
+            f"`dtype` and `n_features` are required to read raw binary features from {path}"
+        )
+
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset).reshape(-1, n_features)
+
+
+def aligned_chunk_size(row_nbytes: int, chunk_size: int) -> int:
+    """
+    Round a chunk size to a number of rows that keeps every chunk page aligned.
+
+    Parameters
+    ----------
+    row_nbytes : int
+        Size of a single row in bytes
+
+    chunk_size : int
+        Requested number of rows per chunk
+
+    Returns
+    -------
+    int
+        The closest row count (at least one alignment step) whose byte size is a multiple
+        of the memory page size
+    """
+    if row_nbytes <= 0:
+        return max(chunk_size, 1)
+    step = mmap.PAGESIZE // math.gcd(row_nbytes, mmap.PAGESIZE)
+    return max(step, round(chunk_size / step) * step)
+
+
+def iter_chunks(
+    features: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Iterate over zero-copy slices of the first axis of an array.
+
+    Yields
+    ------
+    Tuple[int, np.ndarray]
+        The index of the first row of the chunk, and the chunk itself
+    """
+    row_nbytes = features.itemsize * math.prod(features.shape[1:])
+    step = aligned_chunk_size(row_nbytes, chunk_size)
+    for start in range(0, len(features), step):
+        yield start, features[start : start + step]
+
+
+def release_pages(array: np.ndarray, stop: int) -> None:
+    """
+    Drop the resident pages backing the rows of a memory-mapped array before ``stop``.
+
+    The pages are clean (read-only input, or output that has been flushed), so the kernel
+    reloads them from disk if they are ever accessed again. This keeps the resident set
+    size constant while scanning files larger than RAM. Arrays that are not memory maps
+    are ignored.
+    """
+    base = array
+    while base is not None and not isinstance(base, mmap.mmap):
+        base = getattr(base, "_mmap", None) or getattr(base, "base", None)
+
+    madvise = getattr(base, "madvise", None)
+    if madvise is None or not hasattr(mmap, "MADV_DONTNEED"):
+        return
+
+    # np.memmap maps the file from the closest allocation boundary before its offset
+    start = getattr(array, "offset", 0) % mmap.ALLOCATIONGRANULARITY
+    end = start + stop * array.itemsize * math.prod(array.shape[1:])
+    end -= end % mmap.PAGESIZE
+    if end <= 0:
+        return
+
+    try:
+        madvise(mmap.MADV_DONTNEED, 0, min(end, len(base)))
+    except (OSError, ValueError):  # pragma: no cover
+        pass
+
+
+def score_features(
+    backend,
+    features: Union[str, Path, np.ndarray],
+    output: Union[str, Path, np.ndarray, BinaryIO, TextIO],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dtype: Optional[str] = None,
+    n_features: Optional[int] = None,
+) -> Union[np.ndarray, int]:
+    """
+    Score a feature matrix chunk by chunk, without building records.
+
+    Chunks of the (typically memory-mapped) matrix are passed directly to the backend,
+    bypassing the preprocessor. The output is written as it is produced and the pages of
+    both the input and an array output are released after each chunk, so the memory used
+    does not grow with the number of rows.
+
+    Parameters
+    ----------
+    backend : InferenceBackend
+        The backend to run
+
+    features : str, Path, or np.ndarray
+        A feature matrix, or the path to one (see :func:`open_features`)
+
+    output : str, Path, np.ndarray, or TextIO
+        Where to write the results:
+
+          - A ``.npy`` path or a pre-allocated array (e.g. ``np.memmap``): the output of
+            ``execute()`` is written for each row. ``transform_outputs()`` is not run.
+          - Any other path, or a stream: the full pipeline is run and output records are
+            written as newline-delimited JSON with an :class:`~packflow.utils.NDJSONSink`.
+
+    chunk_size : int
+        Approximate number of rows per chunk. Rounded to keep chunks page aligned.
+
+    dtype : str, optional
+        Data type of a raw binary feature file
+
+    n_features : int, optional
+        Number of columns of a raw binary feature file
+
+    Returns
+    -------
+    Union[np.ndarray, int]
+        The result array for array outputs, otherwise the number of records written
+    """
+    if not isinstance(features, np.ndarray):
+        features = open_features(features, dtype=dtype, n_features=n_features)
+
+    if isinstance(output, np.ndarray) or (
+        isinstance(output, (str, Path)) and Path(output).suffix == ".npy"
+    ):
+        return _score_to_array(backend, features, output, chunk_size)
+
+    return _score_to_ndjson(backend, features, output, chunk_size)
+
+
+def _score_to_array(
+    backend,
+    features: np.ndarray,
+    output: Union[str, Path, np.ndarray],
+    chunk_size: int,
+) -> np.ndarray:
+    results = output if isinstance(output, np.ndarray) else None
+
+    for start, chunk in iter_chunks(features, chunk_size):
+        result = np.asarray(backend.execute_features(chunk))
+
+        if len(result) != len(chunk):
+            raise exceptions.InferenceBackendRuntimeError(
+                f"execute() returned {len(result)} rows for a chunk of {len(chunk)} rows."
+            )
+
+        if results is None:
+            results = np.lib.format.open_memmap(
+                output,
+                mode="w+",
+                dtype=result.dtype,
+                shape=(len(features),) + result.shape[1:],
+            )
+
+        results[start : start + len(chunk)] = result
+
+        if isinstance(results, np.memmap):
+            results.flush()
+            release_pages(results, start + len(chunk))
+        release_pages(features, start + len(chunk))
+
+    if results is None:
+        raise ValueError("Cannot infer the output shape of an empty feature matrix.")
+
+    return results
+
+
+def _score_to_ndjson(
+    backend,
+    features: np.ndarray,
+    output: Union[str, Path, BinaryIO, TextIO],
+    chunk_size: int,
+) -> int:
+    n_written = 0
+    with NDJSONSink(output) as sink:
+        for start, chunk in iter_chunks(features, chunk_size):
+            sink.write_many(backend.run_features(chunk))
+            n_written += len(chunk)
+            release_pages(features, start + len(chunk))
+
+    logger.info(f"Scored {n_written:,} rows")
+    return n_written
+
+
+def score_records(
+    backend, records: Iterable[dict], output: Union[str, Path, BinaryIO, TextIO]
+) -> int:
+    """
+    Score an iterable of records with the backend's micro-batching path.
+
+    Parameters
+    ----------
+    backend : InferenceBackend
+        The backend to run
+
+    records : Iterable[dict]
+        Input records, consumed lazily
+
+    output : str, Path, or file object
+        Path or stream that output records are written to as newline-delimited JSON
+
+    Returns
+    -------
+    int
+        The number of records written
+    """
+    with NDJSONSink(output) as sink:
+        n_written = sink.write_many(backend.stream(records))
+
+    logger.info(f"Scored {n_written:,} records")
+    return n_written
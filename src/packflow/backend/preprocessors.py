@@ -1,3 +1,4 @@
+import threading
 from abc import ABC, abstractmethod
 
 import numpy as np
@@ -9,7 +10,16 @@ from loguru import logger
 import packflow.exceptions as exceptions
 import packflow.utils
 
-from .configuration import BackendConfig, InputFormats
+from .codegen import compile_records_transformer
+from .configuration import (
+    BackendConfig,
+    CategoricalFeature,
+    HashedFeature,
+    InputFormats,
+    IPFeature,
+    NumericFeature,
+    TimestampFeature,
+)
 
 
 def get_preprocessor(config: BackendConfig):
@@ -39,22 +49,43 @@ def get_preprocessor(config: BackendConfig):
         preprocessor = RecordsPreprocessor(config)
     elif config.input_format == InputFormats.NUMPY:
         preprocessor = NumpyPreprocessor(config)
+    elif config.input_format == InputFormats.COLUMNAR:
+        preprocessor = ColumnarPreprocessor(config)
     else:
         preprocessor = PassthroughPreprocessor(config)
 
     return preprocessor
 
 
+class _PreprocessorState(threading.local):
+    """State of the last batch preprocessed by each thread"""
+
+    layout_counts = None
+
+
 class Preprocessor(ABC):
     """Base class for Packflow preprocessors"""
 
     def __init__(self, config: BackendConfig):
         self.config = config
+        self._state = _PreprocessorState()
         self.resolve()
 
     def __repr__(self):  # pragma: no cover
         return f"{self.__class__.__name__}[\n  {self.config.__repr__()}\n]"
 
+    @property
+    def layout_counts(self):
+        """
+        Number of records of each layout in the last batch preprocessed by the current
+        thread, for preprocessors that group records by layout
+        """
+        return self._state.layout_counts
+
+    @layout_counts.setter
+    def layout_counts(self, value):
+        self._state.layout_counts = value
+
     def __call__(self, raw_inputs: list[dict]):
         """
         Run the preprocessor against raw inputs and return the processed data
@@ -134,6 +165,28 @@ class RecordsPreprocessor(Preprocessor):
         self.reducer = make_reducer(self.config.nested_field_delimiter)
         self.enumerate_types = (list,) if self.config.flatten_lists else ()
 
+        # Projection pushdown: when the output is limited to a known set of keys, only
+        # the subtrees that can produce them are flattened
+        self.projection = None
+        if self.config.flatten_nested_inputs and self.config.feature_names:
+            self.projection = packflow.utils.FlattenProjection(
+                [*self.config.rename_fields, *self.config.feature_names],
+                delimiter=self.config.nested_field_delimiter,
+                flatten_lists=self.config.flatten_lists,
+            )
+
+        self.transformer = None
+        if self.config.compile_preprocessor:
+            self.transformer = compile_records_transformer(self.config)
+            if self.transformer is None:
+                logger.warning(
+                    "Current config cannot be compiled to a specialized transformer. "
+                    "Defaulting to the generic preprocessor."
+                )
+            else:
+                log = logger.info if self.config.verbose else logger.debug
+                log(f"Compiled records transformer:\n{self.transformer.source}")
+
     def _check_for_delimiter_collisions(self, obj: dict) -> None:
         """Check if any keys in the object contain the delimiter character.
         
@@ -147,7 +200,13 @@ class RecordsPreprocessor(Preprocessor):
         """
         if self.config.ignore_delimiter_collisions:
             return
-        
+
+        # Paths of the colliding keys are only collected for the error message
+        if not packflow.utils.has_delimiter_collisions(
+            obj, self.config.nested_field_delimiter
+        ):
+            return
+
         collisions = packflow.utils.check_delimiter_collisions(
             obj, self.config.nested_field_delimiter
         )
@@ -216,80 +275,101 @@ class RecordsPreprocessor(Preprocessor):
             for obj in raw_inputs:
                 self._check_for_delimiter_collisions(obj)
 
-        records = []
-        for obj in raw_inputs:
-            obj = obj.copy()  # avoid editing input data
-            
-            if self.config.flatten_nested_inputs:
-                # FLATTEN MODE: Flatten the entire structure
+        if self.transformer is not None:
+            return self.transformer(raw_inputs, self._process_record)
+
+        return [self._process_record(obj) for obj in raw_inputs]
+
+    def _include_all_fields(self, renamed: dict, obj: dict) -> dict:
+        """Combine renamed fields with every field of a record, which take precedence.
+
+        With ``record_views``, a copy-on-write view over the record is returned instead of
+        a copy. It is materialized into a dict when it is modified or serialized.
+        """
+        if self.config.record_views:
+            return packflow.utils.RecordView(obj, renamed)
+        renamed.update(obj)
+        return renamed
+
+    def _process_record(self, obj: dict) -> dict:
+        """Rename, filter and flatten a single record. See ``process()``."""
+        # The input record is only read from, never edited
+        if self.projection is not None:
+            # FLATTEN MODE: Flatten only the subtrees that can reach a selected field
+            obj = self.projection(obj)
+
+        if self.config.flatten_nested_inputs:
+            if self.projection is None:
+                # FLATTEN MODE: Flatten the entire structure (no field selection)
                 obj = flatten(
                     obj,
                     reducer=self.reducer,
                     enumerate_types=self.enumerate_types,
                     keep_empty_types=(dict, list),
                 )
-                processed_obj = {}
-                
-                # Process rename_fields with flattened keys
-                for key in self.config.rename_fields:
-                    value = obj.get(key)
-                    if value is not None:
-                        processed_obj[self.config.rename_fields[key]] = value
-                
-                # Process feature_names with flattened keys
-                if self.config.feature_names:
-                    for feature in self.config.feature_names:
-                        if feature not in processed_obj:
-                            value = obj.get(feature)
-                            if value is not None:
-                                processed_obj[feature] = value
-                else:
-                    processed_obj.update(obj)
+            processed_obj = {}
+            
+            # Process rename_fields with flattened keys
+            for key in self.config.rename_fields:
+                value = obj.get(key)
+                if value is not None:
+                    processed_obj[self.config.rename_fields[key]] = value
+            
+            # Process feature_names with flattened keys
+            if self.config.feature_names:
+                for feature in self.config.feature_names:
+                    if feature not in processed_obj:
+                        value = obj.get(feature)
+                        if value is not None:
+                            processed_obj[feature] = value
+            elif processed_obj:
+                processed_obj = self._include_all_fields(processed_obj, obj)
             else:
-                # NON-FLATTEN MODE: Preserve structure, use direct nested access
-                processed_obj = {}
-                
-                # Process rename_fields with direct nested access
-                for key in self.config.rename_fields:
-                    value = packflow.utils.get_nested_field_direct(
-                        obj, key, self.config.nested_field_delimiter
+                # The flattened record is already a new dict
+                processed_obj = obj
+        else:
+            # NON-FLATTEN MODE: Preserve structure, use direct nested access
+            processed_obj = {}
+            
+            # Process rename_fields with direct nested access
+            for key in self.config.rename_fields:
+                value = packflow.utils.get_nested_field_direct(
+                    obj, key, self.config.nested_field_delimiter
+                )
+                if value is not None:
+                    new_key = self.config.rename_fields[key]
+                    # If the new key contains delimiter, create nested structure
+                    if self.config.nested_field_delimiter in new_key:
+                        packflow.utils.set_nested_field_direct(
+                            processed_obj, new_key, value, self.config.nested_field_delimiter
+                        )
+                    else:
+                        processed_obj[new_key] = value
+            
+            # Process feature_names with direct nested access
+            if self.config.feature_names:
+                for feature in self.config.feature_names:
+                    # Check if already added via rename_fields
+                    existing_value = packflow.utils.get_nested_field_direct(
+                        processed_obj, feature, self.config.nested_field_delimiter
                     )
-                    if value is not None:
-                        new_key = self.config.rename_fields[key]
-                        # If the new key contains delimiter, create nested structure
-                        if self.config.nested_field_delimiter in new_key:
-                            packflow.utils.set_nested_field_direct(
-                                processed_obj, new_key, value, self.config.nested_field_delimiter
-                            )
-                        else:
-                            processed_obj[new_key] = value
-                
-                # Process feature_names with direct nested access
-                if self.config.feature_names:
-                    for feature in self.config.feature_names:
-                        # Check if already added via rename_fields
-                        existing_value = packflow.utils.get_nested_field_direct(
-                            processed_obj, feature, self.config.nested_field_delimiter
+                    if existing_value is None:
+                        value = packflow.utils.get_nested_field_direct(
+                            obj, feature, self.config.nested_field_delimiter
                         )
-                        if existing_value is None:
-                            value = packflow.utils.get_nested_field_direct(
-                                obj, feature, self.config.nested_field_delimiter
-                            )
-                            if value is not None:
-                                # If feature contains delimiter, create nested structure
-                                if self.config.nested_field_delimiter in feature:
-                                    packflow.utils.set_nested_field_direct(
-                                        processed_obj, feature, value, self.config.nested_field_delimiter
-                                    )
-                                else:
-                                    processed_obj[feature] = value
-                else:
-                    # No feature filtering - include everything
-                    processed_obj.update(obj)
-
-            records.append(processed_obj)
-
-        return records
+                        if value is not None:
+                            # If feature contains delimiter, create nested structure
+                            if self.config.nested_field_delimiter in feature:
+                                packflow.utils.set_nested_field_direct(
+                                    processed_obj, feature, value, self.config.nested_field_delimiter
+                                )
+                            else:
+                                processed_obj[feature] = value
+            else:
+                # No feature filtering - include everything
+                processed_obj = self._include_all_fields(processed_obj, obj)
+
+        return processed_obj
 
 
 class NumpyPreprocessor(Preprocessor):
@@ -321,10 +401,82 @@ class NumpyPreprocessor(Preprocessor):
             for feature in self.config.feature_names
         ]
 
+        sparse_features = [
+            name
+            for name, spec in self.config.feature_schema.items()
+            if isinstance(spec, HashedFeature) and spec.sparse
+        ]
+        if sparse_features and not isinstance(self, ColumnarPreprocessor):
+            raise exceptions.PreprocessorInitError(
+                f"Sparse features {sparse_features} require input_format='columnar'."
+            )
+        if sparse_features and not packflow.utils.sparse_available():
+            raise exceptions.PreprocessorInitError(
+                f"Sparse features {sparse_features} require the `scipy` package. Install it with `pip install scipy`."
+            )
+
+        self.encoders = {
+            name: _feature_encoder(name, spec)
+            for name, spec in self.config.feature_schema.items()
+        }
+
+    def _group_by_layout(self, raw_inputs: list[dict]):
+        if not isinstance(raw_inputs, list):
+            return None
+
+        layouts = packflow.utils.group_by_layout(raw_inputs)
+        self.layout_counts = {
+            packflow.utils.layout_label(key): len(indices)
+            for key, indices in layouts.items()
+        }
+        return layouts
+
+    def _extract_columns(self, raw_inputs: list[dict]) -> tuple[dict, dict]:
+        """
+        Extract the features of the records as arrays, applying ``feature_schema``.
+
+        Returns
+        -------
+        tuple[dict, dict]
+            The array(s) of each feature, in order, and auxiliary arrays such as the
+            lengths of sequence features.
+        """
+        columns = packflow.utils.records_to_columns(
+            raw_inputs,
+            feature_names=self.features,
+            delimiter=self.config.nested_field_delimiter,
+            layouts=self._group_by_layout(raw_inputs),
+        )
+
+        arrays = {}
+        extras = {}
+        for name, feature in zip(self.config.feature_names, self.features):
+            if name in arrays:
+                continue
+
+            encoder = self.encoders.get(name)
+            if encoder is None:
+                arrays[name] = np.array(columns[feature])
+            else:
+                feature_arrays, feature_extras = encoder(columns[feature])
+                arrays.update(feature_arrays)
+                extras.update(feature_extras)
+        return arrays, extras
+
     def process(self, raw_inputs: list[dict]) -> np.array:
         """
         Convert the records to a numpy array.
 
+        Records are grouped by layout so that fields are resolved once per layout rather
+        than once per row (see :func:`packflow.utils.records_to_ndarray`). The number of
+        records of each layout is kept in ``layout_counts``.
+
+        Features in ``feature_schema`` are converted column by column and stacked; the
+        array has the data type of the columns, or ``numpy_dtype`` if set. Their auxiliary
+        arrays (the ``<name>_valid`` masks of timestamp and IP features, and the
+        ``<name>_lengths`` of sequence features) are appended as the last columns, in the
+        order of ``feature_names``, so that the feature columns keep their positions.
+
         Parameters
         ----------
         raw_inputs: list[dict]
@@ -334,9 +486,133 @@ class NumpyPreprocessor(Preprocessor):
         array
 
         """
+        if self.encoders:
+            arrays, extras = self._extract_columns(raw_inputs)
+            blocks = [
+                array if array.ndim == 2 else array[:, None]
+                for array in (*arrays.values(), *extras.values())
+            ]
+            dtype = self.config.numpy_dtype
+            if dtype is None:
+                try:
+                    dtype = np.result_type(*blocks)
+                except TypeError:
+                    dtype = object
+            return np.concatenate(blocks, axis=1, dtype=dtype, casting="unsafe")
+
         return packflow.utils.records_to_ndarray(
             raw_inputs,
             feature_names=self.features,
-            dtype=None,
+            dtype=self.config.numpy_dtype,
             delimiter=self.config.nested_field_delimiter,
+            layouts=self._group_by_layout(raw_inputs),
         )
+
+
+class ColumnarPreprocessor(NumpyPreprocessor):
+    """
+    Converts input records to a dictionary of numpy arrays, one per feature.
+    """
+
+    def process(self, raw_inputs: list[dict]) -> dict[str, np.ndarray]:
+        """
+        Convert the records to one numpy array per feature.
+
+        Parameters
+        ----------
+        raw_inputs: list[dict]
+
+        Returns
+        -------
+        dict[str, array]
+            The values of each feature, keyed by feature name. Sequence features in
+            ``feature_schema`` are 2D arrays of shape ``(n_records, max_length)``, and the
+            length of each sequence is stored under ``<name>_lengths``.
+        """
+        arrays, extras = self._extract_columns(raw_inputs)
+        return {**arrays, **extras}
+
+
+def _feature_encoder(name: str, spec):
+    """
+    Build the function converting the values of a feature according to its spec.
+
+    The function returns the array(s) of the feature and its auxiliary arrays.
+    """
+    if isinstance(spec, NumericFeature):
+
+        def encode(values):
+            return {
+                name: packflow.utils.to_numeric(
+                    values, dtype=spec.dtype, fill_value=spec.fill_value
+                )
+            }, {}
+
+    elif isinstance(spec, CategoricalFeature):
+        # Code 0 is reserved for unknown and missing values
+        vocabulary = {value: code for code, value in enumerate(spec.vocabulary, 1)}
+
+        def encode(values):
+            return {
+                name: packflow.utils.encode_categorical(
+                    values, vocabulary, unknown_value=0, dtype=spec.dtype
+                )
+            }, {}
+
+    elif isinstance(spec, TimestampFeature):
+
+        def encode(values):
+            timestamps, valid = packflow.utils.parse_timestamps(
+                values, unit=spec.unit, epoch_unit=spec.epoch_unit
+            )
+            parts = packflow.utils.timestamp_parts(timestamps, spec.parts, valid)
+
+            if spec.output == "epoch":
+                timestamps = timestamps.view(np.int64).astype(np.float64)
+                timestamps[~valid] = np.nan
+
+            arrays = {name: timestamps}
+            arrays.update((f"{name}_{part}", array) for part, array in parts.items())
+            return arrays, {f"{name}_valid": valid}
+
+    elif isinstance(spec, IPFeature):
+        index = None
+        if spec.networks:
+            # Built once; lookups are logarithmic in the number of networks
+            index = packflow.utils.NetworkIndex(spec.networks, version=spec.version)
+
+        def encode(values):
+            addresses, valid = packflow.utils.parse_ip_addresses(
+                values, version=spec.version
+            )
+            arrays = {name: addresses}
+            if index is not None:
+                arrays[f"{name}_network"] = np.where(valid, index.lookup(addresses), -1)
+            return arrays, {f"{name}_valid": valid}
+
+    elif isinstance(spec, HashedFeature):
+
+        def encode(values):
+            return {
+                name: packflow.utils.hash_features(
+                    values,
+                    n_features=spec.n_features,
+                    seed=spec.seed,
+                    alternate_sign=spec.alternate_sign,
+                    sparse=spec.sparse,
+                    dtype=spec.dtype,
+                )
+            }, {}
+
+    else:
+
+        def encode(values):
+            padded, lengths = packflow.utils.pad_sequences(
+                values,
+                max_length=spec.max_length,
+                pad_value=spec.pad_value,
+                dtype=spec.dtype,
+            )
+            return {name: padded}, {f"{name}_lengths": lengths}
+
+    return encode
@@ -1,8 +1,18 @@
 import json
-from typing import List, Union, Any, Callable
+import numbers
+import random
+import threading
+from collections.abc import Mapping
+from itertools import chain, repeat
+from operator import itemgetter
+from typing import List, Union, Any, Callable, Dict, Optional, Set
+
+import numpy as np
 
 import packflow.exceptions as exceptions
 
+from .configuration import OutputGuardConfig
+
 
 class InferenceBackendValidator:
     def __init__(self, backend: Callable):
@@ -47,6 +57,192 @@ class InferenceBackendValidator:
         return outputs
 
 
+class OutputGuard:
+    """
+    Lightweight output contract checks for production calls.
+
+    The first ``learn_batches`` batches are checked like :meth:`InferenceBackend.validate`
+    (a list of JSON serializable dictionaries), and the fields and value types of their
+    rows are learned. Fields present in every learned row are required, and all fields
+    are nullable. Later batches are only checked against the learned schema, one field at
+    a time over the whole batch, so the cost per row is a few lookups in C. A fraction
+    ``sample_rate`` of batches also gets the full JSON serialization check, to catch
+    values that drift in ways the schema cannot see (e.g. nested values).
+
+    Numbers are matched by kind rather than by exact type: a field learned as a float
+    accepts any real number (e.g. an int or a ``np.float32``), and a field learned as an
+    int accepts any integer (e.g. a ``np.int64``). Booleans are never numbers. Numeric
+    types are added to the schema once a batch with them passes, so that later batches
+    match without the row-by-row check. Top-level numpy scalars are also accepted by the
+    JSON serialization checks.
+
+    Parameters
+    ----------
+    config : OutputGuardConfig
+    """
+
+    def __init__(self, config: OutputGuardConfig):
+        self.config = config
+        self.fields: Dict[str, Set[type]] = {}
+        self.required: Optional[Set[str]] = None
+        self.n_learned = 0
+        self._field_checks = []
+        # Only taken while learning; the learned schema is read without locking
+        self._learn_lock = threading.Lock()
+
+    def __call__(self, outputs: Any, n_inputs: int) -> Any:
+        """
+        Check a batch of outputs.
+
+        Parameters
+        ----------
+        outputs : Any
+            The outputs of the backend
+
+        n_inputs : int
+            The number of inputs of the batch
+
+        Returns
+        -------
+        Any
+            The outputs, unchanged
+
+        Raises
+        ------
+        InferenceBackendValidationError
+        """
+        if len(outputs) != n_inputs:
+            raise exceptions.InferenceBackendValidationError(
+                f"Inputs and Outputs must have matching lengths. Received {n_inputs} inputs "
+                f"and returned {len(outputs)} outputs."
+            )
+
+        if self.n_learned < self.config.learn_batches:
+            with self._learn_lock:
+                if self.n_learned < self.config.learn_batches:
+                    if outputs:
+                        self._learn(outputs)
+                    return outputs
+
+        if random.random() < self.config.sample_rate:
+            for i, row in enumerate(outputs):
+                _row_is_json_serializable(i, _with_native_numbers(row))
+
+        if not self._matches_schema(outputs):
+            # Find and report the first row that does not match
+            compatible: Dict[str, Set[type]] = {}
+            for i, row in enumerate(outputs):
+                self._check_row(i, row, compatible)
+            if compatible:
+                self._add_types(compatible)
+
+        return outputs
+
+    def _learn(self, outputs: Any):
+        """Run the full checks on a batch and add its rows to the schema."""
+        for i, row in enumerate(outputs):
+            _row_is_mapping(i, row)
+            _row_is_json_serializable(i, _with_native_numbers(row))
+
+        for row in outputs:
+            keys = set(row)
+            self.required = keys if self.required is None else self.required & keys
+            for key, value in row.items():
+                self.fields.setdefault(key, {type(None)}).add(type(value))
+
+        self._field_checks = [
+            (key, key in self.required, frozenset(types))
+            for key, types in self.fields.items()
+        ]
+        # Only counted once the checks are complete, since checks are not locked
+        self.n_learned += 1
+
+    def _matches_schema(self, outputs: List[dict]) -> bool:
+        """Check a batch against the schema without a Python loop over its rows."""
+        try:
+            if not self.fields.keys() >= set(chain.from_iterable(outputs)):
+                return False
+            for key, required, types in self._field_checks:
+                if required:
+                    # Raises a KeyError if the field is missing
+                    values = map(itemgetter(key), outputs)
+                else:
+                    values = map(dict.get, outputs, repeat(key))
+                if not types.issuperset(map(type, values)):
+                    return False
+        except (KeyError, IndexError, TypeError):
+            return False
+        return True
+
+    def _add_types(self, types: Dict[str, Set[type]]):
+        """Add compatible numeric types to the fields of the learned schema."""
+        with self._learn_lock:
+            # The schema is replaced rather than updated, since it is read without locking
+            fields = {
+                key: field_types | types.get(key, set())
+                for key, field_types in self.fields.items()
+            }
+            field_checks = [
+                (key, key in self.required, frozenset(field_types))
+                for key, field_types in fields.items()
+            ]
+            self.fields = fields
+            self._field_checks = field_checks
+
+    def _check_row(self, i: int, row: Any, compatible: Dict[str, Set[type]]):
+        """
+        Check a row against the learned schema, field by field.
+
+        Numbers of compatible types that were not learned are added to ``compatible``.
+        """
+        _row_is_mapping(i, row)
+
+        missing = self.required.difference(row)
+        unexpected = [key for key in row if key not in self.fields]
+        if missing or unexpected:
+            raise exceptions.InferenceBackendValidationError(
+                f"Output at index {i} does not match the learned output schema. "
+                f"Missing fields: {sorted(map(str, missing))}, unexpected fields: {unexpected}"
+            )
+
+        for key, value in row.items():
+            value_type = type(value)
+            if value_type in self.fields[key]:
+                continue
+            if _is_compatible_number(value, self.fields[key]):
+                compatible.setdefault(key, set()).add(value_type)
+            else:
+                raise exceptions.InferenceBackendValidationError(
+                    f"Output at index {i} does not match the learned output schema. Field "
+                    f"'{key}' has type {type(value)}, expected one of {self.fields[key]}"
+                )
+
+
+def _is_compatible_number(value: Any, types: Set[type]) -> bool:
+    """
+    Checks if a number matches the learned types of a field: any integer matches an int
+    field, and any real number matches a float field. Booleans are not numbers.
+    """
+    if isinstance(value, (bool, np.bool_)) or not isinstance(value, numbers.Real):
+        return False
+    numeric = [
+        t for t in types if issubclass(t, numbers.Real) and not issubclass(t, bool)
+    ]
+    if isinstance(value, numbers.Integral):
+        return bool(numeric)
+    return any(not issubclass(t, numbers.Integral) for t in numeric)
+
+
+def _with_native_numbers(row: Any) -> Any:
+    """Converts the numpy numbers of a row, which the output guard accepts, to Python numbers"""
+    if not isinstance(row, Mapping):
+        return row
+    return {
+        key: value.item() if isinstance(value, (np.integer, np.floating)) else value
+        for key, value in row.items()
+    }
+
+
 def _input_is_correct_format(inputs: Any):
     """Checks if the input is a list of dictionaries"""
     if not isinstance(inputs, list):
@@ -96,3 +292,23 @@ def _output_is_json_serializable(outputs: Any):
                 f"Value at index {i} is not JSON Serializable. Please ensure returned values are native Python types. "
                 f"Error: {e}"
             )
+
+
+def _row_is_mapping(i: int, row: Any):
+    """Checks if an output row is a dictionary (or a view of one, e.g. a RecordView)"""
+    if not isinstance(row, Mapping):
+        raise exceptions.InferenceBackendValidationError(
+            f"Outputs must be a list of dictionaries. Value at index {i} is not a dictionary. "
+            f"Type found was {type(row)}"
+        )
+
+
+def _row_is_json_serializable(i: int, row: Mapping):
+    """Checks if an output row is json serializable"""
+    try:
+        json.dumps(row if isinstance(row, dict) else dict(row))
+    except Exception as e:
+        raise exceptions.InferenceBackendValidationError(
+            f"Value at index {i} is not JSON Serializable. Please ensure returned values are native Python types. "
+            f"Error: {e}"
+        )
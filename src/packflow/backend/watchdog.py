@@ -0,0 +1,185 @@
+import contextvars
+import functools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, List, Optional, Set
+
+import packflow.exceptions as exceptions
+
+from .configuration import DeadlinesConfig
+
+
+class _StageThread:
+    """Daemon thread that runs submitted calls one at a time."""
+
+    def __init__(self):
+        self._calls = queue.SimpleQueue()
+        self.stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name="packflow-stage", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, method: Callable, data: Any) -> Future:
+        future = Future()
+        self._calls.put((future, method, data))
+        return future
+
+    def stop(self):
+        """Exit once the current call (if any) returns."""
+        self.stopped = True
+        self._calls.put(None)
+
+    def _run(self):
+        while True:
+            call = self._calls.get()
+            if call is None:
+                return
+            future, method, data = call
+            try:
+                future.set_result(method(data))
+            except BaseException as e:
+                future.set_exception(e)
+            del future, method, data, call
+
+
+class _CallerState(threading.local):
+    """Call deadline of a calling thread."""
+
+    call_deadline: Optional[float] = None
+
+
+class Watchdog:
+    """
+    Enforce the deadlines of the steps of an inference pipeline.
+
+    A call to :meth:`run` waits for its step at most until the earliest of the step's own
+    deadline (``deadlines.stages``) and the deadline of the current pipeline call
+    (``deadlines.call_ms``, started with :meth:`start_call`). Steps with a deadline run in a
+    dedicated daemon thread, since a running Python thread cannot be interrupted. When a
+    deadline expires, :class:`~packflow.exceptions.InferenceBackendTimeoutError` is raised
+    and the thread is abandoned: it exits once the stuck step returns. Steps without any
+    deadline run in the calling thread.
+
+    Stage threads are shared by all calling threads: each step checks out an idle thread
+    (or starts one), and returns it once the step completes. At most
+    ``max_idle_threads`` idle threads are kept, so the number of threads is bounded by the
+    number of steps running concurrently. Call deadlines are kept per calling thread, so
+    concurrent calls do not share deadlines, and steps run in a copy of the caller's
+    context, so they see its context variables.
+
+    Parameters
+    ----------
+    config : DeadlinesConfig
+
+    max_idle_threads : int
+        Maximum number of idle stage threads kept for later steps
+    """
+
+    def __init__(self, config: DeadlinesConfig, max_idle_threads: int = 8):
+        self.config = config
+        self.max_idle_threads = max_idle_threads
+        self.timeouts = 0
+        self._local = _CallerState()
+        # All live stage threads that are not abandoned, and the idle ones among them
+        self._threads: Set[_StageThread] = set()
+        self._idle: List[_StageThread] = []
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def call_deadline(self) -> Optional[float]:
+        """Deadline of the calling thread's call, as a ``time.perf_counter()`` time."""
+        return self._local.call_deadline
+
+    def start_call(self, deadline: Optional[float] = None):
+        """
+        Start the per-call deadline of the calling thread, if one is configured.
+
+        A ``deadline`` from :attr:`call_deadline` continues a call started in another thread
+        instead, e.g. for a sub-batch of the call.
+        """
+        if deadline is not None:
+            self._local.call_deadline = deadline
+        elif self.config.call_ms is not None:
+            self._local.call_deadline = time.perf_counter() + self.config.call_ms / 1000
+
+    def end_call(self):
+        self._local.call_deadline = None
+
+    def timeout(self, step: str) -> Optional[float]:
+        """Seconds left for a step before its deadline, or None if it has no deadline."""
+        timeout = self.config.stages.get(step)
+        if timeout is not None:
+            timeout /= 1000
+        call_deadline = self._local.call_deadline
+        if call_deadline is not None:
+            remaining = call_deadline - time.perf_counter()
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return timeout
+
+    def run(self, step: str, method: Callable, data: Any) -> Any:
+        """
+        Run ``method(data)`` and wait for it until the step's deadline.
+
+        Raises
+        ------
+        InferenceBackendTimeoutError
+            If the deadline expires first
+        """
+        timeout = self.timeout(step)
+        if timeout is None:
+            return method(data)
+
+        if timeout <= 0:
+            self._expired(step, "the call deadline expired before it started")
+
+        thread = self._checkout_thread()
+        context = contextvars.copy_context()
+        future = thread.submit(functools.partial(context.run, method), data)
+        try:
+            result = future.result(timeout)
+        except FutureTimeoutError:
+            # The step cannot be stopped, so its thread is left to finish on its own
+            with self._lock:
+                self._threads.discard(thread)
+            thread.stop()
+            self._expired(step, f"it did not complete within {timeout * 1000:,.1f} ms")
+        except BaseException:
+            self._checkin_thread(thread)
+            raise
+        self._checkin_thread(thread)
+        return result
+
+    def close(self):
+        """Stop the idle stage threads, and the busy ones once their step completes."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._threads.difference_update(idle)
+        for thread in idle:
+            thread.stop()
+
+    def _checkout_thread(self) -> _StageThread:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            thread = _StageThread()
+            self._threads.add(thread)
+            return thread
+
+    def _checkin_thread(self, thread: _StageThread):
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_idle_threads:
+                self._idle.append(thread)
+                return
+            self._threads.discard(thread)
+        thread.stop()
+
+    def _expired(self, step: str, reason: str):
+        with self._lock:
+            self.timeouts += 1
+        raise exceptions.InferenceBackendTimeoutError(f"{step}() timed out: {reason}")
@@ -1,5 +1,7 @@
+import os
 import re
 import sys
+from pathlib import Path
 
 import click
 
@@ -146,6 +148,147 @@ def validate(project_path, verbose, no_warnings):
         sys.exit(1)
 
 
+def _load_project_backend(project_path: str):
+    """Load the inference backend of a project for a long-running command."""
+    from packflow.loaders import InferenceBackendLoader
+
+    project_path = Path(project_path).resolve()
+
+    # Local loaders resolve the backend module relative to the working directory
+    os.chdir(project_path)
+    return InferenceBackendLoader.from_project(project_path)
+
+
+@cli.command()
+@click.argument("project_path", type=str, default=".")
+@click.option(
+    "-i",
+    "--input",
+    "input_path",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Features (.npy or raw binary) or records (.ndjson/.jsonl) to score.",
+)
+@click.option(
+    "-o",
+    "--output",
+    "output_path",
+    required=True,
+    type=click.Path(dir_okay=False),
+    help="Output file: .npy for raw execute() results of features, otherwise NDJSON records.",
+)
+@click.option(
+    "--dtype", type=str, default=None, help="Data type of a raw binary feature file."
+)
+@click.option(
+    "--n-features",
+    type=int,
+    default=None,
+    help="Number of columns of a raw binary feature file.",
+)
+@click.option(
+    "--chunk-size",
+    type=int,
+    default=65_536,
+    show_default=True,
+    help="Approximate number of feature rows per chunk.",
+)
+def run(project_path, input_path, output_path, dtype, n_features, chunk_size):
+    """Score a file of features or records offline with the project's inference backend"""
+    import json
+
+    from packflow.backend.offline import score_features, score_records
+
+    input_path = Path(input_path).resolve()
+    output_path = Path(output_path).resolve()
+
+    backend = None
+    try:
+        backend = _load_project_backend(project_path)
+
+        if input_path.suffix in (".ndjson", ".jsonl"):
+            with input_path.open() as src:
+                records = (json.loads(line) for line in src if line.strip())
+                n_scored = score_records(backend, records, output_path)
+        else:
+            result = score_features(
+                backend,
+                input_path,
+                output_path,
+                chunk_size=chunk_size,
+                dtype=dtype,
+                n_features=n_features,
+            )
+            n_scored = len(result) if hasattr(result, "shape") else result
+    except Exception as e:
+        if backend is not None:
+            backend.close()
+        _error_message(str(e))
+        sys.exit(1)
+
+    backend.close()
+    _success_message(f"Scored {n_scored:,} rows to {output_path}")
+
+
+@cli.command()
+@click.argument("project_path", type=str, default=".")
+@click.option(
+    "-s",
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Path of the Unix domain socket to listen on.",
+)
+@click.option(
+    "--host", type=str, default="127.0.0.1", help="Host to listen on when using --port."
+)
+@click.option(
+    "-p", "--port", type=int, default=None, help="Listen on a TCP port instead."
+)
+@click.option(
+    "--executors",
+    "n_executors",
+    type=int,
+    default=1,
+    help="Number of requests run concurrently. Requires a thread-safe backend.",
+)
+def worker(project_path, socket_path, host, port, n_executors):
+    """Serve the project's inference backend over the binary worker protocol"""
+    if (socket_path is None) == (port is None):
+        _error_message("Provide exactly one of --socket or --port.")
+        sys.exit(1)
+
+    backend = None
+    try:
+        from packflow.serving import WorkerServer
+
+        if socket_path is not None:
+            socket_path = Path(socket_path).resolve()
+
+        backend = _load_project_backend(project_path)
+        server = WorkerServer(
+            backend,
+            socket_path=socket_path,
+            host=host,
+            port=port,
+            n_executors=n_executors,
+        )
+    except Exception as e:
+        if backend is not None:
+            backend.close()
+        _error_message(str(e))
+        sys.exit(1)
+
+    _success_message(f"Worker listening on {server.address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
 @cli.command(hidden=True)
 def roll():
     """Roll the box."""
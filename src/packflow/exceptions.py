@@ -6,6 +6,10 @@ class InferenceBackendRuntimeError(Exception):
     pass
 
 
+class InferenceBackendTimeoutError(InferenceBackendRuntimeError):
+    pass
+
+
 class InferenceBackendValidationError(Exception):
     pass
 
@@ -24,3 +28,7 @@ class PreprocessorInitError(Exception):
 
 class PreprocessorRuntimeError(Exception):
     pass
+
+
+class WorkerProtocolError(Exception):
+    pass
@@ -0,0 +1,5 @@
+from .client import WorkerClient
+from .protocol import Codec
+from .replicas import ReplicaPool
+from .server import WorkerServer
+from .shared_memory import SharedMemoryExecutor
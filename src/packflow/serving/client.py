@@ -0,0 +1,282 @@
+import itertools
+import socket
+from collections import deque
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+import packflow.exceptions as exceptions
+
+from .protocol import (
+    DEFAULT_MAX_FRAME_SIZE,
+    HEADER,
+    Codec,
+    Frame,
+    MessageType,
+    decode_payload,
+    encode_payload,
+    msgpack_available,
+    read_frame,
+    write_frame,
+)
+
+#: Requests in flight on a connection are kept below this size, well within socket buffers
+DEFAULT_MAX_IN_FLIGHT_BYTES = 64 * 1024
+
+
+class WorkerClient:
+    """
+    Minimal client for a packflow :class:`~packflow.serving.server.WorkerServer`.
+
+    Parameters
+    ----------
+    socket_path : str or Path, optional
+        Path of the worker's Unix domain socket
+
+    host : str, optional
+        Worker host when connecting over TCP. Defaults to localhost.
+
+    port : int, optional
+        Worker port when connecting over TCP
+
+    codec : str, optional
+        ``"msgpack"`` or ``"json"``, used to encode records. Defaults to msgpack when the
+        package is installed, otherwise JSON.
+
+    timeout : float, optional
+        Socket timeout in seconds
+
+    Responses are matched to requests by order. If a response cannot be read (e.g. the
+    socket timed out or the worker closed the connection), the connection can no longer be
+    trusted, and every later request fails with a ``WorkerProtocolError``.
+
+    Example
+    -------
+    >>> with WorkerClient("/tmp/packflow.sock") as client:
+    ...     client.infer([{"foo": 1}])
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[Union[str, Path]] = None,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        codec: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+    ):
+        if (socket_path is None) == (port is None):
+            raise ValueError("Provide exactly one of `socket_path` or `port`.")
+
+        if codec is None:
+            codec = "msgpack" if msgpack_available() else "json"
+        self.codec = Codec[codec.upper()]
+        if self.codec == Codec.NUMPY:
+            raise ValueError("Records cannot be encoded with the numpy codec.")
+
+        self.max_frame_size = max_frame_size
+        self._request_ids = itertools.count()
+        # The error that left unread responses on the connection, if any
+        self._broken: Optional[Exception] = None
+
+        if socket_path is not None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(timeout)
+            self._socket.connect(str(socket_path))
+        else:
+            self._socket = socket.create_connection(
+                (host or "127.0.0.1", port), timeout=timeout
+            )
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        self._reader = self._socket.makefile("rb")
+        self._writer = self._socket.makefile("wb", buffering=64 * 1024)
+
+    def __repr__(self):  # pragma: no cover
+        return f"{self.__class__.__name__}[{self._socket.getpeername()}]"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the connection to the worker."""
+        for stream in (self._writer, self._reader):
+            try:
+                stream.close()
+            except OSError:  # pragma: no cover
+                pass
+        self._socket.close()
+
+    def infer(self, inputs: Union[dict, List[dict]]) -> Union[dict, List[dict]]:
+        """
+        Run the worker's backend on a record or list of records.
+
+        Parameters
+        ----------
+        inputs : Union[dict, List[dict]]
+
+        Returns
+        -------
+        Union[dict, List[dict]]
+            The backend's outputs
+        """
+        return next(self.infer_many([inputs]))
+
+    def infer_array(self, features: np.ndarray) -> List[dict]:
+        """
+        Send a numpy array of preprocessed features to the worker.
+
+        The array is sent as raw bytes and passed to the backend's ``run_features()``,
+        skipping the preprocessor on the worker.
+
+        Parameters
+        ----------
+        features : np.ndarray
+
+        Returns
+        -------
+        List[dict]
+        """
+        return next(self.infer_many([features]))
+
+    def infer_many(
+        self,
+        batches: Iterable[Union[dict, List[dict], np.ndarray]],
+        max_in_flight: int = 32,
+        max_in_flight_bytes: int = DEFAULT_MAX_IN_FLIGHT_BYTES,
+    ) -> Iterator[Any]:
+        """
+        Pipeline several requests on the connection.
+
+        Up to ``max_in_flight`` requests are written before waiting for responses, so the
+        worker never idles waiting on a round trip. The worker reads one request at a time
+        and blocks while writing a response that is not read, so the size of the requests
+        in flight is bounded as well: a request is only written before the response to the
+        previous ones if it keeps them within ``max_in_flight_bytes``, which must fit in the
+        socket buffers. Larger requests are sent one at a time. When a request fails, or the
+        iteration is stopped early, the responses to the requests already sent are read and
+        discarded, so that the connection can be used for the next requests.
+
+        Parameters
+        ----------
+        batches : Iterable
+            Records, lists of records, or numpy arrays of features
+
+        max_in_flight : int
+            Maximum number of requests sent without having received their response
+
+        max_in_flight_bytes : int
+            Maximum total size in bytes of the request frames sent without having received
+            their response, unless a single request is larger. Defaults to 64 KiB.
+
+        Yields
+        ------
+        Any
+            The response for each batch, in order
+        """
+        # Request ids and frame sizes of the requests sent, in order
+        pending = deque()
+        in_flight_bytes = 0
+        # A request encoded but not sent yet, as it would exceed max_in_flight_bytes
+        request = None
+        batches = iter(batches)
+
+        try:
+            while True:
+                while len(pending) < max_in_flight:
+                    if request is None:
+                        batch = next(batches, None)
+                        if batch is None:
+                            break
+                        request = self._encode(batch)
+                    size = HEADER.size + len(request[1])
+                    if pending and in_flight_bytes + size > max_in_flight_bytes:
+                        break
+                    pending.append((self._send(*request), size))
+                    in_flight_bytes += size
+                    request = None
+
+                if not pending:
+                    return
+
+                self._writer.flush()
+                request_id, size = pending.popleft()
+                in_flight_bytes -= size
+                yield self._receive(request_id)
+        finally:
+            if pending:
+                self._discard_responses(pending)
+
+    def _encode(self, batch: Any) -> Tuple[Codec, bytes]:
+        """Encode a batch as the codec and payload of a request frame."""
+        codec = Codec.NUMPY if isinstance(batch, np.ndarray) else self.codec
+        return codec, encode_payload(batch, codec)
+
+    def _send(self, codec: Codec, payload: bytes) -> int:
+        """Write a request frame (without flushing) and return its request id."""
+        if self._broken is not None:
+            raise exceptions.WorkerProtocolError(
+                f"The connection to the worker is unusable after an earlier failure: "
+                f"{self._broken}"
+            ) from self._broken
+
+        request_id = next(self._request_ids) & 0xFFFFFFFF
+        write_frame(
+            self._writer,
+            request_id,
+            MessageType.REQUEST,
+            codec,
+            payload,
+            response_codec=self.codec,
+        )
+        return request_id
+
+    def _receive(self, request_id: int) -> Any:
+        """Read the response to a request, raising if the worker failed to run it."""
+        frame = self._read_response(request_id)
+        data = decode_payload(frame.payload, frame.codec)
+
+        if frame.message_type == MessageType.ERROR:
+            raise exceptions.InferenceBackendRuntimeError(
+                f"Worker failed to run request {request_id}: {data['error']}: {data['message']}"
+            )
+
+        return data
+
+    def _read_response(self, request_id: int) -> Frame:
+        """Read the next response frame and make sure it answers the expected request.
+
+        If it cannot be read, the responses are out of step with the requests, so the
+        client is marked as broken.
+        """
+        try:
+            frame = read_frame(self._reader, self.max_frame_size)
+
+            if frame is None:
+                raise exceptions.WorkerProtocolError(
+                    "Worker closed the connection before responding."
+                )
+
+            if frame.request_id != request_id:
+                raise exceptions.WorkerProtocolError(
+                    f"Received response for request {frame.request_id}, expected {request_id}."
+                )
+        except (exceptions.WorkerProtocolError, OSError) as e:
+            self._broken = e
+            raise
+        return frame
+
+    def _discard_responses(self, pending: deque):
+        """Read and discard the responses to requests that were sent but not received."""
+        try:
+            self._writer.flush()
+            while pending:
+                request_id, _ = pending.popleft()
+                self._read_response(request_id)
+        except (exceptions.WorkerProtocolError, OSError) as e:
+            # The client is unusable; the error is raised by its next request
+            self._broken = self._broken or e
@@ -0,0 +1,244 @@
+"""
+Length-prefixed binary framing used by the packflow worker.
+
+Every message on the wire is a single frame::
+
+    +----------------+----------------+--------+--------+-----------------+-----------+
+    | payload length | request id     | type   | codec  | response codec  | payload   |
+    | uint32 (BE)    | uint32 (BE)    | uint8  | uint8  | uint8           | bytes     |
+    +----------------+----------------+--------+--------+-----------------+-----------+
+
+Requests carry the codec of their payload and the codec the client wants the response
+encoded with. Responses are written in the order requests were received, so clients may
+pipeline many requests on one connection and match them back by request id.
+"""
+
+import enum
+import importlib
+import json
+import struct
+from typing import Any, BinaryIO, NamedTuple, Optional
+
+import numpy as np
+
+import packflow.exceptions as exceptions
+from packflow.utils import encode_json
+
+HEADER = struct.Struct("!IIBBB")
+
+#: Frames larger than this are rejected before any payload is read
+DEFAULT_MAX_FRAME_SIZE = 256 * 1024 * 1024
+
+
+class Codec(enum.IntEnum):
+    JSON = 0
+    MSGPACK = 1
+    NUMPY = 2
+
+
+class MessageType(enum.IntEnum):
+    REQUEST = 1
+    RESPONSE = 2
+    ERROR = 3
+
+
+class Frame(NamedTuple):
+    request_id: int
+    message_type: MessageType
+    codec: Codec
+    response_codec: Codec
+    payload: bytes
+
+
+def _import_msgpack():
+    try:
+        return importlib.import_module("msgpack")
+    except ImportError as e:
+        raise exceptions.WorkerProtocolError(
+            "The msgpack codec requires the `msgpack` package. Install it with `pip install msgpack`."
+        ) from e
+
+
+def msgpack_available() -> bool:
+    """Whether the optional msgpack codec can be used in the current environment."""
+    try:
+        _import_msgpack()
+    except exceptions.WorkerProtocolError:
+        return False
+    return True
+
+
+# -- NUMPY --
+
+_NDARRAY_PREFIX = struct.Struct("!BB")
+
+
+def _encode_ndarray(array: np.ndarray) -> bytes:
+    """Encode an array as: dtype length, ndim, dtype string, shape (uint64 each), raw C-order data."""
+    array = np.ascontiguousarray(array)
+    if array.dtype.hasobject:
+        raise exceptions.WorkerProtocolError(
+            "Arrays with object dtype cannot be sent with the numpy codec."
+        )
+    dtype = array.dtype.str.encode("ascii")
+    return b"".join(
+        (
+            _NDARRAY_PREFIX.pack(len(dtype), array.ndim),
+            dtype,
+            struct.pack(f"!{array.ndim}Q", *array.shape),
+            array.tobytes(),
+        )
+    )
+
+
+def _decode_ndarray(payload: bytes) -> np.ndarray:
+    """Decode an array without copying the data out of the payload buffer (read-only view)."""
+    dtype_len, ndim = _NDARRAY_PREFIX.unpack_from(payload, 0)
+    offset = _NDARRAY_PREFIX.size
+    dtype = np.dtype(bytes(payload[offset : offset + dtype_len]).decode("ascii"))
+    offset += dtype_len
+    shape = struct.unpack_from(f"!{ndim}Q", payload, offset)
+    offset += 8 * ndim
+    return np.frombuffer(payload, dtype=dtype, offset=offset).reshape(shape)
+
+
+# -- PAYLOADS --
+
+
+def encode_payload(obj: Any, codec: Codec) -> bytes:
+    """
+    Serialize an object with the requested codec.
+
+    Parameters
+    ----------
+    obj : Any
+        Records (or an ndarray for the numpy codec). With the JSON codec, non-native values
+        such as numpy scalars are converted during encoding.
+
+    codec : Codec
+
+    Returns
+    -------
+    bytes
+    """
+    if codec == Codec.JSON:
+        return encode_json(obj)
+    if codec == Codec.MSGPACK:
+        return _import_msgpack().packb(obj, use_bin_type=True)
+    if codec == Codec.NUMPY:
+        if not isinstance(obj, np.ndarray):
+            raise exceptions.WorkerProtocolError(
+                f"The numpy codec can only encode numpy arrays. Received type: {type(obj)}"
+            )
+        return _encode_ndarray(obj)
+
+    raise exceptions.WorkerProtocolError(f"Unknown codec: {codec}")
+
+
+def decode_payload(payload: bytes, codec: Codec) -> Any:
+    """
+    Deserialize a payload that was encoded with the given codec.
+
+    Parameters
+    ----------
+    payload : bytes
+
+    codec : Codec
+
+    Returns
+    -------
+    Any
+    """
+    if codec == Codec.JSON:
+        return json.loads(payload)
+    if codec == Codec.MSGPACK:
+        return _import_msgpack().unpackb(payload, raw=False)
+    if codec == Codec.NUMPY:
+        return _decode_ndarray(payload)
+
+    raise exceptions.WorkerProtocolError(f"Unknown codec: {codec}")
+
+
+# -- FRAMES --
+
+
+def write_frame(
+    stream: BinaryIO,
+    request_id: int,
+    message_type: MessageType,
+    codec: Codec,
+    payload: bytes,
+    response_codec: Optional[Codec] = None,
+) -> None:
+    """
+    Write a single frame to a buffered binary stream.
+
+    The stream is not flushed, allowing several frames to be pipelined in one write.
+    """
+    stream.write(
+        HEADER.pack(
+            len(payload),
+            request_id,
+            message_type,
+            codec,
+            codec if response_codec is None else response_codec,
+        )
+    )
+    stream.write(payload)
+
+
+def read_frame(
+    stream: BinaryIO, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE
+) -> Optional[Frame]:
+    """
+    Read a single frame from a buffered binary stream.
+
+    Parameters
+    ----------
+    stream : BinaryIO
+        A buffered reader (e.g. ``socket.makefile("rb")``)
+
+    max_frame_size : int
+        Maximum accepted payload size in bytes
+
+    Returns
+    -------
+    Optional[Frame]
+        The next frame, or None if the peer closed the connection between frames.
+
+    Raises
+    ------
+    WorkerProtocolError
+        If the stream ends mid-frame or the frame is malformed.
+    """
+    header = stream.read(HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        raise exceptions.WorkerProtocolError(
+            "Connection closed while reading a frame header."
+        )
+
+    length, request_id, message_type, codec, response_codec = HEADER.unpack(header)
+
+    if length > max_frame_size:
+        raise exceptions.WorkerProtocolError(
+            f"Frame of {length} bytes exceeds the maximum frame size of {max_frame_size} bytes."
+        )
+
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise exceptions.WorkerProtocolError(
+            "Connection closed while reading a frame payload."
+        )
+
+    try:
+        return Frame(
+            request_id,
+            MessageType(message_type),
+            Codec(codec),
+            Codec(response_codec),
+            payload,
+        )
+    except ValueError as e:
+        raise exceptions.WorkerProtocolError(f"Malformed frame header: {e}") from e
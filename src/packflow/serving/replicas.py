@@ -0,0 +1,235 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import packflow.exceptions as exceptions
+from packflow.backend import InferenceBackend
+from packflow.backend.base import share_artifacts
+from packflow.loaders import InferenceBackendLoader
+from packflow.logger import get_logger
+
+logger = get_logger()
+
+
+class _Waiter:
+    """A caller waiting for a replica, woken up with the replica it was handed."""
+
+    __slots__ = ("event", "replica")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.replica: Optional[InferenceBackend] = None
+
+
+class ReplicaPool:
+    """
+    Run calls concurrently on a fixed number of replicas of a backend.
+
+    Backends that are not thread-safe (e.g. stateful tokenizers or legacy libraries) can
+    only run one call at a time. The pool builds ``n_replicas`` independent instances with
+    ``loader.load()`` and checks out a free replica for each call, so that up to
+    ``n_replicas`` calls run in parallel with a predictable memory footprint. When every
+    replica is busy, callers wait in a first-in, first-out queue: a replica that is
+    released is handed directly to the caller that has waited the longest.
+
+    Read-only artifacts loaded with :meth:`InferenceBackend.shared_artifact` in
+    ``initialize()`` are loaded once and shared by all replicas.
+
+    Parameters
+    ----------
+    loader : InferenceBackendLoader
+        Loader used to build each replica. It must build a new instance on every load.
+
+    n_replicas : int
+        Number of replicas
+
+    acquire_timeout_s : float, optional
+        Maximum time a call waits for a free replica, after which it fails with an
+        ``InferenceBackendTimeoutError``. Defaults to waiting indefinitely.
+
+    **backend_kwargs
+        Keyword arguments passed to ``loader.load()`` for each replica
+
+    Examples
+    --------
+    >>> pool = ReplicaPool(LocalLoader("inference:Backend"), n_replicas=4)
+    >>> outputs = pool(records)  # Safe to call from several threads
+    """
+
+    def __init__(
+        self,
+        loader: InferenceBackendLoader,
+        n_replicas: int = 1,
+        acquire_timeout_s: Optional[float] = None,
+        **backend_kwargs,
+    ):
+        if n_replicas < 1:
+            raise ValueError("`n_replicas` must be at least 1.")
+
+        self.loader = loader
+        self.acquire_timeout_s = acquire_timeout_s
+        self.backend_kwargs = backend_kwargs
+
+        start = time.perf_counter()
+        self.artifacts: Dict[str, Any] = {}
+        with share_artifacts(self.artifacts):
+            self.replicas: List[InferenceBackend] = [
+                loader.load(**backend_kwargs) for _ in range(n_replicas)
+            ]
+        if len({id(replica) for replica in self.replicas}) != n_replicas:
+            raise exceptions.InferenceBackendLoadError(
+                "The loader returned the same backend instance more than once. Replicas "
+                "require a loader that points to a backend class, not an instance."
+            )
+        logger.info(
+            f"Built {n_replicas} replicas of {self.replicas[0].__class__.__name__} in "
+            f"{time.perf_counter() - start:,.4f} s, sharing {len(self.artifacts)} artifacts"
+        )
+
+        self._free = deque(self.replicas)
+        self._waiters = deque()
+        self._closed = False
+        self._lock = threading.Lock()
+
+        self._started_at = time.perf_counter()
+        self._checkout_times: Dict[int, float] = {}
+        self._busy_s = 0.0
+        self._calls = 0
+        self._total_wait_ms = 0.0
+        self.last_wait_ms = 0.0
+
+    def __repr__(self):  # pragma: no cover
+        return f"{self.__class__.__name__}[{self.loader.path}, replicas={len(self.replicas)}]"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __call__(self, inputs: Union[dict, List[dict]]) -> Union[dict, List[dict]]:
+        """Run the inference pipeline on a free replica."""
+        with self.checkout() as replica:
+            return replica(inputs)
+
+    def run_features(self, features: Any) -> List[dict]:
+        """Run :meth:`InferenceBackend.run_features` on a free replica."""
+        with self.checkout() as replica:
+            return replica.run_features(features)
+
+    def execute_features(self, features: Any) -> Any:
+        """Run :meth:`InferenceBackend.execute_features` on a free replica."""
+        with self.checkout() as replica:
+            return replica.execute_features(features)
+
+    @contextmanager
+    def checkout(self) -> Iterator[InferenceBackend]:
+        """
+        Check out a free replica for the duration of the context, waiting for one if needed.
+
+        Raises
+        ------
+        InferenceBackendTimeoutError
+            If no replica was released within ``acquire_timeout_s``
+        """
+        replica = self._acquire()
+        try:
+            yield replica
+        finally:
+            self._release(replica)
+
+    def _acquire(self) -> InferenceBackend:
+        start = time.perf_counter()
+        waiter = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot call a closed replica pool.")
+            if self._free and not self._waiters:
+                replica = self._free.popleft()
+            else:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+
+        if waiter is not None:
+            if not waiter.event.wait(self.acquire_timeout_s):
+                with self._lock:
+                    # The replica may have been handed over right after the timeout
+                    if waiter.replica is None and not self._closed:
+                        self._waiters.remove(waiter)
+                        raise exceptions.InferenceBackendTimeoutError(
+                            f"No replica was released within {self.acquire_timeout_s} s"
+                        )
+            replica = waiter.replica
+            if replica is None:
+                raise RuntimeError(
+                    "The replica pool was closed while waiting for a replica."
+                )
+
+        now = time.perf_counter()
+        wait_ms = (now - start) * 1000
+        with self._lock:
+            self._checkout_times[id(replica)] = now
+            self._calls += 1
+            self._total_wait_ms += wait_ms
+            self.last_wait_ms = wait_ms
+        return replica
+
+    def _release(self, replica: InferenceBackend):
+        with self._lock:
+            self._busy_s += time.perf_counter() - self._checkout_times.pop(id(replica))
+            if self._closed:
+                return
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.replica = replica
+                waiter.event.set()
+            else:
+                self._free.append(replica)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Current and cumulative pool metrics.
+
+        Returns
+        -------
+        Dict[str, Any]
+            - ``n_replicas``: the number of replicas
+            - ``busy_replicas``: the number of replicas currently checked out
+            - ``waiting_callers``: the number of callers currently waiting for a replica
+            - ``utilization``: the fraction of replica time spent checked out since the
+              pool was built
+            - ``calls``: the number of checkouts
+            - ``wait_ms``: the wait of the last checkout
+            - ``mean_wait_ms``: the average wait of all checkouts
+        """
+        with self._lock:
+            now = time.perf_counter()
+            busy_s = self._busy_s + sum(
+                now - checked_out for checked_out in self._checkout_times.values()
+            )
+            elapsed_s = (now - self._started_at) * len(self.replicas)
+            return dict(
+                n_replicas=len(self.replicas),
+                busy_replicas=len(self._checkout_times),
+                waiting_callers=len(self._waiters),
+                utilization=busy_s / elapsed_s if elapsed_s else 0.0,
+                calls=self._calls,
+                wait_ms=self.last_wait_ms,
+                mean_wait_ms=self._total_wait_ms / self._calls if self._calls else 0.0,
+            )
+
+    def close(self):
+        """
+        Close the replicas and release them. Calls in progress complete, and waiting
+        callers fail.
+        """
+        with self._lock:
+            self._closed = True
+            self._free.clear()
+            while self._waiters:
+                self._waiters.popleft().event.set()
+        for replica in self.replicas:
+            replica.close()
+        self.replicas = []
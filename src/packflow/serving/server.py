@@ -0,0 +1,295 @@
+import os
+import socket
+import socketserver
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Tuple, Union
+
+import packflow.exceptions as exceptions
+from packflow.backend import InferenceBackend
+from packflow.backend.admission import AdmissionQueue
+from packflow.backend.configuration import AdmissionConfig
+from packflow.logger import get_logger
+
+from .protocol import (
+    DEFAULT_MAX_FRAME_SIZE,
+    Codec,
+    Frame,
+    MessageType,
+    decode_payload,
+    encode_payload,
+    read_frame,
+    write_frame,
+)
+
+logger = get_logger()
+
+
+class _Request(NamedTuple):
+    frame: Frame
+    data: Any
+    future: Future
+
+
+def _n_records(data: Any) -> int:
+    """Number of records in a decoded request payload."""
+    return 1 if isinstance(data, dict) else len(data)
+
+
+class _FrameHandler(socketserver.StreamRequestHandler):
+    """
+    Handles one connection: reads frames until EOF and answers them in order.
+
+    Frames are processed one at a time: the next frame is read once the previous one is
+    answered. Pipelined requests on a connection therefore save round trips, but do not run
+    concurrently, even with several executors. Concurrent requests need separate
+    connections.
+    """
+
+    # Buffer writes so the header and a small payload leave in a single send
+    wbufsize = 64 * 1024
+
+    def setup(self):
+        if self.request.family in (socket.AF_INET, socket.AF_INET6):
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        super().setup()
+
+    def handle(self):
+        worker: WorkerServer = self.server.worker
+        while True:
+            try:
+                frame = read_frame(self.rfile, worker.max_frame_size)
+            except exceptions.WorkerProtocolError as e:
+                logger.warning(f"Closing worker connection: {e}")
+                return
+            except ConnectionError:
+                return
+
+            if frame is None:
+                return
+
+            message_type, codec, payload = worker.handle_frame(frame)
+            try:
+                write_frame(self.wfile, frame.request_id, message_type, codec, payload)
+                self.wfile.flush()
+            except (ConnectionError, ValueError):
+                return
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class _ThreadingUnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+else:  # pragma: no cover
+    _ThreadingUnixServer = None
+
+
+class WorkerServer:
+    """
+    Serve an InferenceBackend over the packflow binary framing protocol.
+
+    The worker listens on a Unix domain socket (or a TCP address) and answers
+    length-prefixed frames (see :mod:`packflow.serving.protocol`). Each connection is served
+    by its own thread and requests on a connection may be pipelined; responses are written
+    in request order, and requests of a single connection run one at a time. Decoded
+    requests pass through an :class:`~packflow.backend.admission.AdmissionQueue` and are
+    executed by a pool of ``n_executors`` backend threads (one, by default, so requests run
+    one at a time).
+
+    Parameters
+    ----------
+    backend : InferenceBackend
+        An instantiated backend
+
+    socket_path : str or Path, optional
+        Path of the Unix domain socket to listen on
+
+    host : str, optional
+        Host to listen on when serving over TCP
+
+    port : int, optional
+        Port to listen on when serving over TCP. Use 0 to pick a free port.
+
+    max_frame_size : int
+        Maximum accepted request payload size in bytes
+
+    admission : AdmissionConfig, optional
+        Bounds the number of requests waiting for the backend and the policy applied when
+        the bound is reached. Defaults to the backend's ``admission`` config.
+
+    n_executors : int
+        Number of threads running requests through the backend concurrently. Values larger
+        than 1 require a backend declared ``thread_safe``; they only improve throughput when
+        the backend releases the GIL (e.g. in ``execute``).
+    """
+
+    def __init__(
+        self,
+        backend: InferenceBackend,
+        socket_path: Optional[Union[str, Path]] = None,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+        admission: Optional[AdmissionConfig] = None,
+        n_executors: int = 1,
+    ):
+        if (socket_path is None) == (port is None):
+            raise ValueError("Provide exactly one of `socket_path` or `port`.")
+        if n_executors < 1:
+            raise ValueError("`n_executors` must be at least 1.")
+        if n_executors > 1 and not backend.thread_safe:
+            raise ValueError(
+                f"{backend.__class__.__name__} is not declared thread_safe and cannot be run "
+                f"by {n_executors} executors concurrently."
+            )
+
+        self.backend = backend
+        self.max_frame_size = max_frame_size
+        self._thread = None
+
+        self._queue = AdmissionQueue(
+            admission or backend.config.admission,
+            on_shed=self._reject,
+            weight=lambda request: _n_records(request.data),
+        )
+        self._executors = [
+            threading.Thread(target=self._execute_requests, daemon=True)
+            for _ in range(n_executors)
+        ]
+        for executor in self._executors:
+            executor.start()
+
+        if socket_path is not None:
+            if _ThreadingUnixServer is None:  # pragma: no cover
+                raise OSError("Unix domain sockets are not supported on this platform.")
+            self.socket_path = Path(socket_path)
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+            self._server = _ThreadingUnixServer(str(self.socket_path), _FrameHandler)
+        else:
+            self.socket_path = None
+            self._server = _ThreadingTCPServer(
+                (host or "127.0.0.1", port), _FrameHandler
+            )
+
+        self._server.worker = self
+
+    def __repr__(self):  # pragma: no cover
+        return f"{self.__class__.__name__}[{self.address}]"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def address(self) -> Union[str, Tuple[str, int]]:
+        """The socket path or (host, port) the worker is listening on."""
+        return self._server.server_address
+
+    def handle_frame(self, frame: Frame) -> Tuple[MessageType, Codec, bytes]:
+        """
+        Run the backend on a single request frame.
+
+        Numpy payloads are treated as preprocessed features and passed to
+        :meth:`InferenceBackend.run_features`; all other payloads are passed to the backend
+        as records.
+
+        Returns
+        -------
+        Tuple[MessageType, Codec, bytes]
+            The type, codec, and payload of the response frame
+        """
+        try:
+            if frame.message_type != MessageType.REQUEST:
+                raise exceptions.WorkerProtocolError(
+                    f"Expected a request frame. Received: {frame.message_type.name}"
+                )
+
+            data = decode_payload(frame.payload, frame.codec)
+
+            request = _Request(frame, data, Future())
+            if not self._queue.put(request) and not request.future.done():
+                # Shed requests are failed by the queue; the others were refused because
+                # the queue is closed
+                raise exceptions.InferenceBackendRuntimeError(
+                    "The worker is closed and no longer accepts requests."
+                )
+            outputs = request.future.result()
+
+            return (
+                MessageType.RESPONSE,
+                frame.response_codec,
+                encode_payload(outputs, frame.response_codec),
+            )
+        except Exception as e:
+            logger.error(f"Request {frame.request_id} failed: {e}")
+            error = {"error": e.__class__.__name__, "message": str(e)}
+            return MessageType.ERROR, Codec.JSON, encode_payload(error, Codec.JSON)
+
+    def _reject(self, request: "_Request", reason: str):
+        """Fail a request that was shed by the admission queue."""
+        request.future.set_exception(
+            exceptions.InferenceBackendRuntimeError(
+                f"Request shed by the worker's admission policy (reason: {reason})"
+            )
+        )
+
+    def _execute_requests(self):
+        """Run admitted requests through the backend, one at a time, in admission order.
+
+        Each executor thread runs this loop, so with several executors requests start in
+        admission order but may complete out of order.
+        """
+        while True:
+            requests = self._queue.get_batch(1)
+            if not requests:
+                return
+
+            request = requests[0]
+            if not request.future.set_running_or_notify_cancel():  # pragma: no cover
+                continue
+
+            try:
+                with self.backend.report_metrics(**self._queue.metrics()):
+                    if request.frame.codec == Codec.NUMPY:
+                        outputs = self.backend.run_features(request.data)
+                    else:
+                        outputs = self.backend(request.data)
+                request.future.set_result(outputs)
+            except Exception as e:
+                request.future.set_exception(e)
+
+    def serve_forever(self):
+        """Serve requests until :meth:`close` is called from another thread."""
+        logger.info(f"Packflow worker listening on {self.address}")
+        self._server.serve_forever(poll_interval=0.1)
+
+    def start(self) -> "WorkerServer":
+        """Serve requests from a background daemon thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        """Stop serving, release the listening socket, and close the backend."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        self._queue.close()
+        for executor in self._executors:
+            executor.join()
+        self.backend.close()
+        if self.socket_path is not None and self.socket_path.exists():
+            os.unlink(self.socket_path)
@@ -0,0 +1,456 @@
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from multiprocessing.reduction import ForkingPickler
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+import packflow.exceptions as exceptions
+from packflow.backend.configuration import DeadlinesConfig
+from packflow.backend.preprocessors import Preprocessor
+from packflow.loaders import InferenceBackendLoader
+from packflow.logger import get_logger
+
+logger = get_logger()
+
+DEFAULT_SLOT_SIZE = 8 * 1024 * 1024
+
+
+class ArrayHandle(NamedTuple):
+    """Reference to an array stored in a slot of a :class:`SharedMemoryRing`."""
+
+    slot: int
+    dtype: str
+    shape: tuple
+
+
+class SharedMemoryRing:
+    """
+    A shared memory segment split into fixed-size slots, each holding one array.
+
+    The process that creates the ring owns the segment and is responsible for unlinking it.
+    Other processes attach to it by name. Arrays are written with one copy into a slot and
+    read back as zero-copy views.
+
+    Parameters
+    ----------
+    n_slots : int
+        Number of slots in the ring
+
+    slot_size : int
+        Size of each slot in bytes
+
+    name : str, optional
+        Name of an existing segment to attach to. A new segment is created if not provided.
+    """
+
+    def __init__(self, n_slots: int, slot_size: int, name: Optional[str] = None):
+        self.n_slots = n_slots
+        self.slot_size = slot_size
+        self.owner = name is None
+        self._shm = shared_memory.SharedMemory(
+            name=name, create=self.owner, size=n_slots * slot_size
+        )
+        if self.owner:
+            # Unlink the segment even if close() is never called
+            self._finalizer = weakref.finalize(self, _unlink_segment, self._shm.name)
+
+    def __repr__(self):  # pragma: no cover
+        return (
+            f"{self.__class__.__name__}[{self.name}, {self.n_slots}x{self.slot_size}B]"
+        )
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def spec(self) -> dict:
+        """Arguments to attach to this ring from another process."""
+        return dict(n_slots=self.n_slots, slot_size=self.slot_size, name=self.name)
+
+    def fits(self, array: np.ndarray) -> bool:
+        """Whether the array can be stored in a single slot."""
+        return not array.dtype.hasobject and array.nbytes <= self.slot_size
+
+    def write(self, slot: int, array: np.ndarray) -> ArrayHandle:
+        """
+        Copy an array into a slot.
+
+        Parameters
+        ----------
+        slot : int
+
+        array : np.ndarray
+
+        Returns
+        -------
+        ArrayHandle
+            A small, picklable reference to the stored array
+        """
+        if not self.fits(array):
+            raise ValueError(
+                f"Array of {array.nbytes} bytes with dtype {array.dtype} does not fit a "
+                f"{self.slot_size} byte shared memory slot."
+            )
+        handle = ArrayHandle(slot, array.dtype.str, tuple(array.shape))
+        np.copyto(self.view(handle), array, casting="no")
+        return handle
+
+    def view(self, handle: ArrayHandle) -> np.ndarray:
+        """Zero-copy view of the array referenced by the handle."""
+        return np.ndarray(
+            handle.shape,
+            dtype=np.dtype(handle.dtype),
+            buffer=self._shm.buf,
+            offset=handle.slot * self.slot_size,
+        )
+
+    def close(self):
+        """Detach from the segment, unlinking it if this process created it."""
+        self._shm.close()
+        if self.owner:
+            self._finalizer()
+
+
+def _unlink_segment(name: str):
+    try:
+        segment = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    segment.close()
+    segment.unlink()
+
+
+def _worker_main(loader, backend_kwargs, input_spec, output_spec, conn):
+    """Entry point of a worker process: run ``execute`` on views of the input ring."""
+    backend = loader.load(**backend_kwargs)
+    inputs = SharedMemoryRing(**input_spec)
+    outputs = SharedMemoryRing(**output_spec)
+
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                break
+            if message is None:
+                break
+
+            slot, payload = message
+            features = (
+                inputs.view(payload) if isinstance(payload, ArrayHandle) else payload
+            )
+            try:
+                result = backend._execute_and_profile_step(backend.execute, features)
+                if isinstance(result, np.ndarray) and outputs.fits(result):
+                    result = outputs.write(slot, result)
+                conn.send((True, result))
+            except exceptions.InferenceBackendTimeoutError as e:
+                # The stuck step keeps running in this process, which is replaced
+                conn.send((False, e))
+            except Exception as e:
+                conn.send((False, f"{e.__class__.__name__}: {e}"))
+            finally:
+                del features
+    finally:
+        inputs.close()
+        outputs.close()
+        conn.close()
+
+
+def _poll_interval(deadline: Optional[float], interval: float = 0.1) -> float:
+    """Time to wait for a worker before checking on it again."""
+    if deadline is None:
+        return interval
+    return max(min(interval, deadline - time.monotonic()), 0)
+
+
+class _Task(NamedTuple):
+    future: Future
+    features: Any
+
+
+class SharedMemoryExecutor:
+    """
+    Run an InferenceBackend's ``execute`` step in worker processes without pickling arrays.
+
+    Each batch of features is copied once into a slot of a shared input ring, and the worker
+    runs ``execute`` directly on a zero-copy view of that slot. Array results are written to
+    the matching slot of a shared output ring and copied out once by the caller. Objects that
+    are not numpy arrays, or arrays larger than a slot, fall back to being pickled.
+
+    Segments are owned by this process: they are unlinked on :meth:`close`, when the executor
+    is garbage collected, and by Python's resource tracker if the process dies. Workers that
+    crash are respawned and the batch they were running fails with
+    ``InferenceBackendRuntimeError``.
+
+    When ``deadlines`` are configured in ``backend_kwargs``, a worker whose ``execute`` step
+    runs past the ``execute`` stage deadline (or the per-call deadline) is killed and
+    respawned, and the batch fails with ``InferenceBackendTimeoutError``. The number of
+    timeouts is available as the ``timeouts`` attribute.
+
+    Parameters
+    ----------
+    loader : InferenceBackendLoader
+        Loader used by every worker process to build its own backend
+
+    n_workers : int
+        Number of worker processes
+
+    n_slots : int, optional
+        Number of slots per ring, i.e. the maximum number of batches in flight.
+        Defaults to the number of workers.
+
+    slot_size : int
+        Size of each slot in bytes. Defaults to 8 MiB.
+
+    preprocessor : Preprocessor, optional
+        Preprocessor (e.g. a ``NumpyPreprocessor``) applied in the calling process to batches
+        submitted as records.
+
+    start_method : str, optional
+        The multiprocessing start method for the workers
+
+    **backend_kwargs
+        Keyword arguments passed to ``loader.load()`` in each worker
+    """
+
+    def __init__(
+        self,
+        loader: InferenceBackendLoader,
+        n_workers: int = 1,
+        n_slots: Optional[int] = None,
+        slot_size: int = DEFAULT_SLOT_SIZE,
+        preprocessor: Optional[Preprocessor] = None,
+        start_method: Optional[str] = None,
+        **backend_kwargs,
+    ):
+        self.loader = loader
+        self.backend_kwargs = backend_kwargs
+        self.preprocessor = preprocessor
+        self._context = multiprocessing.get_context(start_method)
+
+        deadlines = DeadlinesConfig.model_validate(backend_kwargs.get("deadlines", {}))
+        limits = [
+            ms
+            for ms in (deadlines.stages.get("execute"), deadlines.call_ms)
+            if ms is not None
+        ]
+        self.timeout = min(limits) / 1000 if limits else None
+        self.timeouts = 0
+        self._timeouts_lock = threading.Lock()
+
+        self.n_slots = n_slots = n_slots or n_workers
+        self._inputs = SharedMemoryRing(n_slots, slot_size)
+        self._outputs = SharedMemoryRing(n_slots, slot_size)
+        self._free_slots = queue.Queue()
+        for slot in range(n_slots):
+            self._free_slots.put(slot)
+
+        self._tasks = queue.Queue()
+        self._closed = False
+        self._dispatchers = [
+            threading.Thread(target=self._dispatch, daemon=True)
+            for _ in range(n_workers)
+        ]
+        for thread in self._dispatchers:
+            thread.start()
+
+    def __repr__(self):  # pragma: no cover
+        return f"{self.__class__.__name__}[{self.loader.path}, workers={len(self._dispatchers)}]"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, features: Union[np.ndarray, List[dict]]) -> Future:
+        """
+        Schedule ``execute`` on a batch of features.
+
+        Parameters
+        ----------
+        features : Union[np.ndarray, List[dict]]
+            Preprocessed features, or records if a ``preprocessor`` was configured
+
+        Returns
+        -------
+        Future
+            Resolves to the output of the backend's ``execute`` step
+        """
+        if self._closed:
+            raise RuntimeError("Cannot submit to a closed executor.")
+
+        if self.preprocessor is not None and isinstance(features, list):
+            features = self.preprocessor(features)
+
+        future = Future()
+        self._tasks.put(_Task(future, features))
+        return future
+
+    def execute(self, features: Union[np.ndarray, List[dict]]) -> Any:
+        """Run ``execute`` on a batch of features and wait for the result."""
+        return self.submit(features).result()
+
+    def map(self, batches: Iterable[Union[np.ndarray, List[dict]]]) -> Iterator[Any]:
+        """
+        Run ``execute`` on every batch, yielding results in order.
+
+        Batches are read from ``batches`` lazily: at most ``n_slots`` of them are in flight,
+        and the next one is submitted once the oldest result is yielded, so that large or
+        unbounded iterables are not held in memory.
+        """
+        batches = iter(batches)
+        futures = deque(
+            self.submit(batch) for batch in itertools.islice(batches, self.n_slots)
+        )
+        while futures:
+            result = futures.popleft().result()
+            for batch in itertools.islice(batches, 1):
+                futures.append(self.submit(batch))
+            yield result
+
+    def close(self):
+        """Stop the workers and unlink the shared memory segments."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._dispatchers:
+            self._tasks.put(None)
+        for thread in self._dispatchers:
+            thread.join()
+        self._inputs.close()
+        self._outputs.close()
+
+    def _spawn(self):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(
+                self.loader,
+                self.backend_kwargs,
+                self._inputs.spec(),
+                self._outputs.spec(),
+                child_conn,
+            ),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return process, parent_conn
+
+    def _dispatch(self):
+        """Feed one worker process with tasks, respawning it if it dies."""
+        process, conn = self._spawn()
+        try:
+            while True:
+                task = self._tasks.get()
+                if task is None:
+                    return
+                if not task.future.set_running_or_notify_cancel():
+                    continue
+
+                slot = self._free_slots.get()
+                try:
+                    result = self._run(process, conn, slot, task.features)
+                    task.future.set_result(result)
+                except exceptions.InferenceBackendRuntimeError as e:
+                    task.future.set_exception(e)
+                    if not process.is_alive():
+                        logger.warning(
+                            f"Shared memory worker exited with code {process.exitcode}. Respawning."
+                        )
+                        conn.close()
+                        process, conn = self._spawn()
+                except Exception as e:
+                    # An unexpected failure must not stop the dispatcher, which would leave
+                    # every later task unresolved. The worker may be in an unknown state
+                    # (e.g. half a message was sent), so it is replaced.
+                    task.future.set_exception(e)
+                    logger.warning(
+                        f"Shared memory dispatcher failed: {e.__class__.__name__}: {e}. "
+                        f"Respawning the worker."
+                    )
+                    process.kill()
+                    process.join()
+                    conn.close()
+                    process, conn = self._spawn()
+                finally:
+                    self._free_slots.put(slot)
+        finally:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            process.join(timeout=5)
+            if process.is_alive():  # pragma: no cover
+                process.kill()
+            conn.close()
+
+    def _timed_out(self, process):
+        """Kill a worker that is stuck past its deadline, so the dispatcher respawns it."""
+        with self._timeouts_lock:
+            self.timeouts += 1
+        process.kill()
+        process.join()
+
+    def _run(self, process, conn, slot: int, features: Any) -> Any:
+        """Send one batch to a worker and collect its result."""
+        if isinstance(features, np.ndarray) and self._inputs.fits(features):
+            payload = self._inputs.write(slot, features)
+        else:
+            payload = features
+
+        try:
+            # Pickled before anything is sent, so that a payload that cannot be pickled
+            # fails its task and leaves the worker usable
+            message = ForkingPickler.dumps((slot, payload))
+        except Exception as e:
+            raise exceptions.InferenceBackendRuntimeError(
+                f"Cannot send the batch to the shared memory worker: "
+                f"{e.__class__.__name__}: {e}"
+            ) from e
+
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        try:
+            conn.send_bytes(message)
+            while not conn.poll(_poll_interval(deadline)):
+                if not process.is_alive():
+                    raise EOFError
+                if deadline is not None and time.monotonic() >= deadline:
+                    self._timed_out(process)
+                    raise exceptions.InferenceBackendTimeoutError(
+                        f"execute() timed out in shared memory worker: it did not complete "
+                        f"within {self.timeout * 1000:,.1f} ms"
+                    )
+            ok, result = conn.recv()
+        except (EOFError, BrokenPipeError, ConnectionResetError) as e:
+            # Make sure the worker is gone so the dispatcher respawns it
+            process.kill()
+            process.join()
+            raise exceptions.InferenceBackendRuntimeError(
+                "Shared memory worker died while running execute()."
+            ) from e
+
+        if isinstance(result, exceptions.InferenceBackendTimeoutError):
+            self._timed_out(process)
+            raise result
+
+        if not ok:
+            raise exceptions.InferenceBackendRuntimeError(
+                f"execute() failed in shared memory worker: {result}"
+            )
+
+        if isinstance(result, ArrayHandle):
+            # The slot is recycled for the next batch, so the result is copied out
+            return self._outputs.view(result).copy()
+
+        return result
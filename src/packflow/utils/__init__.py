@@ -1,10 +1,30 @@
 from .data import (
+    FlattenProjection,
+    RecordView,
     check_delimiter_collisions,
     flatten_dict,
     flatten_records,
     get_nested_field,
     get_nested_field_direct,
+    group_by_layout,
+    has_delimiter_collisions,
+    layout_key,
+    layout_label,
+    records_to_columns,
     records_to_ndarray,
     set_nested_field_direct,
 )
-from .normalize import ensure_native_types, ensure_valid_output
+from .features import (
+    TIMESTAMP_PARTS,
+    NetworkIndex,
+    encode_categorical,
+    hash_features,
+    pad_sequences,
+    parse_ip_addresses,
+    parse_timestamps,
+    sparse_available,
+    timestamp_parts,
+    to_numeric,
+)
+from .normalize import columns_to_records, ensure_native_types, ensure_valid_output
+from .sinks import NDJSONSink, encode_json, orjson_available
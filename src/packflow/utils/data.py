@@ -1,10 +1,14 @@
 import functools
-from typing import Any, List, Optional
+from collections.abc import Mapping, MutableMapping
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 from flatten_dict import flatten, unflatten
 from flatten_dict.reducers import make_reducer
 
+_MISSING = object()
+
 
 def check_delimiter_collisions(obj: dict, delimiter: str, path: str = "") -> List[str]:
     """
@@ -38,6 +42,43 @@ def check_delimiter_collisions(obj: dict, delimiter: str, path: str = "") -> Lis
     return collisions
 
 
+def has_delimiter_collisions(obj: dict, delimiter: str) -> bool:
+    """
+    Check whether any key contains the delimiter character, at any level of nesting.
+
+    Equivalent to ``bool(check_delimiter_collisions(obj, delimiter))``, but the keys of
+    each dictionary are scanned in a single pass over their concatenation and no paths
+    are built, which makes it suitable for checking every record of a stream.
+
+    Parameters
+    ----------
+    obj : dict
+        Dictionary to check for delimiter collisions
+    delimiter : str
+        The delimiter character to check for
+
+    Returns
+    -------
+    bool
+    """
+    try:
+        keys = "".join(obj)
+    except TypeError:
+        # Non-string keys: defer to the exact check
+        return bool(check_delimiter_collisions(obj, delimiter))
+
+    # A match can only span two keys if the delimiter is longer than one character
+    if delimiter in keys and (
+        len(delimiter) == 1 or any(delimiter in key for key in obj)
+    ):
+        return True
+
+    for value in obj.values():
+        if isinstance(value, dict) and has_delimiter_collisions(value, delimiter):
+            return True
+    return False
+
+
 def get_nested_field_direct(obj: dict, field: str, delimiter: str = ".") -> Any:
     """
     Retrieves a nested field by traversing the dictionary structure directly.
@@ -133,11 +174,66 @@ def get_nested_field(obj: dict, field: str, delimiter: Optional[str] = None) ->
     return flattened.get(field, None)
 
 
+def layout_key(obj: dict) -> tuple:
+    """
+    Cheap key identifying the layout of a record: its size, first and last keys.
+
+    Records of the same type (e.g. the same kind of event) almost always share a key
+    order, so this separates layouts without walking the record. It is only a grouping
+    hint: records with the same key may still differ.
+    """
+    if not obj:
+        return (0,)
+    return (len(obj), next(iter(obj)), next(reversed(obj)))
+
+
+def layout_label(key: tuple) -> str:
+    """Human readable label for a :func:`layout_key`."""
+    if len(key) == 1:
+        return "(empty)"
+    n_fields, first, last = key
+    return f"{first}..{last} ({n_fields} fields)"
+
+
+def group_by_layout(records: List[dict]) -> Dict[tuple, List[int]]:
+    """
+    Group the indices of records by :func:`layout_key`, in order of first appearance.
+
+    Parameters
+    ----------
+    records : List[Dict]
+
+    Returns
+    -------
+    Dict[tuple, List[int]]
+        Indices of the records of each layout, in their original order
+
+    Raises
+    ------
+    ValueError
+        If a record is not a dictionary
+    """
+    groups = {}
+    for index, row in enumerate(records):
+        if not isinstance(row, dict):
+            raise ValueError(
+                f"Value at index {index} is not a dictionary. Received type: {type(row)}"
+            )
+        key = layout_key(row)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [index]
+        else:
+            group.append(index)
+    return groups
+
+
 def records_to_ndarray(
     records: List[dict],
     feature_names: List[str],
     dtype: Optional[str] = None,
     delimiter: Optional[str] = None,
+    layouts: Optional[Dict[tuple, List[int]]] = None,
 ) -> np.ndarray:
     """
     Converts records to a numpy nd array
@@ -159,31 +255,131 @@ def records_to_ndarray(
     dtype : str
         The numpy data type to coerce the array to. Defaults to 'float32'
 
+    layouts : Dict[tuple, List[int]], optional
+        Records grouped by layout, as returned by :func:`group_by_layout`. Computed if not
+        provided.
+
     Returns
     -------
     numpy.ndarray
+
+    Notes
+    -----
+    Fields are resolved once per layout rather than once per row: the fields found at
+    the top level of the first record of a layout are read from every record of that
+    layout with a single ``operator.itemgetter``, and nested fields are read with one
+    :class:`FlattenProjection` walk per record. Records that do not match the plan of
+    their layout are resolved field by field with :func:`get_nested_field`, so the
+    result is the same as resolving every field of every row independently.
+    """
+    return np.array(
+        _records_to_rows(records, feature_names, delimiter, layouts), dtype=dtype
+    )
+
+
+def records_to_columns(
+    records: List[dict],
+    feature_names: List[str],
+    delimiter: Optional[str] = None,
+    layouts: Optional[Dict[tuple, List[int]]] = None,
+) -> Dict[str, list]:
+    """
+    Converts records to a list of values per feature
+
+    Fields are resolved as in :func:`records_to_ndarray`, and the rows are transposed
+    into columns in a single pass.
+
+    Parameters
+    ----------
+    records : List[Dict]
+        A list of dictionaries
+
+    feature_names : List[str]
+        The names of the features to extract
+
+    delimiter : str, optional
+        The delimiter to use for nested fields
+
+    layouts : Dict[tuple, List[int]], optional
+        Records grouped by layout, as returned by :func:`group_by_layout`
+
+    Returns
+    -------
+    Dict[str, list]
+        The values of each feature, in the order of the records. Duplicated feature
+        names appear once.
     """
+    rows = _records_to_rows(records, feature_names, delimiter, layouts)
+    if not rows:
+        return {feature: [] for feature in feature_names}
+    return dict(zip(feature_names, map(list, zip(*rows))))
+
+
+def _records_to_rows(
+    records: List[dict],
+    feature_names: List[str],
+    delimiter: Optional[str],
+    layouts: Optional[Dict[tuple, List[int]]],
+) -> list:
+    """Resolve the features of each record, one layout at a time."""
     if not isinstance(records, list):
         raise ValueError(
             f"Value for `records` must be a list of dictionaries. Received type: {type(records)}"
         )
 
-    # Pre-allocate list with None values for better performance
-    arr_data = [[None] * len(feature_names) for _ in range(len(records))]
+    if layouts is None:
+        layouts = group_by_layout(records)
 
-    for index, row in enumerate(records):
-        if not isinstance(row, dict):
-            raise ValueError(
-                f"Value at index {index} is not a dictionary. Received type: {type(row)}"
-            )
+    nested_delimiter = delimiter or "."
+    arr_data = [None] * len(records)
 
-        # Use list comprehension with direct assignment
-        arr_data[index] = [
-            get_nested_field(row, feature, delimiter=delimiter)
-            for feature in feature_names
+    for indices in layouts.values():
+        first = records[indices[0]]
+        top_level = [
+            (position, feature)
+            for position, feature in enumerate(feature_names)
+            if feature in first
         ]
-
-    return np.array(arr_data, dtype=dtype)
+        others = [
+            (position, feature)
+            for position, feature in enumerate(feature_names)
+            if feature not in first
+        ]
+        getter = (
+            itemgetter(*[feature for _, feature in top_level]) if top_level else None
+        )
+        nested = [feature for _, feature in others if nested_delimiter in feature]
+        projection = FlattenProjection(nested, nested_delimiter) if nested else None
+
+        for index in indices:
+            row = records[index]
+            try:
+                values = getter(row) if getter is not None else ()
+            except KeyError:
+                arr_data[index] = [
+                    get_nested_field(row, feature, delimiter=delimiter)
+                    for feature in feature_names
+                ]
+                continue
+
+            if len(top_level) == 1:
+                values = (values,)
+
+            if not others:
+                arr_data[index] = values
+                continue
+
+            flattened = projection(row) if projection is not None else {}
+            row_data = [None] * len(feature_names)
+            for (position, _), value in zip(top_level, values):
+                row_data[position] = value
+            for position, feature in others:
+                row_data[position] = (
+                    row[feature] if feature in row else flattened.get(feature)
+                )
+            arr_data[index] = row_data
+
+    return arr_data
 
 
 def flatten_dict(obj: dict, delimiter: str = ".", flatten_lists: bool = False) -> dict:
@@ -218,6 +414,189 @@ def flatten_dict(obj: dict, delimiter: str = ".", flatten_lists: bool = False) -
     )
 
 
+class FlattenProjection:
+    """
+    Flatten only the parts of an object that can produce a given set of flattened keys.
+
+    ``FlattenProjection(keys, ...)(obj)`` returns the same items as
+    ``{k: v for k, v in flatten_dict(obj, ...).items() if k in keys}``, but only walks the
+    subtrees whose flattened path is a prefix of one of the keys. The cost therefore scales
+    with the number of keys rather than with the size of the object.
+
+    Since keys may themselves contain the delimiter, every delimiter-separated prefix of
+    every key is considered, and child keys are looked up directly rather than iterated.
+
+    Parameters
+    ----------
+    keys: Iterable[str]
+        Flattened keys to extract
+
+    delimiter: str
+        Default '.'
+
+    flatten_lists: bool
+        Default False
+    """
+
+    def __init__(
+        self, keys: Iterable[str], delimiter: str = ".", flatten_lists: bool = False
+    ):
+        self.keys = set(keys)
+        self.delimiter = delimiter
+        self.flatten_lists = flatten_lists
+
+        prefixes = set()
+        for key in self.keys:
+            start = key.find(delimiter)
+            while start != -1:
+                prefixes.add(key[:start])
+                start = key.find(delimiter, start + 1)
+            prefixes.add(key)
+
+        # For each flattened path (None for the root), the child keys that can lead to
+        # one of the keys, along with the flattened path of the child
+        self._children: Dict[Optional[str], List[Tuple[str, str]]] = {
+            None: [(prefix, prefix) for prefix in prefixes]
+        }
+        for parent in prefixes:
+            head = parent + delimiter
+            children = [
+                (prefix[len(head) :], prefix)
+                for prefix in prefixes
+                if prefix.startswith(head)
+            ]
+            if children:
+                self._children[parent] = children
+
+    def __repr__(self):  # pragma: no cover
+        return f"{self.__class__.__name__}(keys={sorted(self.keys)})"
+
+    @staticmethod
+    def _lookup(obj: Any, key: str, is_root: bool) -> Any:
+        if isinstance(obj, Mapping):
+            value = obj.get(key, _MISSING)
+            # Nested non-string keys are formatted into the flattened key
+            if value is _MISSING and not is_root and key.isdecimal():
+                index = int(key)
+                if str(index) == key:
+                    value = obj.get(index, _MISSING)
+            return value
+
+        if key.isdecimal():
+            index = int(key)
+            if str(index) == key and index < len(obj):
+                return obj[index]
+        return _MISSING
+
+    def __call__(self, obj: dict) -> dict:
+        flattenable_types = (Mapping, list) if self.flatten_lists else (Mapping,)
+        result = {}
+        stack = [(obj, None)]
+        while stack:
+            node, path = stack.pop()
+            for key, flat_key in self._children.get(path, ()):
+                value = self._lookup(node, key, path is None)
+                if value is _MISSING:
+                    continue
+                if isinstance(value, flattenable_types) and len(value):
+                    if flat_key in self._children:
+                        stack.append((value, flat_key))
+                    continue
+                if flat_key in self.keys:
+                    if flat_key in result:
+                        raise ValueError(f"duplicated key '{flat_key}'")
+                    result[flat_key] = value
+        return result
+
+
+class RecordView(MutableMapping):
+    """
+    Copy-on-write view of a record, with an overlay of fields added by renaming.
+
+    Reads are served from the original record, then from the overlay, so the view
+    behaves like ``{**overlay, **record}`` without copying the record. The first
+    mutation materializes the view into a private dict; the original record is never
+    modified.
+
+    Parameters
+    ----------
+    record: Mapping
+        The original record
+
+    overlay: dict, optional
+        Fields to add in front of the fields of the record. Fields of the record take
+        precedence over overlay fields with the same name.
+    """
+
+    __slots__ = ("_record", "_overlay", "_data")
+
+    def __init__(self, record: Mapping, overlay: Optional[dict] = None):
+        self._record = record
+        self._overlay = overlay or {}
+        self._data = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({dict(self)!r})"
+
+    def __getitem__(self, key):
+        if self._data is not None:
+            return self._data[key]
+        if key in self._record:
+            return self._record[key]
+        return self._overlay[key]
+
+    def __contains__(self, key):
+        if self._data is not None:
+            return key in self._data
+        return key in self._record or key in self._overlay
+
+    def __iter__(self):
+        if self._data is not None:
+            yield from self._data
+            return
+        yield from self._overlay
+        for key in self._record:
+            if key not in self._overlay:
+                yield key
+
+    def __len__(self):
+        if self._data is not None:
+            return len(self._data)
+        return len(self._record) + sum(
+            1 for key in self._overlay if key not in self._record
+        )
+
+    def __setitem__(self, key, value):
+        self.materialize()[key] = value
+
+    def __delitem__(self, key):
+        del self.materialize()[key]
+
+    def __reduce__(self):
+        # Views are sent to other processes as plain dicts
+        return dict, (self.materialize(),)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def copy(self) -> dict:
+        """Return a shallow copy of the view as a new dict."""
+        return dict(self.materialize())
+
+    def materialize(self) -> dict:
+        """
+        Return the dict backing the view, building it on the first call.
+
+        Subsequent reads and writes of the view go to this dict.
+        """
+        if self._data is None:
+            self._data = {**self._overlay, **self._record}
+            self._record = self._overlay = None
+        return self._data
+
+
 def flatten_records(
     records: List[dict], delimiter: str = ".", flatten_lists: bool = False
 ) -> List[dict]:
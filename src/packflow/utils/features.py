@@ -0,0 +1,636 @@
+import importlib
+import ipaddress
+import socket
+import warnings
+import zlib
+from functools import partial
+from itertools import chain, repeat
+from numbers import Number
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+def pad_sequences(
+    sequences: List[Optional[list]],
+    max_length: int,
+    pad_value: Any = 0,
+    dtype: Optional[str] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converts variable-length sequences to a padded 2D array and a vector of lengths
+
+    Example
+    -------
+    in: [[1, 2, 3], None, [4]]
+    args: max_length=2
+    out: (np.array([[1, 2], [0, 0], [4, 0]]), np.array([2, 0, 1]))
+
+    Parameters
+    ----------
+    sequences : List[list]
+        One list (or tuple) per row. Missing values (None) are treated as empty sequences.
+
+    max_length : int
+        The width of the padded array. Longer sequences are truncated.
+
+    pad_value : Any
+        The value of the padding positions. Defaults to 0.
+
+    dtype : str, optional
+        The numpy data type of the padded array. Inferred from the values and the pad
+        value if not provided.
+
+    Returns
+    -------
+    Tuple[numpy.ndarray, numpy.ndarray]
+        The padded array, of shape ``(len(sequences), max_length)``, and the length of
+        each sequence after truncation
+
+    Raises
+    ------
+    ValueError
+        If a value is not a list, tuple or None
+
+    Notes
+    -----
+    The values of all sequences are converted to a single flat array, then scattered
+    into the padded array in one vectorized assignment; there is no per-row padding.
+    """
+    sequences = [() if sequence is None else sequence for sequence in sequences]
+    for index, sequence in enumerate(sequences):
+        if not isinstance(sequence, (list, tuple)):
+            raise ValueError(
+                f"Value at index {index} is not a sequence. Received type: {type(sequence)}"
+            )
+
+    n_rows = len(sequences)
+    lengths = np.fromiter(map(len, sequences), dtype=np.int64, count=n_rows)
+    values = np.array(list(chain.from_iterable(sequences)), dtype=dtype)
+
+    if dtype is None:
+        try:
+            dtype = np.promote_types(values.dtype, np.asarray(pad_value).dtype)
+        except TypeError:
+            dtype = object
+        if not values.size:
+            dtype = np.asarray(pad_value).dtype
+
+    padded = np.full((n_rows, max_length), pad_value, dtype=dtype)
+
+    # Position of each value within its sequence; values past max_length are dropped
+    offsets = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    positions = np.arange(values.size) - offsets
+    keep = positions < max_length
+    rows = np.repeat(np.arange(n_rows), lengths)
+    padded[rows[keep], positions[keep]] = values[keep]
+
+    return padded, np.minimum(lengths, max_length)
+
+
+def to_numeric(
+    values: List[Any], dtype: str = "float32", fill_value: Any = 0
+) -> np.ndarray:
+    """
+    Converts values to a numeric array, replacing missing values
+
+    Example
+    -------
+    in: [1, None, 3]
+    args: dtype="int32", fill_value=-1
+    out: np.array([1, -1, 3], dtype="int32")
+
+    Parameters
+    ----------
+    values : List[Any]
+        One value per row
+
+    dtype : str
+        The numpy data type of the array. Defaults to 'float32'
+
+    fill_value : Any
+        The value of missing entries (None or NaN). Defaults to 0.
+
+    Returns
+    -------
+    numpy.ndarray
+
+    Raises
+    ------
+    ValueError
+        If a value cannot be converted to the data type
+    """
+    dtype = np.dtype(dtype)
+    try:
+        array = np.array(values, dtype=dtype)
+    except TypeError:
+        # Missing values in an integer column; numpy converts None to NaN for floats
+        array = np.array(values, dtype=np.float64)
+
+    if array.dtype.kind == "f":
+        missing = np.isnan(array)
+        if missing.any():
+            array[missing] = fill_value
+
+    return array.astype(dtype, copy=False)
+
+
+def encode_categorical(
+    values: List[Any],
+    vocabulary: Dict[Any, int],
+    unknown_value: int = 0,
+    dtype: str = "int32",
+) -> np.ndarray:
+    """
+    Encodes values with a precomputed vocabulary
+
+    Example
+    -------
+    in: ["tcp", "udp", None, "icmp"]
+    args: vocabulary={"tcp": 1, "udp": 2}
+    out: np.array([1, 2, 0, 0], dtype="int32")
+
+    Parameters
+    ----------
+    values : List[Any]
+        One value per row
+
+    vocabulary : Dict[Any, int]
+        The code of each known value
+
+    unknown_value : int
+        The code of values that are not in the vocabulary, including missing values.
+        Defaults to 0.
+
+    dtype : str
+        The numpy data type of the codes. Defaults to 'int32'
+
+    Returns
+    -------
+    numpy.ndarray
+    """
+    codes = map(vocabulary.get, values, repeat(unknown_value))
+    return np.fromiter(codes, dtype=dtype, count=len(values))
+
+
+def parse_timestamps(
+    values: List[Any], unit: str = "s", epoch_unit: str = "s"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converts ISO-8601 strings and epoch numbers to a datetime64 array
+
+    Example
+    -------
+    in: ["2024-01-02T03:04:05Z", 1704164645, "garbage", None]
+    out: (
+        np.array(["2024-01-02T03:04:05", "2024-01-02T03:04:05", "NaT", "NaT"], dtype="datetime64[s]"),
+        np.array([True, True, False, False]),
+    )
+
+    Parameters
+    ----------
+    values : List[Any]
+        One value per row: ISO-8601 strings (UTC offsets are applied), ``datetime``
+        objects, or numbers (including numpy scalars) of ``epoch_unit`` since 1970-01-01
+        UTC. Booleans are not numbers here and are treated as missing.
+
+    unit : str
+        The resolution of the datetime64 array; one of 's', 'ms', 'us' or 'ns'.
+        Defaults to 's'
+
+    epoch_unit : str
+        The unit of numeric values. Defaults to 's'
+
+    Returns
+    -------
+    Tuple[numpy.ndarray, numpy.ndarray]
+        The timestamps, and a mask of the values that were parsed. Missing and
+        unparseable values are NaT in the timestamps and False in the mask.
+
+    Notes
+    -----
+    Strings are parsed in bulk by numpy; "Z" and "+hh:mm" suffixes are split off first,
+    since numpy only parses them with a (slow) warning per value. Strings are only
+    parsed one by one when the batch contains an unparseable value.
+    """
+    dtype = np.dtype(f"datetime64[{unit}]")
+    timestamps = np.full(len(values), np.datetime64("NaT"), dtype=dtype)
+
+    numbers = []
+    strings = []
+    others = []
+    for index, value in enumerate(values):
+        value_type = type(value)
+        if value_type is str:
+            strings.append(index)
+        elif value_type is int or value_type is float:
+            numbers.append(index)
+        elif value is None or value_type is bool or value_type is np.bool_:
+            continue
+        elif isinstance(value, Number):
+            # e.g. numpy scalars or Decimal
+            numbers.append(index)
+        else:
+            others.append(index)
+
+    if numbers:
+        epochs = np.array([values[index] for index in numbers])
+        scale = np.timedelta64(1, epoch_unit) / np.timedelta64(1, unit)
+        if epochs.dtype.kind == "i" and scale >= 1:
+            # Exact integer arithmetic; float64 cannot represent e.g. epoch nanoseconds
+            timestamps[numbers] = (epochs * int(scale)).view(dtype)
+        else:
+            epochs = epochs.astype(np.float64) * scale
+            finite = np.isfinite(epochs)
+            timestamps[np.asarray(numbers)[finite]] = (
+                np.floor(epochs[finite]).astype(np.int64).view(dtype)
+            )
+
+    if strings:
+        timestamps[strings] = _parse_timestamp_strings(
+            [values[index] for index in strings], dtype
+        )
+
+    if others:
+        timestamps[others] = [
+            _parse_timestamp(values[index], dtype) for index in others
+        ]
+
+    return timestamps, ~np.isnat(timestamps)
+
+
+def _parse_timestamp_strings(strings: List[str], dtype: np.dtype) -> np.ndarray:
+    parsed = _parse_naive_timestamps(strings, dtype)
+    if parsed is not None:
+        return parsed
+
+    strings = [value[:-1] if value[-1:] == "Z" else value for value in strings]
+    parsed = _parse_naive_timestamps(strings, dtype)
+    if parsed is not None:
+        return parsed
+
+    offsets = [0] * len(strings)
+    for index, value in enumerate(strings):
+        sign = value[-6:-5]
+        if (sign == "+" or sign == "-") and value[-3:-2] == ":" and len(value) >= 16:
+            try:
+                minutes = int(value[-5:-3]) * 60 + int(value[-2:])
+            except ValueError:
+                continue
+            offsets[index] = -minutes if sign == "-" else minutes
+            strings[index] = value[:-6]
+
+    parsed = _parse_naive_timestamps(strings, dtype)
+    if parsed is None:
+        parsed = np.array([_parse_timestamp(value, dtype) for value in strings])
+    return parsed - np.array(offsets, dtype="timedelta64[m]")
+
+
+def _parse_naive_timestamps(
+    strings: List[str], dtype: np.dtype
+) -> Optional[np.ndarray]:
+    with warnings.catch_warnings():
+        # numpy parses "Z" and "+hh:mm" suffixes with a warning per value, which is
+        # several times slower than parsing naive values: stop at the first one so the
+        # suffixes can be split off instead
+        warnings.simplefilter("error")
+        try:
+            return np.array(strings, dtype=dtype)
+        except (TypeError, ValueError, Warning):
+            return None
+
+
+def _parse_timestamp(value: Any, dtype: np.dtype) -> np.datetime64:
+    with warnings.catch_warnings():
+        # Time zone aware values are converted to UTC, with a warning
+        warnings.simplefilter("ignore")
+        try:
+            return np.array(value, dtype=dtype)
+        except (TypeError, ValueError):
+            return np.datetime64("NaT")
+
+
+TIMESTAMP_PARTS = ("hour", "minute", "day_of_week", "day_of_month", "month")
+
+
+def timestamp_parts(
+    timestamps: np.ndarray, parts: Iterable[str], valid: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Derives calendar features from a datetime64 array
+
+    Parameters
+    ----------
+    timestamps : numpy.ndarray
+        A datetime64 array, as returned by :func:`parse_timestamps`
+
+    parts : Iterable[str]
+        The features to derive; any of 'hour', 'minute', 'day_of_week' (Monday is 0),
+        'day_of_month' and 'month'
+
+    valid : numpy.ndarray, optional
+        A mask of the valid timestamps. Computed from NaT values if not provided.
+
+    Returns
+    -------
+    Dict[str, numpy.ndarray]
+        One int8 array per part, with -1 for invalid timestamps
+    """
+    if valid is None:
+        valid = ~np.isnat(timestamps)
+    timestamps = np.where(valid, timestamps, np.zeros(1, dtype=timestamps.dtype))
+    days = timestamps.astype("datetime64[D]")
+
+    derived = {}
+    for part in parts:
+        if part == "hour":
+            values = (timestamps - days) // np.timedelta64(1, "h")
+        elif part == "minute":
+            values = (
+                timestamps - timestamps.astype("datetime64[h]")
+            ) // np.timedelta64(1, "m")
+        elif part == "day_of_week":
+            # 1970-01-01 was a Thursday
+            values = (days.view(np.int64) + 3) % 7
+        elif part == "day_of_month":
+            values = (days - days.astype("datetime64[M]")) // np.timedelta64(1, "D") + 1
+        elif part == "month":
+            values = days.astype("datetime64[M]").view(np.int64) % 12 + 1
+        else:
+            raise ValueError(
+                f"Unknown timestamp part: {part}. Expected one of {TIMESTAMP_PARTS}"
+            )
+        derived[part] = np.where(valid, values, -1).astype(np.int8)
+    return derived
+
+
+def parse_ip_addresses(
+    values: List[Any], version: int = 4
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converts IP address strings to integers
+
+    Example
+    -------
+    in: ["10.0.0.1", "not an ip", None]
+    out: (np.array([167772161, 0, 0], dtype="uint32"), np.array([True, False, False]))
+
+    Parameters
+    ----------
+    values : List[Any]
+        One IP address per row, as a string or an integer
+
+    version : int
+        4 for IPv4 addresses, or 6 for IPv6 addresses. With 6, IPv4 addresses are
+        converted to IPv4-mapped IPv6 addresses (``::ffff:a.b.c.d``). Defaults to 4.
+
+    Returns
+    -------
+    Tuple[numpy.ndarray, numpy.ndarray]
+        The addresses, as a uint32 array (IPv4) or a ``(n, 2)`` uint64 array of the high
+        and low 64 bits (IPv6), and a mask of the values that were parsed. Missing and
+        invalid values are 0.
+
+    Notes
+    -----
+    All values are packed by ``socket.inet_pton`` in one pass, without a Python loop,
+    and decoded with a single ``numpy.frombuffer``. Values are only parsed one by one
+    when the batch contains a missing or invalid value.
+    """
+    family, width = (socket.AF_INET, 4) if version == 4 else (socket.AF_INET6, 16)
+    valid = np.ones(len(values), dtype=bool)
+    try:
+        packed = b"".join(map(partial(socket.inet_pton, family), values))
+    except (OSError, TypeError, ValueError):
+        addresses = [_pack_ip_address(value, version) for value in values]
+        valid = np.fromiter(
+            (address is not None for address in addresses),
+            dtype=bool,
+            count=len(values),
+        )
+        packed = b"".join(address or bytes(width) for address in addresses)
+
+    if version == 4:
+        return np.frombuffer(packed, dtype=">u4").astype(np.uint32), valid
+    return np.frombuffer(packed, dtype=">u8").reshape(-1, 2).astype(np.uint64), valid
+
+
+def _pack_ip_address(value: Any, version: int) -> Optional[bytes]:
+    if type(value) is bool:
+        return None
+    try:
+        address = ipaddress.ip_address(value)
+    except ValueError:
+        return None
+
+    if address.version != version:
+        if version == 4:
+            return None
+        address = ipaddress.IPv6Address(f"::ffff:{address}")
+    return address.packed
+
+
+class NetworkIndex:
+    """
+    Sorted range index over a list of IP networks (CIDR blocks)
+
+    Networks may overlap; an address is matched to the most specific (longest
+    prefix) network containing it. Lookups use ``numpy.searchsorted`` over the
+    boundaries of the ranges, so their cost grows with the logarithm of the number of
+    networks.
+
+    Parameters
+    ----------
+    networks : Iterable[str]
+        Networks in CIDR notation, e.g. "10.0.0.0/8". Host bits are ignored.
+
+    version : int
+        4 or 6, as in :func:`parse_ip_addresses`. With 6, IPv4 networks are converted to
+        IPv4-mapped IPv6 networks. Defaults to 4.
+
+    Raises
+    ------
+    ValueError
+        If a network is invalid, or is an IPv6 network and ``version`` is 4
+    """
+
+    def __init__(self, networks: Iterable[str], version: int = 4):
+        self.version = version
+        width = 32 if version == 4 else 128
+
+        ranges = []
+        for network_id, network in enumerate(networks):
+            network = ipaddress.ip_network(network, strict=False)
+            if network.version != version:
+                if version == 4:
+                    raise ValueError(f"{network} is not an IPv4 network")
+                network = ipaddress.IPv6Network(
+                    f"::ffff:{network.network_address}/{96 + network.prefixlen}"
+                )
+            start = int(network.network_address)
+            end = int(network.broadcast_address)
+            # Earlier networks win over identical later ones
+            ranges.append((start, -end, -network_id))
+
+        # Networks are either disjoint or nested, so a sweep with a stack of the
+        # enclosing networks splits them into non-overlapping segments
+        starts = []
+        ids = []
+
+        def mark(position, network_id):
+            if position >= 2**width:
+                return
+            if starts and starts[-1] == position:
+                ids[-1] = network_id
+            else:
+                starts.append(position)
+                ids.append(network_id)
+
+        stack = []
+        for start, negative_end, negative_id in sorted(ranges):
+            while stack and stack[-1][0] < start:
+                end, _ = stack.pop()
+                mark(end + 1, stack[-1][1] if stack else -1)
+            mark(start, -negative_id)
+            stack.append((-negative_end, -negative_id))
+        while stack:
+            end, _ = stack.pop()
+            mark(end + 1, stack[-1][1] if stack else -1)
+
+        self._ids = np.array(ids, dtype=np.int32)
+        if version == 4:
+            self._starts = np.array(starts, dtype=np.uint32)
+        else:
+            self._starts = np.array(
+                [start.to_bytes(16, "big") for start in starts], dtype="S16"
+            )
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def lookup(self, addresses: np.ndarray) -> np.ndarray:
+        """
+        Find the network containing each address
+
+        Parameters
+        ----------
+        addresses : numpy.ndarray
+            Addresses, as returned by :func:`parse_ip_addresses`
+
+        Returns
+        -------
+        numpy.ndarray
+            The position of the most specific matching network in the list of
+            networks, or -1 if no network contains the address
+        """
+        if self.version == 6:
+            # Big-endian bytes sort in numeric order
+            addresses = np.ascontiguousarray(addresses, dtype=">u8").view("S16").ravel()
+
+        positions = np.searchsorted(self._starts, addresses, side="right") - 1
+        if not len(self._ids):
+            return np.full(len(addresses), -1, dtype=np.int32)
+        return np.where(positions >= 0, self._ids[positions], -1).astype(np.int32)
+
+
+def hash_features(
+    values: List[Any],
+    n_features: int,
+    seed: int = 0,
+    alternate_sign: bool = False,
+    sparse: bool = False,
+    dtype: str = "float32",
+):
+    """
+    Maps strings or lists of tokens to fixed-width count vectors (the hashing trick)
+
+    Example
+    -------
+    in: ["example.com", ["GET", "/index.html"], None]
+    args: n_features=4
+    out: np.array([[0, 1, 0, 0], [0, 0, 2, 0], [0, 0, 0, 0]], dtype="float32")
+
+    Parameters
+    ----------
+    values : List[Any]
+        One value per row: a single token, a list (or tuple) of tokens, or None. Tokens
+        that are not strings are hashed as their ``str()``.
+
+    n_features : int
+        The width of the vectors
+
+    seed : int
+        The seed of the hash function, between 0 and 2**32 - 1. Defaults to 0.
+
+    alternate_sign : bool
+        Whether to add -1 instead of 1 for half of the hashes, so that collisions
+        tend to cancel out. Defaults to False.
+
+    sparse : bool
+        Whether to return a ``scipy.sparse.csr_matrix`` instead of a dense array.
+        Requires scipy. Defaults to False.
+
+    dtype : str
+        The numpy data type of the vectors. Defaults to 'float32'
+
+    Returns
+    -------
+    numpy.ndarray or scipy.sparse.csr_matrix
+        An array of shape ``(len(values), n_features)``
+
+    Notes
+    -----
+    Tokens are hashed with CRC-32 (seeded with ``seed``), which is stable across
+    processes and platforms, unlike ``hash()``. All tokens of the batch are hashed in
+    one pass without a Python loop, and the vectors are built with a single
+    ``numpy.bincount``. Memory does not depend on the number of distinct tokens.
+    """
+    if sparse:
+        scipy_sparse = _import_scipy_sparse()
+
+    sequences = [
+        () if value is None else value if type(value) in (list, tuple) else (value,)
+        for value in values
+    ]
+    n_rows = len(sequences)
+    lengths = np.fromiter(map(len, sequences), dtype=np.int64, count=n_rows)
+    tokens = map(str.encode, map(str, chain.from_iterable(sequences)))
+    hashes = np.fromiter(
+        map(zlib.crc32, tokens, repeat(seed)), dtype=np.uint32, count=lengths.sum()
+    )
+
+    rows = np.repeat(np.arange(n_rows), lengths)
+    columns = hashes % n_features
+    weights = None
+    if alternate_sign:
+        weights = np.where(hashes & 0x80000000, -1.0, 1.0)
+
+    if sparse:
+        if weights is None:
+            weights = np.ones(len(hashes))
+        return scipy_sparse.csr_matrix(
+            (weights, (rows, columns)), shape=(n_rows, n_features), dtype=dtype
+        )
+
+    counts = np.bincount(
+        rows * n_features + columns, weights=weights, minlength=n_rows * n_features
+    )
+    return counts.reshape(n_rows, n_features).astype(dtype)
+
+
+def _import_scipy_sparse():
+    try:
+        return importlib.import_module("scipy.sparse")
+    except ImportError as e:
+        raise ImportError(
+            "Sparse hashed features require the `scipy` package. Install it with `pip install scipy`."
+        ) from e
+
+
+def sparse_available() -> bool:
+    """Whether sparse outputs can be used in the current environment."""
+    try:
+        _import_scipy_sparse()
+    except ImportError:
+        return False
+    return True
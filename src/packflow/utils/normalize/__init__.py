@@ -1 +1 @@
-from .normalize import ensure_native_types, ensure_valid_output
+from .normalize import columns_to_records, ensure_native_types, ensure_valid_output
@@ -1,4 +1,8 @@
-from typing import Any, Dict, Iterable
+import functools
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
 
 from .handlers import (
     NumpyTypeHandler,
@@ -45,7 +49,7 @@ def ensure_native_types(obj: Any):
             return handler.convert(obj)
 
     # Handle containers
-    if isinstance(obj, dict):
+    if isinstance(obj, Mapping):
         return {k: ensure_native_types(v) for k, v in obj.items()}
 
     if isinstance(obj, (list, tuple, set)):
@@ -85,3 +89,91 @@ def ensure_valid_output(
             v = {parent_key: v}
         valid_output.append(v)
     return valid_output
+
+
+def columns_to_records(
+    columns: Any, names: Optional[Sequence[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Converts columns of values to records with native Python types.
+
+    Example
+    -------
+    in: {"label": np.array([0, 1]), "score": np.array([0.2, 0.9])}
+    out: [{"label": 0, "score": 0.2}, {"label": 1, "score": 0.9}]
+
+    Parameters
+    ----------
+    columns : Mapping[str, Any] or array-like
+        Either a mapping of field names to equal-length columns (numpy arrays, lists,
+        or any type supported by :func:`ensure_native_types`), or a 2D array with one
+        column per field
+
+    names : Sequence[str], optional
+        The field names. For a mapping, selects and orders the columns (defaults to all
+        keys). Required for arrays.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+
+    Raises
+    ------
+    ValueError
+        If a field is missing, the number of names does not match the number of columns,
+        or the columns have different lengths
+
+    Notes
+    -----
+    Each column is converted to native types at once (e.g. with a single
+    ``ndarray.tolist()``) rather than value by value, and the records are assembled in
+    one pass by a function generated for the field names.
+    """
+    if isinstance(columns, Mapping):
+        names = list(columns) if names is None else list(names)
+        missing = [name for name in names if name not in columns]
+        if missing:
+            raise ValueError(
+                f"Columns {missing} are missing. Received: {list(columns)}"
+            )
+        values = [ensure_native_types(columns[name]) for name in names]
+    else:
+        if names is None:
+            raise ValueError("Field names are required to convert arrays to records")
+        names = list(names)
+        array = np.asarray(columns)
+        if array.ndim == 1:
+            array = array.reshape(-1, 1)
+        if array.ndim != 2 or array.shape[1] != len(names):
+            raise ValueError(
+                f"Expected a 2D array with {len(names)} columns ({names}). Received shape: {array.shape}"
+            )
+        values = array.T.tolist()
+
+    lengths = {len(column) for column in values}
+    if len(lengths) > 1:
+        raise ValueError(
+            f"Columns must have the same length. Received lengths: {dict(zip(names, map(len, values)))}"
+        )
+
+    if not names:
+        return [{} for _ in range(lengths.pop() if lengths else 0)]
+    return _record_builder(tuple(names))(*values)
+
+
+@functools.lru_cache(maxsize=128)
+def _record_builder(names: tuple) -> Callable[..., List[Dict[str, Any]]]:
+    """Compile ``build(*columns)``, which zips columns into dict literals."""
+    if not all(isinstance(name, str) for name in names):
+        return lambda *columns: [dict(zip(names, row)) for row in zip(*columns)]
+
+    arguments = ", ".join(f"c{i}" for i in range(len(names)))
+    items = ", ".join(f"{name!r}: v{i}" for i, name in enumerate(names))
+    if len(names) == 1:
+        loop = "v0 in c0"
+    else:
+        loop = f"{', '.join(f'v{i}' for i in range(len(names)))} in zip({arguments})"
+    source = f"def build({arguments}):\n    return [{{{items}}} for {loop}]\n"
+    namespace = {}
+    exec(source, namespace)
+    return namespace["build"]
@@ -0,0 +1,235 @@
+import functools
+import importlib
+import io
+import json
+import math
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterable, Optional, TextIO, Union
+
+from .normalize import ensure_native_types
+
+#: Encoded records are written to the output once this many bytes are buffered
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+def _import_orjson():
+    try:
+        return importlib.import_module("orjson")
+    except ImportError as e:
+        raise ImportError(
+            "Fast JSON encoding requires the `orjson` package. Install it with `pip install orjson`."
+        ) from e
+
+
+def orjson_available() -> bool:
+    """Whether orjson can be used for encoding in the current environment."""
+    try:
+        _import_orjson()
+    except ImportError:
+        return False
+    return True
+
+
+def _default(obj: Any) -> Any:
+    """Convert a value the JSON encoder does not support natively."""
+    if isinstance(obj, Mapping):
+        # e.g. RecordView, whose values are encoded as the encoder walks them
+        return dict(obj)
+    return ensure_native_types(obj)
+
+
+def _replace_non_finite(obj: Any) -> Any:
+    """Replace NaN and infinite floats with None, converting non-native values on the way."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if obj is None or isinstance(obj, (str, int)):
+        return obj
+    if isinstance(obj, Mapping):
+        return {key: _replace_non_finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_replace_non_finite(value) for value in obj]
+    converted = _default(obj)
+    if converted is obj:
+        # Not convertible; the encoder raises for it
+        return obj
+    return _replace_non_finite(converted)
+
+
+@functools.lru_cache(maxsize=None)
+def _json_encoder(
+    use_orjson: Optional[bool] = None, newline: bool = False
+) -> Callable[[Any], bytes]:
+    """
+    Build a function that encodes an object to UTF-8 JSON, converting non-native values
+    (numpy arrays and scalars, tensors, etc.) as they are encountered. NaN and infinite
+    floats are encoded as ``null`` by both encoders.
+    """
+    dumps = json.JSONEncoder(
+        separators=(",", ":"), default=_default, allow_nan=False
+    ).encode
+    end = "\n" if newline else ""
+
+    def encode_json(obj: Any) -> bytes:
+        try:
+            text = dumps(obj)
+        except ValueError as e:
+            if "Out of range float" not in str(e):
+                raise
+            # The standard library would write NaN and Infinity, which are not valid JSON
+            text = dumps(_replace_non_finite(obj))
+        return (text + end).encode("utf-8")
+
+    if use_orjson is None:
+        use_orjson = orjson_available()
+    if not use_orjson:
+        return encode_json
+
+    orjson = _import_orjson()
+    orjson_dumps = orjson.dumps
+    encode_error = orjson.JSONEncodeError
+    option = orjson.OPT_SERIALIZE_NUMPY
+    if newline:
+        option |= orjson.OPT_APPEND_NEWLINE
+
+    def encode_orjson(obj: Any) -> bytes:
+        try:
+            return orjson_dumps(obj, default=_default, option=option)
+        except encode_error:
+            # Values orjson rejects (e.g. non-string keys or integers larger than 64 bits)
+            # are supported by the standard library, which raises for the rest
+            return encode_json(obj)
+
+    return encode_orjson
+
+
+def encode_json(obj: Any, use_orjson: Optional[bool] = None) -> bytes:
+    """
+    Encode an object as UTF-8 JSON, converting non-native types during encoding.
+
+    Unlike ``json.dumps(ensure_native_types(obj))``, the object is only walked once: values
+    that are not JSON types are converted with :func:`ensure_native_types` when the encoder
+    reaches them.
+
+    Parameters
+    ----------
+    obj : Any
+        The object to encode
+
+    use_orjson : bool, optional
+        Whether to encode with orjson. Defaults to using orjson when it is installed.
+        Note that orjson encodes NaN and infinity as ``null``.
+
+    Returns
+    -------
+    bytes
+    """
+    return _json_encoder(use_orjson)(obj)
+
+
+class NDJSONSink:
+    """
+    Encode records as newline-delimited JSON directly into a buffered output.
+
+    Records are encoded one at a time with :func:`encode_json` (so non-native types are
+    converted during encoding) and appended to a byte buffer that is written to the output
+    whenever it exceeds ``buffer_size``. No intermediate list of converted records or
+    encoded lines is built.
+
+    Parameters
+    ----------
+    output : str, Path, or file object
+        A path to (over)write, or a binary or text stream. Text streams are written to
+        through their underlying binary buffer when they have one. Streams are flushed, but
+        not closed, when the sink is closed.
+
+    buffer_size : int
+        Number of encoded bytes to buffer before writing to the output
+
+    use_orjson : bool, optional
+        Whether to encode with orjson. Defaults to using orjson when it is installed.
+
+    Examples
+    --------
+    >>> with NDJSONSink("outputs.ndjson") as sink:
+    ...     sink.write_many(backend(records))
+    """
+
+    def __init__(
+        self,
+        output: Union[str, Path, BinaryIO, TextIO],
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        use_orjson: Optional[bool] = None,
+    ):
+        self._owns_output = isinstance(output, (str, Path))
+        if self._owns_output:
+            output = open(output, "wb")
+        elif isinstance(output, io.TextIOBase):
+            output.flush()
+            output = getattr(output, "buffer", output)
+
+        self._output = output
+        self._is_text = isinstance(output, io.TextIOBase)
+        self._encode = _json_encoder(use_orjson, newline=True)
+        self._buffer = bytearray()
+        self.buffer_size = buffer_size
+        self.n_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, record: Any) -> None:
+        """Encode a single record."""
+        self._buffer += self._encode(record)
+        self.n_written += 1
+        if len(self._buffer) >= self.buffer_size:
+            self._write_buffer()
+
+    def write_many(self, records: Iterable[Any]) -> int:
+        """
+        Encode an iterable of records, which is consumed lazily.
+
+        Returns
+        -------
+        int
+            The number of records written
+        """
+        encode = self._encode
+        buffer = self._buffer
+        buffer_size = self.buffer_size
+        n_written = 0
+        for record in records:
+            buffer += encode(record)
+            n_written += 1
+            if len(buffer) >= buffer_size:
+                self._write_buffer()
+        self.n_written += n_written
+        return n_written
+
+    def flush(self) -> None:
+        """Write buffered records to the output and flush it."""
+        self._write_buffer()
+        flush = getattr(self._output, "flush", None)
+        if flush is not None:
+            flush()
+
+    def close(self) -> None:
+        """Flush buffered records, and close the output if it was opened by the sink."""
+        if self._output is None:
+            return
+        self.flush()
+        if self._owns_output:
+            self._output.close()
+        self._output = None
+
+    def _write_buffer(self):
+        if not self._buffer:
+            return
+        if self._is_text:
+            self._output.write(self._buffer.decode("utf-8"))
+        else:
+            self._output.write(self._buffer)
+        self._buffer.clear()
@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+
+from packflow.backend.admission import AdmissionQueue, admitted_batches
+from packflow.backend.batching import AdaptiveBatchSizer
+from packflow.backend.configuration import AdmissionConfig, BatchingConfig
+
+from .. import helpers
+
+
+def _fill(queue, n):
+    return [queue.put(i) for i in range(n)]
+
+
+def test_unbounded_queue_never_sheds():
+    queue = AdmissionQueue()
+    assert all(_fill(queue, 1000))
+    assert len(queue) == 1000
+    assert queue.metrics()["shed_records"] == {}
+
+
+@pytest.mark.parametrize(
+    "policy, expected_items, expected_shed",
+    [
+        ("drop_newest", [0, 1, 2], {"drop_newest": 2}),
+        ("drop_oldest", [2, 3, 4], {"drop_oldest": 2}),
+    ],
+)
+def test_drop_policies(policy, expected_items, expected_shed):
+    shed = []
+    queue = AdmissionQueue(
+        AdmissionConfig(max_queue_size=3, policy=policy),
+        on_shed=lambda item, reason: shed.append(item),
+    )
+    _fill(queue, 5)
+
+    assert queue.get_batch(10) == expected_items
+    assert queue.metrics()["shed_records"] == expected_shed
+    assert len(shed) == 2
+
+
+def test_sample_policy_keeps_queue_bounded():
+    queue = AdmissionQueue(
+        AdmissionConfig(max_queue_size=10, policy="sample", sample_rate=0.5)
+    )
+    _fill(queue, 1000)
+
+    assert len(queue) == 10
+    assert sum(queue.metrics()["shed_records"].values()) == 990
+
+
+def test_block_policy_applies_backpressure():
+    queue = AdmissionQueue(AdmissionConfig(max_queue_size=1))
+    queue.put(0)
+
+    producer = threading.Thread(target=queue.put, args=(1,))
+    producer.start()
+    time.sleep(0.05)
+    assert producer.is_alive()
+
+    assert queue.get_batch(1) == [0]
+    producer.join(timeout=1)
+    assert queue.get_batch(1) == [1]
+
+
+def test_block_policy_timeout():
+    queue = AdmissionQueue(
+        AdmissionConfig(max_queue_size=1, block_timeout_s=0.01), weight=len
+    )
+    queue.put([0])
+    assert not queue.put([1, 2])
+    assert queue.metrics()["shed_records"] == {"timeout": 2}
+
+
+def test_closed_queue():
+    queue = AdmissionQueue()
+    queue.put(0)
+    queue.close()
+    assert not queue.put(1)
+    assert queue.get_batch(10) == [0]
+    assert queue.get_batch(10) == []
+
+
+def test_admitted_batches():
+    records = [{"i": i} for i in range(100)]
+    queue = AdmissionQueue(AdmissionConfig(max_queue_size=8))
+    sizer = AdaptiveBatchSizer(BatchingConfig(batch_size=4))
+
+    batches = list(admitted_batches(iter(records), queue, sizer))
+
+    assert all(len(batch) <= 4 for batch in batches)
+    assert [r for batch in batches for r in batch] == records
+
+
+def test_admitted_batches_propagates_source_errors():
+    def source():
+        yield {"i": 0}
+        raise RuntimeError("source failed")
+
+    queue = AdmissionQueue(AdmissionConfig(max_queue_size=8))
+    sizer = AdaptiveBatchSizer(BatchingConfig(batch_size=4))
+
+    with pytest.raises(RuntimeError):
+        list(admitted_batches(source(), queue, sizer))
+
+
+def test_backend_stream_reports_admission_metrics():
+    backend = helpers.ValidBackend(
+        admission={"max_queue_size": 4, "policy": "drop_newest"}
+    )
+    outputs = list(backend.stream({"i": i} for i in range(10)))
+
+    metrics = backend.get_metrics()
+    assert len(outputs) + sum(metrics.shed_records.values()) == 10
+    assert metrics.queue_depth == 0
+    assert metrics.queue_wait_ms >= 0
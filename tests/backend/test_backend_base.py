@@ -1,12 +1,18 @@
+import threading
+import time
 from contextlib import nullcontext
 
 import pytest
 
 from packflow import exceptions
-from packflow.backend.metrics import ExecutionMetrics
+from packflow.backend.configuration import BackendConfig
+from packflow.backend.metrics import CallMetrics, ExecutionMetrics
+from packflow.logger import get_logger
 
 from .. import helpers
 
+logger = get_logger()
+
 
 @pytest.mark.parametrize(
     "backend, expectation",
@@ -91,10 +97,8 @@ def test__execute_and_profile_step(steps):
     for step in steps:
         method = getattr(backend, step)
         backend._execute_and_profile_step(method, [{}])
-        assert step in backend._execution_metrics["execution_times"]
-        assert isinstance(
-            backend._execution_metrics["execution_times"].get(step), float
-        )
+        assert step in backend._execution_metrics.execution_times
+        assert isinstance(backend._execution_metrics.execution_times.get(step), float)
 
 
 @pytest.mark.parametrize("n_rows", [1, 10, 25, 50, 100])
@@ -109,3 +113,273 @@ def test_get_metrics(n_rows):
 def test_ready():
     backend = helpers.ValidBackend()
     assert backend.ready()
+
+
+def test_record_views_are_materialized_in_outputs():
+    backend = helpers.ValidBackend(rename_fields={"a": "b"}, record_views=True)
+    outputs = backend([{"a": 1}])
+    assert outputs == [{"b": 1, "a": 1}]
+    assert type(outputs[0]) is dict
+
+
+class RowsBackend(helpers.ValidBackend):
+    def execute(self, inputs):
+        return inputs.tolist()
+
+
+def test_layout_counts_metrics():
+    backend = RowsBackend(input_format="numpy", feature_names=["a"])
+    backend([{"a": 1}, {"a": 2, "b": 3}, {"a": 4}])
+    assert backend.get_metrics().layout_counts == {
+        "a..a (1 fields)": 2,
+        "a..b (2 fields)": 1,
+    }
+
+    backend = helpers.ValidBackend()
+    backend([{"a": 1}])
+    assert backend.get_metrics().layout_counts is None
+
+
+class ColumnarOutputBackend(helpers.ValidBackend):
+    def execute(self, inputs):
+        return {"total": inputs.sum(axis=1), "first": inputs[:, 0]}
+
+
+def test_columnar_outputs_are_converted():
+    backend = ColumnarOutputBackend(
+        input_format="numpy",
+        feature_names=["a", "b"],
+        output_fields=["first", "total"],
+    )
+    outputs = backend([{"a": 1, "b": 2}, {"a": 3, "b": 4}])
+    assert outputs == [{"first": 1, "total": 3}, {"first": 3, "total": 7}]
+    assert type(outputs[0]["total"]) is int
+    assert backend.get_metrics().execution_times.convert_outputs is not None
+
+
+class ArrayOutputBackend(helpers.ValidBackend):
+    def execute(self, inputs):
+        return inputs * 2
+
+
+def test_array_outputs_are_converted():
+    backend = ArrayOutputBackend(
+        input_format="numpy", feature_names=["a", "b"], output_fields=["x", "y"]
+    )
+    assert backend([{"a": 1, "b": 2}]) == [{"x": 2, "y": 4}]
+
+    # Outputs that are already records are passed through
+    backend = helpers.ValidBackend(output_fields=["x"])
+    assert backend([{"a": 1}]) == [{"a": 1}]
+
+
+class ScoreBackend(helpers.ValidBackend):
+    def execute(self, inputs):
+        return [{"score": record["x"] * 2} for record in inputs]
+
+
+def test_enrich_outputs():
+    records = [{"id": "a", "x": 1, "raw": {"nested": [1, 2]}}, {"id": "b", "x": 2}]
+    backend = ScoreBackend(output_mode="enrich", feature_names=["x"])
+    outputs = backend(records)
+    assert outputs == [
+        {"id": "a", "x": 1, "raw": {"nested": [1, 2]}, "score": 2},
+        {"id": "b", "x": 2, "score": 4},
+    ]
+    # Input records are updated in place
+    assert all(output is record for output, record in zip(outputs, records))
+    assert backend.get_metrics().execution_times.merge_outputs is not None
+
+    record = {"id": "a", "x": 1}
+    backend = ScoreBackend(output_mode="enrich", output_key="model", record_views=True)
+    assert backend(record) == {"id": "a", "x": 1, "model": {"score": 2}}
+    assert record == {"id": "a", "x": 1}
+
+
+def test_passthrough_fields():
+    backend = ScoreBackend(feature_names=["x"], passthrough_fields=["id", "missing"])
+    ids = [object(), object()]
+    outputs = backend([{"id": ids[0], "x": 1}, {"id": ids[1], "x": 2}])
+    assert outputs == [{"score": 2, "id": ids[0]}, {"score": 4, "id": ids[1]}]
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        dict(output_key="model"),
+        dict(output_mode="enrich", passthrough_fields=["id"]),
+    ],
+)
+def test_invalid_output_mode_configs(config):
+    with pytest.raises(ValueError):
+        BackendConfig(**config)
+
+
+def test_enrich_requires_one_output_per_record():
+    backend = helpers.InvalidBackend(output_mode="enrich")
+    with pytest.raises(exceptions.InferenceBackendRuntimeError):
+        backend([{"a": 1}, {"a": 2}])
+
+
+class PoisonBackend(helpers.ValidBackend):
+    def execute(self, inputs):
+        if any(record.get("poison") for record in inputs):
+            raise ValueError("poisoned")
+        return [{"score": record["x"]} for record in inputs]
+
+
+def test_error_isolation():
+    records = [{"x": i, "id": i, "poison": i in (3, 4, 11)} for i in range(16)]
+    backend = PoisonBackend(error_mode="isolate", passthrough_fields=["id"])
+    outputs = backend(records)
+
+    assert len(outputs) == 16
+    for i, output in enumerate(outputs):
+        if i in (3, 4, 11):
+            assert output["error"]["type"] == "ValueError"
+            assert "poisoned" in output["error"]["message"]
+            assert output["id"] == i
+        else:
+            assert output == {"score": i, "id": i}
+
+    metrics = backend.get_metrics()
+    assert metrics.batch_size == 16
+    assert metrics.isolated_records == 3
+    assert metrics.isolation_calls == 18
+
+    backend([{"x": 1}])
+    assert backend.get_metrics().isolated_records == 0
+    assert backend.get_metrics().isolation_calls == 0
+
+
+def test_error_isolation_single_record():
+    backend = PoisonBackend(error_mode="isolate", output_mode="enrich")
+    assert backend({"x": 1, "poison": True}) == {
+        "x": 1,
+        "poison": True,
+        "error": {
+            "type": "ValueError",
+            "message": "execute() failed with the following error: poisoned",
+        },
+    }
+
+    with pytest.raises(exceptions.InferenceBackendRuntimeError):
+        PoisonBackend()([{"x": 1, "poison": True}])
+
+
+def test_call_metrics():
+    metrics = CallMetrics()
+    metrics.update(batch_size=2, execution_times={"preprocess": 1.0, "execute": 2.5})
+    assert metrics.total_execution_time() == 3.5
+    assert "batch_size=2" in repr(metrics)
+    assert "queue_depth" not in repr(metrics)
+
+    model = metrics.to_model()
+    assert isinstance(model, ExecutionMetrics)
+    assert model.total_execution_time == 3.5
+
+    with pytest.raises(AttributeError):
+        metrics.unknown = 1
+
+
+@pytest.mark.parametrize(
+    "config, n_logged",
+    [
+        (dict(), 10),
+        (dict(verbose_every_n_calls=4), 2),
+        (dict(verbose_interval_s=3600), 1),
+    ],
+)
+def test_sampled_verbose_logging(config, n_logged):
+    messages = []
+    sink = logger.add(
+        messages.append, level="DEBUG", filter=lambda r: "CallMetrics" in r["message"]
+    )
+    try:
+        backend = helpers.ValidBackend(verbose=True, **config)
+        for _ in range(10):
+            backend([{"a": 1}])
+    finally:
+        logger.remove(sink)
+
+    assert len(messages) == n_logged
+
+
+class ConcurrentBackend(helpers.ValidBackend):
+    thread_safe = True
+
+    def execute(self, inputs):
+        # Releases the GIL, so that concurrent calls interleave
+        time.sleep(0.01)
+        assert self._metrics.batch_size == len(inputs)
+        return inputs
+
+
+def test_concurrent_calls():
+    backend = ConcurrentBackend()
+    batches = [[{"i": i}] * (i + 1) for i in range(8)]
+    outputs = [None] * len(batches)
+
+    def call(i):
+        for _ in range(5):
+            outputs[i] = backend(batches[i])
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(batches))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outputs == batches
+    metrics = backend.get_metrics()
+    assert 1 <= metrics.batch_size <= len(batches)
+    assert metrics.execution_times.execute >= 10
+
+    aggregated = backend.get_aggregated_metrics()
+    assert aggregated.calls == 40
+    assert aggregated.records == 5 * sum(len(batch) for batch in batches)
+    assert aggregated.mean_execution_times["execute"] >= 10
+    assert aggregated.max_total_execution_time >= aggregated.mean_total_execution_time
+
+
+class NestedBackend(helpers.ValidBackend):
+    def initialize(self):
+        self.inner = ConcurrentBackend()
+
+    def execute(self, inputs):
+        outputs = self.inner(inputs * 2)
+        # The metrics of the inner call do not leak into the outer call
+        assert self._metrics.batch_size == len(inputs)
+        return outputs[: len(inputs)]
+
+
+def test_nested_backend_metrics():
+    backend = NestedBackend()
+    assert backend([{"a": 1}]) == [{"a": 1}]
+    assert backend.get_metrics().batch_size == 1
+    assert backend.inner.get_metrics().batch_size == 2
+
+
+def test_report_metrics():
+    backend = NestedBackend()
+    with backend.report_metrics(queue_depth=3, queue_wait_ms=1.5):
+        backend([{"a": 1}])
+    metrics = backend.get_metrics()
+    assert (metrics.queue_depth, metrics.queue_wait_ms) == (3, 1.5)
+    # Only the calls of the backend the metrics were reported for record them
+    assert backend.inner.get_metrics().queue_depth is None
+
+    backend([{"a": 1}])
+    assert backend.get_metrics().queue_depth is None
+
+
+def test_aggregated_metrics_window():
+    backend = helpers.ValidBackend(metrics_window=3)
+    assert backend.get_aggregated_metrics().calls == 0
+    for size in range(1, 6):
+        backend([{"a": 1}] * size)
+
+    aggregated = backend.get_aggregated_metrics()
+    assert aggregated.calls == 3
+    assert aggregated.records == 3 + 4 + 5
+    assert set(aggregated.mean_execution_times) >= {"preprocess", "execute"}
@@ -0,0 +1,90 @@
+import pytest
+from pydantic import ValidationError
+
+from packflow.backend.batching import AdaptiveBatchSizer, micro_batches
+from packflow.backend.configuration import BatchingConfig
+
+from .. import helpers
+
+
+def test_fixed_batch_size_is_never_adjusted():
+    sizer = AdaptiveBatchSizer(BatchingConfig(batch_size=10))
+    for _ in range(100):
+        assert sizer.observe(10, 1_000.0) == 10
+
+
+@pytest.mark.parametrize(
+    "latency_ms, expected_direction",
+    [
+        (1.0, 1),
+        (12.0, -1),
+        (9.0, 0),
+    ],
+)
+def test_adaptive_batch_size_direction(latency_ms, expected_direction):
+    sizer = AdaptiveBatchSizer(
+        BatchingConfig(batch_size=100, target_p99_ms=10.0, window=4)
+    )
+    for _ in range(4):
+        sizer.observe(100, latency_ms)
+
+    assert (sizer.batch_size > 100) - (sizer.batch_size < 100) == expected_direction
+
+
+def test_adaptive_batch_size_shrinks_immediately_on_spike():
+    sizer = AdaptiveBatchSizer(
+        BatchingConfig(batch_size=100, target_p99_ms=10.0, window=50)
+    )
+    assert sizer.observe(100, 50.0) == 20
+
+
+def test_adaptive_batch_size_respects_bounds():
+    sizer = AdaptiveBatchSizer(
+        BatchingConfig(
+            batch_size=8,
+            target_p99_ms=10.0,
+            window=1,
+            min_batch_size=4,
+            max_batch_size=16,
+        )
+    )
+    for _ in range(10):
+        sizer.observe(sizer.batch_size, 0.01)
+    assert sizer.batch_size == 16
+
+    for _ in range(10):
+        sizer.observe(sizer.batch_size, 1_000.0)
+    assert sizer.batch_size == 4
+
+
+def test_short_batches_are_ignored():
+    sizer = AdaptiveBatchSizer(BatchingConfig(batch_size=10, target_p99_ms=1.0))
+    assert sizer.observe(3, 1_000.0) == 10
+
+
+def test_invalid_batching_bounds():
+    with pytest.raises(ValidationError):
+        BatchingConfig(min_batch_size=10, max_batch_size=5)
+
+
+@pytest.mark.parametrize("n_records, batch_size", [(0, 4), (3, 4), (10, 4), (8, 4)])
+def test_micro_batches(n_records, batch_size):
+    records = [{"i": i} for i in range(n_records)]
+    batches = list(
+        micro_batches(
+            records, AdaptiveBatchSizer(BatchingConfig(batch_size=batch_size))
+        )
+    )
+    assert all(len(batch) <= batch_size for batch in batches)
+    assert [r for batch in batches for r in batch] == records
+
+
+def test_backend_stream():
+    backend = helpers.ValidBackend(batching={"batch_size": 3, "target_p99_ms": 1_000})
+    records = ({"i": i} for i in range(10))
+
+    assert list(backend.stream(records)) == [{"i": i} for i in range(10)]
+
+    metrics = backend.get_metrics()
+    assert metrics.batch_size == 1
+    assert metrics.target_batch_size == 3
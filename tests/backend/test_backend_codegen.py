@@ -0,0 +1,93 @@
+import pytest
+
+from packflow.backend.codegen import (
+    compile_records_transformer,
+    generate_records_transformer_source,
+)
+from packflow.backend.configuration import BackendConfig
+from packflow.backend.preprocessors import RecordsPreprocessor
+
+RECORDS = [
+    {"a": {"b": 1, "c": {"d": 2}}, "e": [{"f": 3}, {"f": 4}], "g": None, "h": 5},
+    {"a": {"b": {}}, "e": [], "h": [1, 2]},
+    {"a": {"b": {"x": 1}}, "e": "not a list"},
+    {"a.b": 6, "a": {"c": {"d": 7}}},  # literal key containing the delimiter
+    {"a": {"c.d": 8}, "h": 9},
+    {},
+]
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        dict(feature_names=["a.b", "a.c.d", "h"], flatten_nested_inputs=True),
+        dict(
+            feature_names=["a.b", "e.1.f", "g", "h", "h"],
+            rename_fields={"a.c.d": "h"},
+            flatten_nested_inputs=True,
+            flatten_lists=True,
+        ),
+        dict(feature_names=["e.0"], flatten_nested_inputs=True, flatten_lists=True),
+        dict(
+            feature_names=["ab", "h"],
+            rename_fields={"a.b": "ab"},
+            ignore_delimiter_collisions=True,
+        ),
+        dict(
+            feature_names=["acd", "g"],
+            rename_fields={"a.c.d": "acd"},
+            ignore_delimiter_collisions=True,
+        ),
+    ],
+)
+def test_compiled_preprocessor_matches_generic(config):
+    generic = RecordsPreprocessor(BackendConfig(**config))
+    compiled = RecordsPreprocessor(BackendConfig(compile_preprocessor=True, **config))
+    assert compiled.transformer is not None
+
+    expected = generic(RECORDS)
+    assert compiled(RECORDS) == expected
+    assert [list(record) for record in compiled(RECORDS)] == [
+        list(record) for record in expected
+    ]
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        dict(rename_fields={"a": "b"}),
+        dict(feature_names=["a.b"]),
+        dict(feature_names=["a"], rename_fields={"a.b": "c.d"}),
+    ],
+)
+def test_unsupported_configs(config):
+    assert generate_records_transformer_source(BackendConfig(**config)) is None
+
+    preprocessor = RecordsPreprocessor(
+        BackendConfig(compile_preprocessor=True, **config)
+    )
+    assert preprocessor.transformer is None
+
+
+def test_fallback_is_used_for_unsupported_records():
+    config = BackendConfig(feature_names=["a.b"], flatten_nested_inputs=True)
+    transform = compile_records_transformer(config)
+
+    fallback_calls = []
+
+    def fallback(record):
+        fallback_calls.append(record)
+        return {"fallback": True}
+
+    outputs = transform([{"a": {"b": 1}}, {"a.b": 2}], fallback)
+
+    assert outputs == [{"a.b": 1}, {"fallback": True}]
+    assert fallback_calls == [{"a.b": 2}]
+
+
+def test_generated_source():
+    config = BackendConfig(feature_names=["a.b"], flatten_nested_inputs=True)
+    transform = compile_records_transformer(config)
+
+    assert transform.source == generate_records_transformer_source(config)
+    assert "'b'" in transform.source
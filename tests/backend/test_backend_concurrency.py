@@ -0,0 +1,151 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from packflow import exceptions
+from packflow.backend.concurrency import (
+    SubBatchPool,
+    batch_length,
+    concat_batches,
+    split_batch,
+)
+from packflow.backend.configuration import ConcurrencyConfig
+
+from .. import helpers
+
+
+class SubBatchBackend(helpers.ValidBackend):
+    def initialize(self):
+        self.calls = []
+
+    def transform_inputs(self, inputs):
+        self.calls.append(("transform_inputs", len(inputs)))
+        return inputs
+
+    def execute(self, inputs):
+        self.calls.append(("execute", len(inputs), threading.get_ident()))
+        # Releases the GIL, like numpy or onnxruntime
+        time.sleep(0.05)
+        return [{"i": record["i"] * 2} for record in inputs]
+
+    def transform_outputs(self, outputs):
+        self.calls.append(("transform_outputs", len(outputs)))
+        return outputs
+
+
+class ThreadSafeSubBatchBackend(SubBatchBackend):
+    thread_safe = True
+
+
+@pytest.mark.parametrize(
+    "data, n_rows",
+    [
+        ([1, 2, 3], 3),
+        (np.zeros((4, 2)), 4),
+        ({"a": np.zeros(5), "b": [0] * 5}, 5),
+        ({"a": np.zeros(5), "b": [0] * 4}, None),
+        ("abc", None),
+    ],
+)
+def test_batch_length(data, n_rows):
+    assert batch_length(data) == n_rows
+
+
+def test_split_and_concat_batches():
+    array = np.arange(20).reshape(10, 2)
+    parts = split_batch(array, 3)
+    assert [len(part) for part in parts] == [3, 3, 4]
+    assert np.array_equal(concat_batches(parts), array)
+
+    columns = {"a": np.arange(10), "b": list(range(10))}
+    parts = split_batch(columns, 4)
+    assert [len(part["b"]) for part in parts] == [2, 3, 2, 3]
+    result = concat_batches(parts)
+    assert np.array_equal(result["a"], columns["a"])
+    assert result["b"] == columns["b"]
+
+    labels, scores = concat_batches([([1], np.ones(1)), ([2, 3], np.zeros(2))])
+    assert labels == [1, 2, 3]
+    assert np.array_equal(scores, [1, 0, 0])
+
+    assert split_batch("abc", 2) is None
+    with pytest.raises(exceptions.InferenceBackendRuntimeError, match="reassemble"):
+        concat_batches(["ab", "c"])
+
+
+def test_sub_batch_pool():
+    pool = SubBatchPool(ConcurrencyConfig(max_workers=4, min_sub_batch_size=10))
+    assert pool.n_parts(None) == 1
+    assert pool.n_parts(15) == 1
+    assert pool.n_parts(25) == 2
+    assert pool.n_parts(1000) == 4
+
+    assert pool.map(lambda x: x * 2, [1, 2, 3]) == [2, 4, 6]
+
+    def fail(x):
+        if x > 1:
+            raise ValueError(x)
+        return x
+
+    with pytest.raises(ValueError, match="2"):
+        pool.map(fail, [1, 2, 3])
+    pool.close()
+
+
+def test_concurrent_execute():
+    backend = SubBatchBackend(concurrency={"max_workers": 4, "min_sub_batch_size": 2})
+    inputs = [{"i": i} for i in range(10)]
+
+    start = time.perf_counter()
+    outputs = backend(inputs)
+    elapsed = time.perf_counter() - start
+
+    assert outputs == [{"i": i * 2} for i in range(10)]
+    # Sub-batches run concurrently, in 4 threads
+    assert elapsed < 0.15
+    executes = [call for call in backend.calls if call[0] == "execute"]
+    assert sorted(call[1] for call in executes) == [2, 2, 3, 3]
+    assert len({call[2] for call in executes}) == 4
+
+    # The backend is not thread-safe, so the transforms run on the whole batch
+    assert ("transform_inputs", 10) in backend.calls
+    assert ("transform_outputs", 10) in backend.calls
+
+    metrics = backend.get_metrics()
+    assert metrics.batch_size == 10
+    assert 50 <= metrics.execution_times.execute < 150
+
+
+def test_concurrent_thread_safe_steps():
+    backend = ThreadSafeSubBatchBackend(
+        concurrency={"max_workers": 2, "min_sub_batch_size": 2}
+    )
+    outputs = backend([{"i": i} for i in range(10)])
+
+    assert outputs == [{"i": i * 2} for i in range(10)]
+    assert sorted(call[:2] for call in backend.calls) == [
+        ("execute", 5),
+        ("execute", 5),
+        ("transform_inputs", 5),
+        ("transform_inputs", 5),
+        ("transform_outputs", 5),
+        ("transform_outputs", 5),
+    ]
+
+
+def test_small_batches_are_not_split():
+    backend = SubBatchBackend(concurrency={"max_workers": 4, "min_sub_batch_size": 8})
+    assert backend([{"i": 1}] * 10) == [{"i": 2}] * 10
+    assert [call[:2] for call in backend.calls] == [
+        ("transform_inputs", 10),
+        ("execute", 10),
+        ("transform_outputs", 10),
+    ]
+
+
+def test_concurrent_errors():
+    backend = SubBatchBackend(concurrency={"max_workers": 2, "min_sub_batch_size": 1})
+    with pytest.raises(exceptions.InferenceBackendRuntimeError, match="execute"):
+        backend([{"i": 1}, {"missing": 1}])
@@ -0,0 +1,123 @@
+import io
+import json
+import mmap
+
+import numpy as np
+import pytest
+
+from packflow.backend.offline import (
+    aligned_chunk_size,
+    iter_chunks,
+    open_features,
+    score_features,
+    score_records,
+)
+
+from .. import helpers
+
+
+class RowSumBackend(helpers.ValidBackend):
+    def execute(self, inputs):
+        return inputs.sum(axis=1, keepdims=True)
+
+    def transform_outputs(self, outputs):
+        return [{"sum": float(v)} for v in outputs[:, 0]]
+
+
+@pytest.fixture
+def features():
+    return np.arange(3000, dtype="float32").reshape(1000, 3)
+
+
+@pytest.mark.parametrize("row_nbytes", [1, 12, 24, 4096, 5000])
+def test_aligned_chunk_size(row_nbytes):
+    rows = aligned_chunk_size(row_nbytes, 100)
+    assert rows >= 1
+    assert (rows * row_nbytes) % mmap.PAGESIZE == 0
+
+
+def test_iter_chunks_covers_all_rows():
+    features = np.arange(30_000, dtype="float32").reshape(10_000, 3)
+    chunks = list(iter_chunks(features, chunk_size=100))
+    assert len(chunks) > 1
+    assert np.array_equal(np.concatenate([chunk for _, chunk in chunks]), features)
+    assert all(np.shares_memory(chunk, features) for _, chunk in chunks)
+
+
+def test_open_features(tmp_path, features):
+    np.save(tmp_path / "features.npy", features)
+    features.tofile(tmp_path / "features.bin")
+
+    assert np.array_equal(open_features(tmp_path / "features.npy"), features)
+    assert np.array_equal(
+        open_features(tmp_path / "features.bin", dtype="float32", n_features=3),
+        features,
+    )
+
+    with pytest.raises(ValueError):
+        open_features(tmp_path / "features.bin")
+
+
+def test_score_features_to_npy(tmp_path, features):
+    np.save(tmp_path / "features.npy", features)
+
+    result = score_features(
+        RowSumBackend(),
+        tmp_path / "features.npy",
+        tmp_path / "scores.npy",
+        chunk_size=64,
+    )
+
+    expected = features.sum(axis=1, keepdims=True)
+    assert np.array_equal(result, expected)
+    assert np.array_equal(np.load(tmp_path / "scores.npy"), expected)
+
+
+def test_score_features_to_preallocated_array(features):
+    output = np.zeros((len(features), 1), dtype="float32")
+    score_features(RowSumBackend(), features, output, chunk_size=64)
+    assert np.array_equal(output, features.sum(axis=1, keepdims=True))
+
+
+def test_score_features_to_npy_records_calls(features):
+    backend = RowSumBackend(concurrency={"max_workers": 2, "min_sub_batch_size": 16})
+    output = np.zeros((len(features), 1), dtype="float32")
+    score_features(backend, features, output, chunk_size=64)
+    assert np.array_equal(output, features.sum(axis=1, keepdims=True))
+
+    metrics = backend.get_metrics()
+    assert 0 < metrics.batch_size <= len(features)
+    assert metrics.execution_times.preprocess == 0.0
+    assert metrics.execution_times.transform_outputs is None
+    assert backend.get_aggregated_metrics().records == len(features)
+
+
+def test_score_features_to_ndjson(features):
+    stream = io.StringIO()
+    assert score_features(RowSumBackend(), features, stream, chunk_size=64) == 1000
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 1000
+    assert json.loads(lines[1]) == {"sum": 12.0}
+
+
+def test_score_records():
+    stream = io.StringIO()
+    records = ({"i": i} for i in range(10))
+    assert score_records(helpers.ValidBackend(), records, stream) == 10
+    assert [json.loads(line) for line in stream.getvalue().splitlines()] == [
+        {"i": i} for i in range(10)
+    ]
+
+
+class NumpyOutputBackend(helpers.ValidBackend):
+    def transform_outputs(self, outputs):
+        return [{"sum": row.sum(), "row": row} for row in outputs]
+
+
+def test_score_features_to_ndjson_path(tmp_path, features):
+    path = tmp_path / "outputs.ndjson"
+    assert score_features(NumpyOutputBackend(), features[:10], path) == 10
+
+    lines = path.read_text().splitlines()
+    assert json.loads(lines[1]) == {"sum": 12.0, "row": [3.0, 4.0, 5.0]}
@@ -5,6 +5,7 @@ import pytest
 from packflow import exceptions
 from packflow.backend.configuration import BackendConfig
 from packflow.backend.preprocessors import (
+    ColumnarPreprocessor,
     NumpyPreprocessor,
     PassthroughPreprocessor,
     Preprocessor,
@@ -19,6 +20,10 @@ from packflow.backend.preprocessors import (
         (BackendConfig(input_format="passthrough"), PassthroughPreprocessor),
         (BackendConfig(input_format="records"), RecordsPreprocessor),
         (BackendConfig(input_format="numpy", feature_names=["foo"]), NumpyPreprocessor),
+        (
+            BackendConfig(input_format="columnar", feature_names=["foo"]),
+            ColumnarPreprocessor,
+        ),
     ],
 )
 def test_get_preprocessor(config: BackendConfig, expected_output):
@@ -126,3 +131,220 @@ def test_preprocessors(config, preprocessor_cls, expectation, inputs, expected_o
             assert np.array_equal(outputs, expected_outputs)
         else:
             assert outputs == expected_outputs
+
+
+def test_records_preprocessor_projection_matches_full_flatten():
+    record = {
+        "user": {"id": 1, "profile": {"age": 30, "tags": ["a", "b"]}},
+        "events": [{"type": "click"}, {"type": "view"}],
+        **{f"unused_{i}": {"value": i} for i in range(100)},
+    }
+    config = dict(
+        flatten_nested_inputs=True,
+        flatten_lists=True,
+        rename_fields={"user.id": "user_id"},
+        feature_names=["user_id", "user.profile.age", "events.1.type", "missing"],
+    )
+
+    preprocessor = RecordsPreprocessor(BackendConfig(**config))
+    assert preprocessor.projection is not None
+    projected = preprocessor([record])
+
+    preprocessor.projection = None
+    assert projected == preprocessor([record])
+    assert projected == [
+        {"user_id": 1, "user.profile.age": 30, "events.1.type": "view"}
+    ]
+
+
+@pytest.mark.parametrize("flatten_nested_inputs", [False, True])
+def test_records_preprocessor_record_views(flatten_nested_inputs):
+    records = [{"id": 1, "nested": {"value": 2}}]
+    config = dict(
+        rename_fields={"id": "record_id"}, flatten_nested_inputs=flatten_nested_inputs
+    )
+
+    expected = RecordsPreprocessor(BackendConfig(**config))(records)
+    outputs = RecordsPreprocessor(BackendConfig(record_views=True, **config))(records)
+
+    assert outputs == expected
+    assert [list(record) for record in outputs] == [list(record) for record in expected]
+
+    outputs[0]["extra"] = True
+    assert records == [{"id": 1, "nested": {"value": 2}}]
+
+
+SEQUENCE_RECORDS = [
+    {"id": 1, "flow": {"ports": [80, 443, 8080]}},
+    {"id": 2, "flow": {"ports": []}},
+    {"id": 3},
+]
+SEQUENCE_CONFIG = dict(
+    feature_names=["id", "ports"],
+    rename_fields={"flow.ports": "ports"},
+    feature_schema={"ports": {"type": "sequence", "max_length": 2, "pad_value": -1}},
+)
+
+
+def test_columnar_preprocessor_sequence_features():
+    outputs = ColumnarPreprocessor(BackendConfig(**SEQUENCE_CONFIG))(SEQUENCE_RECORDS)
+
+    assert list(outputs) == ["id", "ports", "ports_lengths"]
+    assert outputs["id"].tolist() == [1, 2, 3]
+    assert outputs["ports"].tolist() == [[80, 443], [-1, -1], [-1, -1]]
+    assert outputs["ports_lengths"].tolist() == [2, 0, 0]
+
+
+def test_numpy_preprocessor_sequence_features():
+    outputs = NumpyPreprocessor(BackendConfig(**SEQUENCE_CONFIG))(SEQUENCE_RECORDS)
+    # The lengths of the sequences are appended as the last column
+    assert outputs.tolist() == [[1, 80, 443, 2], [2, -1, -1, 0], [3, -1, -1, 0]]
+
+    outputs = NumpyPreprocessor(BackendConfig(**SEQUENCE_CONFIG))([])
+    assert outputs.shape == (0, 4)
+
+
+def test_feature_schema_requires_feature_names():
+    with pytest.raises(ValueError):
+        BackendConfig(feature_schema={"ports": {"type": "sequence", "max_length": 2}})
+
+
+def test_typed_feature_schema():
+    records = [
+        {"bytes": 10, "proto": "tcp", "comment": "x"},
+        {"bytes": None, "proto": "udp"},
+        {"proto": "gre", "bytes": 2.5},
+    ]
+    config = dict(
+        feature_names=["bytes", "proto"],
+        feature_schema={
+            "bytes": {"type": "numeric", "fill_value": -1},
+            "proto": {"type": "categorical", "vocabulary": ["tcp", "udp"]},
+        },
+    )
+
+    outputs = ColumnarPreprocessor(BackendConfig(**config))(records)
+    assert outputs["bytes"].dtype == np.float32
+    assert outputs["bytes"].tolist() == [10, -1, 2.5]
+    assert outputs["proto"].dtype == np.int32
+    assert outputs["proto"].tolist() == [1, 2, 0]
+
+    preprocessor = NumpyPreprocessor(BackendConfig(numpy_dtype="float32", **config))
+    outputs = preprocessor(records)
+    assert outputs.dtype == np.float32
+    assert outputs.tolist() == [[10, 1], [-1, 2], [2.5, 0]]
+
+
+def test_categorical_vocabulary_must_be_unique():
+    with pytest.raises(ValueError):
+        BackendConfig(
+            feature_names=["proto"],
+            feature_schema={
+                "proto": {"type": "categorical", "vocabulary": ["tcp", "tcp"]}
+            },
+        )
+
+
+def test_timestamp_features():
+    records = [
+        {"id": 1, "ts": "2024-01-02T03:04:05Z"},
+        {"id": 2, "ts": "not a timestamp"},
+        {"id": 3, "ts": 1704164645},
+    ]
+    config = BackendConfig(
+        input_format="columnar",
+        feature_names=["id", "ts"],
+        feature_schema={"ts": {"type": "timestamp", "parts": ["hour", "day_of_week"]}},
+    )
+    outputs = ColumnarPreprocessor(config)(records)
+
+    assert list(outputs) == ["id", "ts", "ts_hour", "ts_day_of_week", "ts_valid"]
+    assert np.array_equal(
+        outputs["ts"], [1704164645, np.nan, 1704164645], equal_nan=True
+    )
+    assert outputs["ts_hour"].tolist() == [3, -1, 3]
+    assert outputs["ts_day_of_week"].tolist() == [1, -1, 1]
+    assert outputs["ts_valid"].tolist() == [True, False, True]
+
+    outputs = NumpyPreprocessor(config.model_copy(update={"input_format": "numpy"}))(
+        records
+    )
+    assert outputs.shape == (3, 5)
+    # The valid mask is appended as the last column
+    assert outputs[:, -1].tolist() == [1, 0, 1]
+    assert np.array_equal(
+        outputs[:, 1], [1704164645, np.nan, 1704164645], equal_nan=True
+    )
+
+
+def test_ip_features():
+    records = [{"src": "10.1.2.3"}, {"src": "192.168.0.5"}, {"src": "8.8.8.8"}, {}]
+    config = BackendConfig(
+        input_format="columnar",
+        feature_names=["src"],
+        feature_schema={
+            "src": {
+                "type": "ip",
+                "networks": ["10.0.0.0/8", "10.1.0.0/16", "0.0.0.0/0"],
+            }
+        },
+    )
+    outputs = ColumnarPreprocessor(config)(records)
+
+    assert outputs["src"].tolist() == [167838211, 3232235525, 134744072, 0]
+    assert outputs["src_network"].tolist() == [1, 2, 2, -1]
+    assert outputs["src_valid"].tolist() == [True, True, True, False]
+
+
+def test_numpy_preprocessor_appends_auxiliary_columns():
+    records = [
+        {"src": "10.1.2.3", "ports": [80]},
+        {"src": "bogus", "ports": [1, 2, 3]},
+    ]
+    config = BackendConfig(
+        input_format="numpy",
+        numpy_dtype="float64",
+        feature_names=["src", "ports"],
+        feature_schema={
+            "src": {"type": "ip"},
+            "ports": {"type": "sequence", "max_length": 2},
+        },
+    )
+    outputs = NumpyPreprocessor(config)(records)
+
+    # Features first, then src_valid and ports_lengths, in the order of feature_names
+    assert outputs.tolist() == [
+        [167838211, 80, 0, 1, 1],
+        [0, 1, 2, 0, 2],
+    ]
+
+
+def test_ip_feature_networks_must_match_version():
+    with pytest.raises(ValueError):
+        BackendConfig(
+            feature_names=["src"],
+            feature_schema={"src": {"type": "ip", "networks": ["2001:db8::/32"]}},
+        )
+
+
+def test_hashed_features():
+    records = [{"ua": "Mozilla/5.0"}, {"ua": ["GET", "/"]}, {}]
+    config = dict(
+        feature_names=["ua"],
+        feature_schema={"ua": {"type": "hashed", "n_features": 8}},
+    )
+    outputs = ColumnarPreprocessor(BackendConfig(**config))(records)
+    assert outputs["ua"].shape == (3, 8)
+    assert outputs["ua"].sum(axis=1).tolist() == [1, 2, 0]
+
+    outputs = NumpyPreprocessor(BackendConfig(**config))(records)
+    assert outputs.shape == (3, 8)
+
+
+def test_sparse_hashed_features_require_columnar_format():
+    config = BackendConfig(
+        feature_names=["ua"],
+        feature_schema={"ua": {"type": "hashed", "n_features": 8, "sparse": True}},
+    )
+    with pytest.raises(exceptions.PreprocessorInitError):
+        NumpyPreprocessor(config)
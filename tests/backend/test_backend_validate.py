@@ -5,6 +5,9 @@ import pytest
 
 import packflow.exceptions as exceptions
 from packflow.backend import validation
+from packflow.backend.configuration import OutputGuardConfig
+
+from .. import helpers
 
 
 @pytest.mark.parametrize(
@@ -64,3 +67,92 @@ def test__output_is_list_of_dicts(outputs, expectation):
 def test__output_is_json_serializable(outputs, expectation):
     with expectation:
         validation._output_is_json_serializable(outputs)
+
+
+def _guard(**config):
+    return validation.OutputGuard(OutputGuardConfig(enabled=True, **config))
+
+
+def test_output_guard_learns_schema():
+    guard = _guard(learn_batches=2, sample_rate=0)
+    guard([], 0)
+    guard([{"label": "a", "score": 0.5}], 1)
+    guard([{"label": "b", "score": 1, "extra": [1]}], 1)
+
+    assert guard.n_learned == 2
+    assert guard.required == {"label", "score"}
+    assert guard.fields["score"] == {float, int, type(None)}
+
+    outputs = [
+        {"label": "c", "score": 0.1},
+        {"label": None, "score": 2, "extra": [np.int32(1)]},
+    ]
+    assert guard(outputs, 2) is outputs
+
+
+@pytest.mark.parametrize(
+    "outputs, match",
+    [
+        ([{"label": "a", "score": 0.5}], "matching lengths"),
+        ([{"label": "a", "score": 0.5}, 5], "index 1 is not a dictionary"),
+        ([{"label": "a"}, {"label": "b"}], "Missing fields: \\['score'\\]"),
+        (
+            [{"label": "a", "score": 0.5, "new": 1}] * 2,
+            "unexpected fields: \\['new'\\]",
+        ),
+        ([{"label": "a", "score": 0.5}, {"label": "b", "score": "high"}], "'score'"),
+        ([{"label": "a", "score": True}] * 2, "index 0.*'score'"),
+        ([{"label": "a", "score": np.bool_(True)}] * 2, "index 0.*'score'"),
+    ],
+)
+def test_output_guard_violations(outputs, match):
+    guard = _guard(sample_rate=0)
+    guard([{"label": "a", "score": 0.5}], 1)
+
+    with pytest.raises(exceptions.InferenceBackendValidationError, match=match):
+        guard(outputs, 2)
+
+
+def test_output_guard_numeric_subtypes():
+    guard = _guard(sample_rate=1)
+    guard([{"score": 0.5, "count": 1, "flag": True}], 1)
+
+    outputs = [
+        {"score": np.float32(0.5), "count": np.int64(2), "flag": False},
+        {"score": 1, "count": np.uint8(3), "flag": None},
+        {"score": np.int32(1), "count": 4, "flag": True},
+    ]
+    assert guard(outputs, 3) is outputs
+    # Accepted types are learned, so that the next batches match at once
+    assert {np.float32, np.int32} <= guard.fields["score"]
+    assert guard._matches_schema(outputs)
+
+    for value in (1.5, np.float64(1.5)):
+        with pytest.raises(exceptions.InferenceBackendValidationError, match="'count'"):
+            guard([{"score": 0.5, "count": value, "flag": True}], 1)
+    for value in (1, np.int8(1)):
+        with pytest.raises(exceptions.InferenceBackendValidationError, match="'flag'"):
+            guard([{"score": 0.5, "count": 1, "flag": value}], 1)
+
+
+def test_output_guard_learns_numpy_scalars():
+    guard = _guard(sample_rate=0)
+    guard([{"score": np.float32(0.5)}], 1)
+    assert guard([{"score": 0.25}], 1) == [{"score": 0.25}]
+
+
+def test_output_guard_sampled_deep_check():
+    guard = _guard(sample_rate=1)
+    guard([{"values": [1, 2]}], 1)
+
+    with pytest.raises(exceptions.InferenceBackendValidationError):
+        guard([{"values": [1, np.int32(2)]}], 1)
+
+
+def test_output_guard_in_backend():
+    backend = helpers.ValidBackend(output_guard={"enabled": True})
+    backend([{"a": 1}, {"a": 2}])
+    assert backend.get_metrics().execution_times.guard_outputs is not None
+
+    with pytest.raises(exceptions.InferenceBackendRuntimeError):
+        backend([{"b": 1}])
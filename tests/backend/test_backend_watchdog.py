@@ -0,0 +1,188 @@
+import threading
+import time
+
+import pytest
+
+from packflow import exceptions
+from packflow.backend.configuration import DeadlinesConfig
+from packflow.backend.watchdog import Watchdog
+
+from .. import helpers
+
+
+class SleepBackend(helpers.ValidBackend):
+    def execute(self, inputs):
+        time.sleep(max(record["sleep"] for record in inputs))
+        return inputs
+
+
+def test_watchdog_stage_deadline():
+    watchdog = Watchdog(DeadlinesConfig(stages={"execute": 50}))
+    # Steps without a deadline run in the calling thread
+    caller = threading.current_thread()
+    assert (
+        watchdog.run("preprocess", lambda x: threading.current_thread(), None) is caller
+    )
+    assert (
+        watchdog.run("execute", lambda x: threading.current_thread(), None)
+        is not caller
+    )
+    assert watchdog.run("execute", lambda x: x + 1, 1) == 2
+
+    with pytest.raises(exceptions.InferenceBackendTimeoutError, match="execute"):
+        watchdog.run("execute", time.sleep, 1)
+    assert watchdog.timeouts == 1
+
+    # The next step runs in a new thread
+    assert watchdog.run("execute", lambda x: x * 2, 2) == 4
+
+    with pytest.raises(ZeroDivisionError):
+        watchdog.run("execute", lambda x: 1 / x, 0)
+
+
+def test_watchdog_call_deadline():
+    watchdog = Watchdog(DeadlinesConfig(call_ms=100))
+    assert watchdog.timeout("execute") is None
+
+    watchdog.start_call()
+    watchdog.run("transform_inputs", time.sleep, 0.06)
+    with pytest.raises(exceptions.InferenceBackendTimeoutError):
+        watchdog.run("execute", time.sleep, 0.06)
+    watchdog.end_call()
+
+    assert watchdog.timeout("execute") is None
+
+
+def test_backend_deadlines():
+    backend = SleepBackend(deadlines={"stages": {"execute": 50}})
+    assert backend([{"sleep": 0}]) == [{"sleep": 0}]
+    assert backend.get_metrics().timeouts == 0
+
+    start = time.perf_counter()
+    with pytest.raises(exceptions.InferenceBackendTimeoutError):
+        backend([{"sleep": 1}])
+    assert time.perf_counter() - start < 0.5
+    assert backend.get_metrics().timeouts == 1
+
+    backend = helpers.ValidBackend()
+    backend([{}])
+    assert backend.get_metrics().timeouts is None
+
+
+def test_backend_deadlines_with_error_isolation():
+    backend = SleepBackend(deadlines={"stages": {"execute": 100}}, error_mode="isolate")
+
+    start = time.perf_counter()
+    outputs = backend([{"sleep": 0}, {"sleep": 0}, {"sleep": 1}, {"sleep": 0}])
+    # Timeouts are not split and rerun
+    assert time.perf_counter() - start < 0.3
+
+    assert [output["error"]["type"] for output in outputs] == [
+        "InferenceBackendTimeoutError"
+    ] * 4
+    metrics = backend.get_metrics()
+    assert metrics.timeouts == 1
+    assert metrics.isolated_records == 4
+    assert metrics.isolation_calls == 0
+
+
+def test_backend_call_deadline_with_error_isolation():
+    backend = SleepBackend(deadlines={"call_ms": 100}, error_mode="isolate")
+    inputs = [{"sleep": 0} for _ in range(32)]
+    inputs[20] = {"sleep": 1}
+
+    start = time.perf_counter()
+    outputs = backend(inputs)
+    assert time.perf_counter() - start < 0.3
+
+    assert all(
+        output["error"]["type"] == "InferenceBackendTimeoutError" for output in outputs
+    )
+    assert backend.get_metrics().timeouts == 1
+
+
+def test_backend_timeout_while_isolating_errors():
+    class FailingSleepBackend(SleepBackend):
+        def execute(self, inputs):
+            if any(record.get("fail") for record in inputs):
+                raise ValueError("failed")
+            return super().execute(inputs)
+
+    backend = FailingSleepBackend(
+        deadlines={"stages": {"execute": 100}}, error_mode="isolate"
+    )
+    inputs = [{"sleep": 0} for _ in range(8)]
+    inputs[4] = {"sleep": 0, "fail": True}
+    inputs[7] = {"sleep": 1}
+    outputs = backend(inputs)
+
+    # Sub-batches processed before the timeout keep their outputs
+    assert outputs[:4] == [{"sleep": 0}] * 4
+    assert [output["error"]["type"] for output in outputs[4:]] == [
+        "InferenceBackendTimeoutError"
+    ] * 4
+    assert backend.get_metrics().timeouts == 1
+
+
+def test_watchdog_concurrent_calls():
+    watchdog = Watchdog(DeadlinesConfig(call_ms=1000, stages={"execute": 500}))
+    threads_used = set()
+
+    def call():
+        watchdog.start_call()
+        watchdog.run("execute", time.sleep, 0.1)
+        threads_used.add(watchdog.run("execute", lambda x: threading.get_ident(), None))
+        watchdog.end_call()
+
+    start = time.perf_counter()
+    callers = [threading.Thread(target=call) for _ in range(4)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+
+    # Concurrent steps run in separate stage threads, so they do not wait for each other
+    assert time.perf_counter() - start < 0.3
+    assert 1 <= len(threads_used) <= 4
+    assert watchdog.timeouts == 0
+    assert watchdog.timeout("execute") == 0.5
+    watchdog.close()
+
+
+def test_watchdog_stage_threads_are_bounded():
+    watchdog = Watchdog(DeadlinesConfig(stages={"execute": 500}), max_idle_threads=2)
+
+    def call():
+        watchdog.run("execute", time.sleep, 0.01)
+
+    # Short-lived callers reuse the idle stage threads of earlier calls
+    for _ in range(5):
+        callers = [threading.Thread(target=call) for _ in range(8)]
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join()
+    assert len(watchdog._threads) == len(watchdog._idle) == 2
+
+    # Idle threads are stopped on close, and steps still run afterwards
+    idle = list(watchdog._idle)
+    watchdog.close()
+    assert all(thread.stopped for thread in idle)
+    assert watchdog.run("execute", lambda x: x + 1, 1) == 2
+    assert not watchdog._threads
+
+
+def test_backend_close():
+    backend = SleepBackend(
+        deadlines={"stages": {"execute": 500}},
+        concurrency={"max_workers": 2, "min_sub_batch_size": 1},
+    )
+    assert backend([{"sleep": 0}] * 4) == [{"sleep": 0}] * 4
+    assert backend._watchdog._threads
+    assert backend._sub_batch_pool._executor is not None
+
+    backend.close()
+    assert not backend._watchdog._threads
+    assert backend._sub_batch_pool._executor is None
+    # The threads are started again if the backend is called after closing
+    assert backend([{"sleep": 0}] * 4) == [{"sleep": 0}] * 4
@@ -1,3 +1,5 @@
+import os
+import time
 from pathlib import Path
 from typing import Any
 
@@ -47,3 +49,12 @@ class ErrorInitBackend(packflow.InferenceBackend):
 class WrongOutputTypeBackend(packflow.InferenceBackend):
     def execute(self, inputs: Any) -> Any:
         return np.array([[0, 1]])
+
+
+class DoubleArrayBackend(packflow.InferenceBackend):
+    def execute(self, inputs: Any) -> Any:
+        if isinstance(inputs, np.ndarray) and inputs.size and inputs.flat[0] < 0:
+            os._exit(1)
+        if isinstance(inputs, np.ndarray) and inputs.size and np.isnan(inputs.flat[0]):
+            time.sleep(3600)
+        return inputs * 2
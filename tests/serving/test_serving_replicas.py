@@ -0,0 +1,153 @@
+import threading
+import time
+
+import pytest
+
+from packflow import exceptions
+from packflow.loaders.base import InferenceBackendLoader
+from packflow.serving import ReplicaPool
+
+from .. import helpers
+
+
+class ObjectLoader(InferenceBackendLoader):
+    """Loads the object passed as path, e.g. a backend class."""
+
+    def load_backend_module(self):
+        return self.path
+
+
+class StatefulBackend(helpers.ValidBackend):
+    n_loads = 0
+
+    def initialize(self):
+        def load():
+            StatefulBackend.n_loads += 1
+            return {"weights": [1, 2, 3]}
+
+        self.model = self.shared_artifact("model", load)
+        self.busy = False
+
+    def execute(self, inputs):
+        # Not thread-safe: each replica must only run one call at a time
+        assert not self.busy
+        self.busy = True
+        time.sleep(0.05)
+        self.busy = False
+        return inputs
+
+
+def wait_for(condition, timeout=1.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline
+        time.sleep(0.001)
+
+
+def test_replicas_share_artifacts():
+    StatefulBackend.n_loads = 0
+    pool = ReplicaPool(ObjectLoader(StatefulBackend), n_replicas=3)
+
+    assert len({id(replica) for replica in pool.replicas}) == 3
+    assert StatefulBackend.n_loads == 1
+    assert all(replica.model is pool.artifacts["model"] for replica in pool.replicas)
+
+    # Outside of a pool, artifacts are loaded by every instance
+    StatefulBackend()
+    assert StatefulBackend.n_loads == 2
+
+
+def test_concurrent_calls():
+    pool = ReplicaPool(ObjectLoader(StatefulBackend), n_replicas=3)
+    results = [None] * 6
+
+    def call(i):
+        results[i] = pool([{"i": i}])
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [[{"i": i}] for i in range(6)]
+    assert time.perf_counter() - start < 0.25
+
+    metrics = pool.metrics()
+    assert metrics["calls"] == 6
+    assert metrics["busy_replicas"] == metrics["waiting_callers"] == 0
+    assert 0 < metrics["utilization"] <= 1
+    assert metrics["mean_wait_ms"] > 0
+
+
+def test_waiting_callers_are_served_in_order():
+    pool = ReplicaPool(ObjectLoader(helpers.ValidBackend), n_replicas=1)
+    order = []
+
+    def call(i):
+        with pool.checkout():
+            order.append(i)
+
+    with pool.checkout():
+        threads = []
+        for i in range(5):
+            threads.append(threading.Thread(target=call, args=(i,)))
+            threads[-1].start()
+            wait_for(lambda: pool.metrics()["waiting_callers"] == i + 1)
+
+    for thread in threads:
+        thread.join()
+    assert order == list(range(5))
+
+
+def test_acquire_timeout():
+    pool = ReplicaPool(
+        ObjectLoader(helpers.ValidBackend), n_replicas=1, acquire_timeout_s=0.05
+    )
+    with pool.checkout():
+        with pytest.raises(exceptions.InferenceBackendTimeoutError):
+            pool([{}])
+    assert pool.metrics()["waiting_callers"] == 0
+    assert pool([{}]) == [{}]
+
+
+def test_close_fails_waiting_callers():
+    pool = ReplicaPool(ObjectLoader(helpers.ValidBackend), n_replicas=1)
+    errors = []
+
+    def call():
+        try:
+            pool([{}])
+        except RuntimeError as e:
+            errors.append(e)
+
+    with pool.checkout():
+        thread = threading.Thread(target=call)
+        thread.start()
+        wait_for(lambda: pool.metrics()["waiting_callers"] == 1)
+        pool.close()
+        thread.join()
+
+    assert len(errors) == 1
+    with pytest.raises(RuntimeError, match="closed"):
+        pool([{}])
+
+
+def test_replicas_must_be_distinct():
+    with pytest.raises(exceptions.InferenceBackendLoadError, match="same backend"):
+        ReplicaPool(ObjectLoader(helpers.ValidBackend()), n_replicas=2)
+
+
+def test_close_closes_replicas():
+    pool = ReplicaPool(
+        ObjectLoader(helpers.ValidBackend),
+        n_replicas=2,
+        deadlines={"stages": {"execute": 500}},
+    )
+    pool([{}])
+    watchdogs = [replica._watchdog for replica in pool.replicas]
+    assert any(watchdog._idle for watchdog in watchdogs)
+
+    pool.close()
+    assert not any(watchdog._threads for watchdog in watchdogs)
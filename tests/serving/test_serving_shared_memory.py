@@ -0,0 +1,143 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from packflow import exceptions
+from packflow.backend.configuration import BackendConfig
+from packflow.backend.preprocessors import NumpyPreprocessor
+from packflow.loaders import ModuleLoader
+from packflow.serving.shared_memory import SharedMemoryExecutor, SharedMemoryRing
+
+
+@pytest.fixture
+def loader():
+    return ModuleLoader("tests.helpers:DoubleArrayBackend")
+
+
+def _segment_exists(name: str) -> bool:
+    try:
+        shared_memory.SharedMemory(name=name).close()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def test_ring_round_trip():
+    ring = SharedMemoryRing(n_slots=2, slot_size=1024)
+    array = np.arange(12, dtype="float32").reshape(3, 4)
+
+    handle = ring.write(1, array)
+    view = ring.view(handle)
+    assert np.array_equal(view, array)
+
+    attached = SharedMemoryRing(**ring.spec())
+    assert np.array_equal(attached.view(handle), array)
+    del view
+    attached.close()
+
+    ring.close()
+    assert not _segment_exists(ring.name)
+
+
+def test_ring_rejects_oversized_arrays():
+    ring = SharedMemoryRing(n_slots=1, slot_size=16)
+    with pytest.raises(ValueError):
+        ring.write(0, np.zeros(100))
+    ring.close()
+
+
+def test_ring_is_unlinked_when_garbage_collected():
+    ring = SharedMemoryRing(n_slots=1, slot_size=16)
+    name = ring.name
+    del ring
+    assert not _segment_exists(name)
+
+
+def test_executor(loader):
+    batches = [np.full((4, 3), i, dtype="float64") for i in range(10)]
+    with SharedMemoryExecutor(loader, n_workers=2) as executor:
+        results = list(executor.map(batches))
+        names = [executor._inputs.name, executor._outputs.name]
+
+    for batch, result in zip(batches, results):
+        assert np.array_equal(result, batch * 2)
+
+    assert not any(_segment_exists(name) for name in names)
+
+
+def test_executor_map_is_lazy(loader):
+    read = []
+
+    def batches():
+        for i in range(6):
+            read.append(i)
+            yield np.full(3, i, dtype="float64")
+
+    with SharedMemoryExecutor(loader, n_workers=2) as executor:
+        assert executor.n_slots == 2
+        results = executor.map(batches())
+        assert np.array_equal(next(results), np.zeros(3))
+        # At most n_slots batches are in flight
+        assert read == [0, 1, 2]
+        assert [result[0] for result in results] == [2, 4, 6, 8, 10]
+
+
+def test_executor_falls_back_for_large_arrays(loader):
+    with SharedMemoryExecutor(loader, slot_size=64) as executor:
+        features = np.ones((10, 10))
+        assert np.array_equal(executor.execute(features), features * 2)
+
+
+def test_executor_with_preprocessor(loader):
+    preprocessor = NumpyPreprocessor(BackendConfig(feature_names=["a", "b"]))
+    with SharedMemoryExecutor(loader, preprocessor=preprocessor) as executor:
+        result = executor.execute([{"a": 1, "b": 2}, {"a": 3, "b": 4}])
+
+    assert np.array_equal(result, np.array([[2, 4], [6, 8]]))
+
+
+def test_executor_survives_unpicklable_payloads(loader):
+    with SharedMemoryExecutor(loader) as executor:
+        with pytest.raises(
+            exceptions.InferenceBackendRuntimeError, match="Cannot send"
+        ):
+            executor.submit([lambda: 1]).result(timeout=5)
+
+        future = executor.submit(np.ones(3))
+        assert np.array_equal(future.result(timeout=5), np.full(3, 2.0))
+
+
+def test_executor_survives_unexpected_errors(loader, monkeypatch):
+    with SharedMemoryExecutor(loader) as executor:
+        write = executor._inputs.write
+
+        def fail_once(slot, features):
+            monkeypatch.setattr(executor._inputs, "write", write)
+            raise OSError("ring failure")
+
+        monkeypatch.setattr(executor._inputs, "write", fail_once)
+        with pytest.raises(OSError, match="ring failure"):
+            executor.submit(np.ones(3)).result(timeout=5)
+
+        future = executor.submit(np.ones(3))
+        assert np.array_equal(future.result(timeout=5), np.full(3, 2.0))
+
+
+def test_executor_respawns_crashed_workers(loader):
+    with SharedMemoryExecutor(loader) as executor:
+        with pytest.raises(exceptions.InferenceBackendRuntimeError):
+            executor.execute(np.full(3, -1.0))
+
+        assert np.array_equal(executor.execute(np.ones(3)), np.full(3, 2.0))
+
+
+def test_executor_kills_workers_past_deadline(loader):
+    with SharedMemoryExecutor(
+        loader, deadlines={"stages": {"execute": 200}}
+    ) as executor:
+        with pytest.raises(exceptions.InferenceBackendTimeoutError):
+            executor.execute(np.full(3, np.nan))
+
+        assert executor.timeouts == 1
+        assert np.array_equal(executor.execute(np.ones(3)), np.full(3, 2.0))
@@ -0,0 +1,253 @@
+import io
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from packflow import exceptions
+from packflow.serving import Codec, WorkerClient, WorkerServer
+from packflow.serving.protocol import (
+    MessageType,
+    decode_payload,
+    encode_payload,
+    read_frame,
+    write_frame,
+)
+
+from .. import helpers
+
+
+class SumBackend(helpers.ValidBackend):
+    def execute(self, inputs):
+        return [{"sum": float(np.sum(row))} for row in inputs]
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return tmp_path / "worker.sock"
+
+
+@pytest.mark.parametrize(
+    "obj, codec",
+    [
+        ([{"foo": 1, "bar": [1, 2]}], Codec.JSON),
+        (np.arange(12, dtype="float32").reshape(3, 4), Codec.NUMPY),
+        (np.zeros((0, 2), dtype="int64"), Codec.NUMPY),
+    ],
+)
+def test_frame_round_trip(obj, codec):
+    stream = io.BytesIO()
+    write_frame(stream, 7, MessageType.REQUEST, codec, encode_payload(obj, codec))
+    stream.seek(0)
+
+    frame = read_frame(stream)
+    assert frame.request_id == 7
+    assert frame.message_type == MessageType.REQUEST
+    decoded = decode_payload(frame.payload, frame.codec)
+
+    if isinstance(obj, np.ndarray):
+        assert decoded.dtype == obj.dtype
+        assert np.array_equal(decoded, obj)
+    else:
+        assert decoded == obj
+
+    assert read_frame(stream) is None
+
+
+def test_frame_size_limit():
+    stream = io.BytesIO()
+    write_frame(stream, 0, MessageType.REQUEST, Codec.JSON, b"x" * 100)
+    stream.seek(0)
+    with pytest.raises(exceptions.WorkerProtocolError):
+        read_frame(stream, max_frame_size=10)
+
+
+def test_truncated_frame():
+    stream = io.BytesIO()
+    write_frame(stream, 0, MessageType.REQUEST, Codec.JSON, b"[1, 2, 3]")
+    stream = io.BytesIO(stream.getvalue()[:-2])
+    with pytest.raises(exceptions.WorkerProtocolError):
+        read_frame(stream)
+
+
+def test_unix_socket_worker(socket_path):
+    with WorkerServer(helpers.ValidBackend(), socket_path=socket_path):
+        with WorkerClient(socket_path, codec="json") as client:
+            assert client.infer({"foo": 1}) == {"foo": 1}
+            assert client.infer([{"foo": 1}, {"foo": 2}]) == [{"foo": 1}, {"foo": 2}]
+
+    assert not socket_path.exists()
+
+
+def test_tcp_worker():
+    with WorkerServer(helpers.ValidBackend(), port=0) as server:
+        _, port = server.address
+        with WorkerClient(port=port, codec="json") as client:
+            assert client.infer([{"foo": 1}]) == [{"foo": 1}]
+
+
+def test_pipelined_requests(socket_path):
+    batches = [[{"i": i}] for i in range(100)]
+    with WorkerServer(helpers.ValidBackend(), socket_path=socket_path):
+        with WorkerClient(socket_path, codec="json") as client:
+            assert list(client.infer_many(batches, max_in_flight=8)) == batches
+
+
+def test_pipelined_requests_larger_than_socket_buffers(socket_path):
+    # Requests and responses of 400 KB each fill the socket buffers of both directions
+    batches = [[{"i": i, "payload": "x" * 400_000}] for i in range(8)]
+    with WorkerServer(helpers.ValidBackend(), socket_path=socket_path):
+        with WorkerClient(socket_path, codec="json", timeout=5) as client:
+            results = list(client.infer_many(batches, max_in_flight=8))
+
+    assert results == batches
+
+
+def test_numpy_payload(socket_path):
+    features = np.arange(6, dtype="float64").reshape(3, 2)
+    with WorkerServer(SumBackend(), socket_path=socket_path):
+        with WorkerClient(socket_path, codec="json") as client:
+            assert client.infer_array(features) == [
+                {"sum": 1.0},
+                {"sum": 5.0},
+                {"sum": 9.0},
+            ]
+
+
+def test_msgpack_codec(socket_path):
+    pytest.importorskip("msgpack")
+    with WorkerServer(helpers.ValidBackend(), socket_path=socket_path):
+        with WorkerClient(socket_path, codec="msgpack") as client:
+            assert client.infer([{"foo": "bar"}]) == [{"foo": "bar"}]
+
+
+def test_backend_errors_are_reported(socket_path):
+    with WorkerServer(helpers.ErrorBackend(), socket_path=socket_path):
+        with WorkerClient(socket_path, codec="json") as client:
+            with pytest.raises(exceptions.InferenceBackendRuntimeError):
+                client.infer([{}])
+
+            # The connection remains usable after an error
+            with pytest.raises(exceptions.InferenceBackendRuntimeError):
+                client.infer([{}])
+
+
+class PoisonBackend(helpers.ValidBackend):
+    def execute(self, inputs):
+        if any(record.get("poison") for record in inputs):
+            raise ValueError("poisoned")
+        return inputs
+
+
+def test_pipelined_errors_keep_responses_in_step(socket_path):
+    batches = [[{"i": 0}], [{"poison": True}], [{"i": 2}], [{"i": 3}]]
+    with WorkerServer(PoisonBackend(), socket_path=socket_path):
+        with WorkerClient(socket_path, codec="json") as client:
+            results = client.infer_many(batches)
+            assert next(results) == [{"i": 0}]
+            with pytest.raises(
+                exceptions.InferenceBackendRuntimeError, match="poisoned"
+            ):
+                next(results)
+
+            # The responses to the requests sent after the failed one were discarded
+            assert client.infer([{"i": 4}]) == [{"i": 4}]
+
+            # As are those of an iteration stopped early
+            for result in client.infer_many(batches[2:]):
+                break
+            assert client.infer([{"i": 5}]) == [{"i": 5}]
+
+
+def test_client_is_unusable_after_a_protocol_error(socket_path):
+    with WorkerServer(SlowBackend(), socket_path=socket_path):
+        with WorkerClient(socket_path, codec="json", timeout=0.01) as client:
+            with pytest.raises(OSError):
+                client.infer([{"i": 0}])
+            with pytest.raises(exceptions.WorkerProtocolError, match="unusable"):
+                client.infer([{"i": 1}])
+
+
+def test_requests_after_close_fail(socket_path):
+    server = WorkerServer(helpers.ValidBackend(), socket_path=socket_path).start()
+    with WorkerClient(socket_path, codec="json", timeout=5) as client:
+        assert client.infer([{"i": 0}]) == [{"i": 0}]
+        server.close()
+
+        # The connection was open before the worker was closed
+        with pytest.raises(exceptions.InferenceBackendRuntimeError, match="closed"):
+            client.infer([{"i": 1}])
+
+
+def test_worker_requires_one_address():
+    with pytest.raises(ValueError):
+        WorkerServer(helpers.ValidBackend())
+
+
+class SlowBackend(helpers.ValidBackend):
+    def execute(self, inputs):
+        time.sleep(0.05)
+        return inputs
+
+
+def test_worker_sheds_requests_when_overloaded(socket_path):
+    backend = SlowBackend(admission={"max_queue_size": 1, "policy": "drop_newest"})
+    batches = [[{"i": i}] for i in range(10)]
+
+    def call(batch, results):
+        with WorkerClient(socket_path, codec="json") as client:
+            try:
+                results.append(client.infer(batch))
+            except exceptions.InferenceBackendRuntimeError:
+                results.append(None)
+
+    results = []
+    with WorkerServer(backend, socket_path=socket_path):
+        threads = [
+            threading.Thread(target=call, args=(batch, results)) for batch in batches
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    n_shed = results.count(None)
+    assert n_shed > 0
+    assert backend.get_metrics().shed_records == {"drop_newest": n_shed}
+
+
+class ConcurrentBackend(helpers.ValidBackend):
+    thread_safe = True
+
+    def execute(self, inputs):
+        time.sleep(0.05)
+        return inputs
+
+
+def test_worker_executors(socket_path):
+    with pytest.raises(ValueError, match="thread_safe"):
+        WorkerServer(helpers.ValidBackend(), socket_path=socket_path, n_executors=2)
+
+    backend = ConcurrentBackend()
+    with WorkerServer(backend, socket_path=socket_path, n_executors=4):
+        results = [None] * 4
+
+        def call(i):
+            with WorkerClient(socket_path) as client:
+                results[i] = client.infer([{"i": i}])
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [[{"i": i}] for i in range(4)]
+        assert time.perf_counter() - start < 0.15
+
+    # Every call records the queue metrics of its own request
+    aggregated = backend.get_aggregated_metrics()
+    assert aggregated.calls == 4
+    assert all(call.queue_depth is not None for call in backend._completed_calls)
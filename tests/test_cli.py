@@ -271,3 +271,31 @@ def test_cli_group_shows_validate(runner):
     result = runner.invoke(cli, ["--help"])
 
     assert "validate" in result.output
+
+
+def test_worker_requires_socket_or_port(runner, tmp_path):
+    """Test packflow worker fails without exactly one listening address"""
+    result = runner.invoke(cli, ["worker", str(tmp_path)])
+
+    assert result.exit_code == 1
+    assert "Error:" in result.output
+
+    result = runner.invoke(
+        cli, ["worker", str(tmp_path), "--socket", "w.sock", "--port", "9000"]
+    )
+
+    assert result.exit_code == 1
+
+
+def test_worker_invalid_project(runner, tmp_path):
+    """Test packflow worker reports a project that cannot be loaded"""
+    original_dir = os.getcwd()
+    try:
+        result = runner.invoke(
+            cli, ["worker", str(tmp_path), "--socket", str(tmp_path / "w.sock")]
+        )
+
+        assert result.exit_code == 1
+        assert "Error:" in result.output
+    finally:
+        os.chdir(original_dir)
@@ -4,7 +4,11 @@ import json
 import numpy as np
 import pytest
 
-from packflow.utils.normalize.normalize import ensure_native_types, ensure_valid_output
+from packflow.utils.normalize.normalize import (
+    columns_to_records,
+    ensure_native_types,
+    ensure_valid_output,
+)
 
 
 @pytest.mark.parametrize(
@@ -60,3 +64,55 @@ def test_ensure_valid_output(func_kwargs, expected_output, expectation):
         result = ensure_valid_output(**func_kwargs)
         assert result == expected_output
         assert json.dumps(result)
+
+
+@pytest.mark.parametrize(
+    "columns, names, expected_output",
+    [
+        (
+            {"label": np.array(["a", "b"]), "score": np.array([0.5, 1.0])},
+            None,
+            [{"label": "a", "score": 0.5}, {"label": "b", "score": 1.0}],
+        ),
+        (
+            {"label": ["a", "b"], "score": [1, 2], "extra": [None, None]},
+            ["score", "label"],
+            [{"score": 1, "label": "a"}, {"score": 2, "label": "b"}],
+        ),
+        (
+            np.array([[1, 2], [3, 4], [5, 6]], dtype="int64"),
+            ["x", "y"],
+            [{"x": 1, "y": 2}, {"x": 3, "y": 4}, {"x": 5, "y": 6}],
+        ),
+        (np.array([0.5, 1.5]), ["score"], [{"score": 0.5}, {"score": 1.5}]),
+        (np.zeros((0, 2)), ["x", "y"], []),
+        (
+            {"embedding": np.eye(2)},
+            None,
+            [{"embedding": [1.0, 0.0]}, {"embedding": [0.0, 1.0]}],
+        ),
+        ({0: [1, 2]}, None, [{0: 1}, {0: 2}]),
+    ],
+)
+def test_columns_to_records(columns, names, expected_output):
+    records = columns_to_records(columns, names)
+    assert records == expected_output
+    assert json.dumps(records, default=str)
+    for record, expected in zip(records, expected_output):
+        assert list(record) == list(expected)
+        assert all(type(record[k]) is type(v) for k, v in expected.items())
+
+
+@pytest.mark.parametrize(
+    "columns, names",
+    [
+        ({"a": [1, 2], "b": [1]}, None),
+        ({"a": [1, 2]}, ["a", "missing"]),
+        (np.zeros((2, 3)), ["a", "b"]),
+        (np.zeros((2, 3)), None),
+        (np.zeros((2, 3, 4)), ["a", "b", "c"]),
+    ],
+)
+def test_columns_to_records_errors(columns, names):
+    with pytest.raises(ValueError):
+        columns_to_records(columns, names)
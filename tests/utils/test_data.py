@@ -1,11 +1,18 @@
+import pickle
 from contextlib import nullcontext
 
 import numpy as np
 import pytest
 from packflow.utils.data import (
+    FlattenProjection,
+    RecordView,
+    check_delimiter_collisions,
     flatten_dict,
     flatten_records,
     get_nested_field,
+    group_by_layout,
+    has_delimiter_collisions,
+    layout_key,
     records_to_ndarray,
 )
 
@@ -163,3 +170,118 @@ def test_flatten_records(records, func_kwargs, expectation, expected_result):
     with expectation:
         result = flatten_records(records, **func_kwargs)
         assert result == expected_result
+
+
+PROJECTION_OBJ = {
+    "a": {"b": 1, "c": {"d": 2}, "e": {}},
+    "f": [{"g": 3}, {"g": 4}, []],
+    "h.i": {"j": 5},
+    "k": None,
+}
+
+
+@pytest.mark.parametrize(
+    "keys, flatten_lists",
+    [
+        (["a.b", "a.c.d"], False),
+        (["a.c"], False),  # non-empty dicts are never leaves
+        (["a.e", "k", "missing", "a.b.x"], False),
+        (["f"], False),
+        (["f.0.g", "f.1.g", "f.2", "f.3.g", "f.01.g"], True),
+        (["h.i.j"], True),  # keys containing the delimiter
+    ],
+)
+def test_flatten_projection(keys, flatten_lists):
+    expected = {
+        k: v
+        for k, v in flatten_dict(PROJECTION_OBJ, flatten_lists=flatten_lists).items()
+        if k in keys
+    }
+    projection = FlattenProjection(keys, flatten_lists=flatten_lists)
+    assert projection(PROJECTION_OBJ) == expected
+
+
+def test_flatten_projection_duplicated_key():
+    with pytest.raises(ValueError):
+        FlattenProjection(["a.b"])({"a": {"b": 1}, "a.b": 2})
+
+
+def test_record_view():
+    record = {"a": 1, "b": {"c": 2}}
+    view = RecordView(record, {"renamed": 3, "a": 0})
+
+    assert view == {"renamed": 3, "a": 1, "b": {"c": 2}}
+    assert list(view) == ["renamed", "a", "b"]
+    assert len(view) == 3
+    assert view["b"] is record["b"]
+    assert "renamed" in view and "missing" not in view
+    assert view.get("missing", 4) == 4
+
+
+def test_record_view_copy_on_write():
+    record = {"a": 1}
+    view = RecordView(record, {"renamed": 2})
+
+    view["c"] = 3
+    del view["a"]
+
+    assert view == {"renamed": 2, "c": 3}
+    assert record == {"a": 1}
+    assert view.materialize() is view.materialize()
+
+
+def test_record_view_pickles_as_dict():
+    view = RecordView({"a": 1}, {"b": 2})
+    restored = pickle.loads(pickle.dumps(view))
+    assert type(restored) is dict
+    assert restored == {"b": 2, "a": 1}
+
+
+@pytest.mark.parametrize(
+    "obj, delimiter",
+    [
+        ({}, "."),
+        ({"a": 1, "b": {"c": 2}}, "."),
+        ({"a": 1, "b": {"c.d": 2}}, "."),
+        ({"a.b": 1}, "."),
+        ({"a_": 1, "_b": 2}, "__"),  # delimiter spanning two keys
+        ({"a": {"b__c": 1}}, "__"),
+        ({"a": [{"b.c": 1}]}, "."),  # lists are not checked
+    ],
+)
+def test_has_delimiter_collisions(obj, delimiter):
+    assert has_delimiter_collisions(obj, delimiter) == bool(
+        check_delimiter_collisions(obj, delimiter)
+    )
+
+
+def test_group_by_layout():
+    records = [{"a": 1, "b": 2}, {}, {"a": 3, "b": 4}, {"b": 5, "a": 6}]
+    layouts = group_by_layout(records)
+    assert layouts == {
+        layout_key(records[0]): [0, 2],
+        layout_key(records[1]): [1],
+        layout_key(records[3]): [3],
+    }
+
+    with pytest.raises(ValueError):
+        group_by_layout([{}, []])
+
+
+def test_records_to_ndarray_mixed_layouts():
+    records = [
+        {"a": 1, "b": {"c": 2}, "z": 0},
+        {"b": {"c": 3}, "a": 4},
+        {"a": 5, "z": 0},  # nested field missing
+        {"a": 6, "x": 1, "z": 0},  # same layout key as the first record, no "b"
+        {"a.b": 7, "b.c": 8},  # literal keys containing the delimiter
+        {"a": 9, "b": {"c": 10}, "z": 0},
+    ]
+    features = ["a", "b.c"]
+    expected = np.array(
+        [[get_nested_field(record, field) for field in features] for record in records]
+    )
+
+    result = records_to_ndarray(records, features, layouts=group_by_layout(records))
+    assert result.tolist() == expected.tolist()
+    assert result.tolist() == records_to_ndarray(records, features).tolist()
@@ -0,0 +1,229 @@
+import datetime
+import ipaddress
+
+import numpy as np
+import pytest
+from packflow.utils.features import (
+    NetworkIndex,
+    encode_categorical,
+    hash_features,
+    pad_sequences,
+    parse_ip_addresses,
+    parse_timestamps,
+    timestamp_parts,
+    to_numeric,
+)
+
+
+@pytest.mark.parametrize(
+    "sequences, kwargs, expected_padded, expected_lengths",
+    [
+        (
+            [[1, 2, 3], None, [4]],
+            {"max_length": 2},
+            [[1, 2], [0, 0], [4, 0]],
+            [2, 0, 1],
+        ),
+        (
+            [[1.5], ()],
+            {"max_length": 2, "pad_value": -1},
+            [[1.5, -1], [-1, -1]],
+            [1, 0],
+        ),
+        (
+            [["a"], []],
+            {"max_length": 2, "pad_value": ""},
+            [["a", ""], ["", ""]],
+            [1, 0],
+        ),
+        ([None, None], {"max_length": 1}, [[0], [0]], [0, 0]),
+        ([], {"max_length": 3}, np.zeros((0, 3)), []),
+    ],
+)
+def test_pad_sequences(sequences, kwargs, expected_padded, expected_lengths):
+    padded, lengths = pad_sequences(sequences, **kwargs)
+    assert padded.shape == (len(sequences), kwargs["max_length"])
+    assert padded.tolist() == np.asarray(expected_padded).tolist()
+    assert lengths.tolist() == expected_lengths
+
+
+def test_pad_sequences_dtype():
+    padded, _ = pad_sequences([[1, 2], [3]], max_length=3, dtype="float32")
+    assert padded.dtype == np.float32
+
+
+def test_pad_sequences_invalid_value():
+    with pytest.raises(ValueError):
+        pad_sequences([[1], "abc"], max_length=2)
+
+
+@pytest.mark.parametrize(
+    "values, dtype, fill_value, expected",
+    [
+        ([1, None, 3], "int32", -1, [1, -1, 3]),
+        ([1.5, None, float("nan")], "float32", 0, [1.5, 0, 0]),
+        (["2", 3], "float64", 0, [2, 3]),
+        ([], "float32", 0, []),
+    ],
+)
+def test_to_numeric(values, dtype, fill_value, expected):
+    array = to_numeric(values, dtype=dtype, fill_value=fill_value)
+    assert array.dtype == np.dtype(dtype)
+    assert array.tolist() == expected
+
+
+def test_to_numeric_invalid_value():
+    with pytest.raises(ValueError):
+        to_numeric(["abc"])
+
+
+def test_encode_categorical():
+    codes = encode_categorical(
+        ["tcp", "udp", None, "icmp"], {"tcp": 1, "udp": 2}, dtype="int16"
+    )
+    assert codes.dtype == np.int16
+    assert codes.tolist() == [1, 2, 0, 0]
+
+
+def test_parse_timestamps():
+    values = [
+        "2024-01-02T03:04:05Z",
+        1704164645,
+        1704164645.5,
+        "2024-01-02 05:04:05+02:00",
+        "2024-01-01T21:34:05-05:30",
+        datetime.datetime(2024, 1, 2, 3, 4, 5),
+        "garbage",
+        None,
+        "",
+        float("nan"),
+        True,
+    ]
+    timestamps, valid = parse_timestamps(values)
+
+    assert timestamps.dtype == np.dtype("datetime64[s]")
+    assert valid.tolist() == [True] * 6 + [False] * 5
+    assert (timestamps[valid] == np.datetime64("2024-01-02T03:04:05")).all()
+    assert np.isnat(timestamps[~valid]).all()
+
+
+def test_parse_timestamps_numpy_scalars():
+    values = [
+        np.int64(1704164645123),
+        np.float64(1704164645123.0),
+        np.int32(0),
+        np.float32("nan"),
+        np.bool_(True),
+    ]
+    timestamps, valid = parse_timestamps(values, unit="ms", epoch_unit="ms")
+
+    assert valid.tolist() == [True, True, True, False, False]
+    assert (
+        timestamps[:2].tolist() == [datetime.datetime(2024, 1, 2, 3, 4, 5, 123000)] * 2
+    )
+    assert timestamps[2] == np.datetime64(0, "ms")
+
+
+@pytest.mark.parametrize(
+    "values, unit, epoch_unit, expected",
+    [
+        (["2024-01-02T03:04:05.123Z"], "ms", "s", "2024-01-02T03:04:05.123"),
+        ([1704164645123], "ms", "ms", "2024-01-02T03:04:05.123"),
+        ([1704164645123], "s", "ms", "2024-01-02T03:04:05"),
+        ([1704164645123456789], "ns", "ns", "2024-01-02T03:04:05.123456789"),
+    ],
+)
+def test_parse_timestamps_units(values, unit, epoch_unit, expected):
+    timestamps, _ = parse_timestamps(values, unit=unit, epoch_unit=epoch_unit)
+    assert timestamps[0] == np.datetime64(expected)
+
+
+def test_timestamp_parts():
+    timestamps = np.array(
+        ["2024-03-10T21:59:00", "NaT", "1969-12-31T23:00:00"], dtype="datetime64[s]"
+    )
+    parts = timestamp_parts(
+        timestamps, ["hour", "minute", "day_of_week", "day_of_month", "month"]
+    )
+    assert {part: values.tolist() for part, values in parts.items()} == {
+        "hour": [21, -1, 23],
+        "minute": [59, -1, 0],
+        "day_of_week": [6, -1, 2],
+        "day_of_month": [10, -1, 31],
+        "month": [3, -1, 12],
+    }
+
+
+def test_parse_ip_addresses():
+    addresses, valid = parse_ip_addresses(["10.0.0.1", "not an ip", None, "::1"])
+    assert addresses.dtype == np.uint32
+    assert addresses.tolist() == [int(ipaddress.ip_address("10.0.0.1")), 0, 0, 0]
+    assert valid.tolist() == [True, False, False, False]
+
+    addresses, valid = parse_ip_addresses(["2001:db8::1", "10.0.0.1"], version=6)
+    assert addresses.shape == (2, 2)
+    assert [(high << 64) + low for high, low in addresses.tolist()] == [
+        int(ipaddress.ip_address("2001:db8::1")),
+        int(ipaddress.ip_address("::ffff:10.0.0.1")),
+    ]
+    assert valid.all()
+
+
+@pytest.mark.parametrize("version", [4, 6])
+def test_network_index(version):
+    networks = [
+        "10.0.0.0/8",
+        "10.1.0.0/16",
+        "192.168.0.0/16",
+        "10.1.2.0/24",
+        "10.0.0.0/8",
+    ]
+    if version == 6:
+        networks.append("2001:db8::/32")
+    index = NetworkIndex(networks, version=version)
+
+    cases = {
+        "9.255.255.255": -1,
+        "10.0.0.0": 0,
+        "10.1.0.0": 1,
+        "10.1.2.255": 3,
+        "10.1.3.0": 1,
+        "10.255.255.255": 0,
+        "11.0.0.0": -1,
+        "192.168.10.10": 2,
+        "255.255.255.255": -1,
+    }
+    if version == 6:
+        cases.update({"2001:db8::1": 5, "2001:db9::": -1})
+
+    addresses, _ = parse_ip_addresses(list(cases), version=version)
+    assert index.lookup(addresses).tolist() == list(cases.values())
+
+
+def test_network_index_version_mismatch():
+    with pytest.raises(ValueError):
+        NetworkIndex(["2001:db8::/32"], version=4)
+
+
+def test_hash_features():
+    values = ["example.com", ["GET", "/index.html"], None, 5]
+    vectors = hash_features(values, n_features=4)
+
+    assert vectors.dtype == np.float32
+    # CRC-32 hashes are stable across processes
+    assert vectors.tolist() == [[0, 1, 0, 0], [0, 0, 2, 0], [0, 0, 0, 0], [0, 0, 1, 0]]
+    assert np.array_equal(hash_features(values, n_features=4), vectors)
+    assert not np.array_equal(hash_features(values, n_features=4, seed=1), vectors)
+
+    signed = hash_features(values, n_features=4, alternate_sign=True)
+    assert (np.abs(signed) <= vectors).all()
+
+    assert hash_features([], n_features=4).shape == (0, 4)
+
+
+def test_hash_features_sparse():
+    pytest.importorskip("scipy")
+    values = ["example.com", ["GET", "/index.html"], None]
+    vectors = hash_features(values, n_features=4, sparse=True)
+    assert vectors.format == "csr"
+    assert np.array_equal(vectors.toarray(), hash_features(values, n_features=4))
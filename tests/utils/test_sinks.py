@@ -0,0 +1,104 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from packflow.utils import RecordView
+from packflow.utils.sinks import NDJSONSink, encode_json, orjson_available
+
+ENCODERS = [
+    False,
+    pytest.param(
+        True,
+        marks=pytest.mark.skipif(not orjson_available(), reason="orjson not installed"),
+    ),
+]
+
+
+@pytest.mark.parametrize("use_orjson", ENCODERS)
+@pytest.mark.parametrize(
+    "obj, expected",
+    [
+        ({"a": 1, "b": "x", "c": None}, {"a": 1, "b": "x", "c": None}),
+        ({"score": np.float32(0.5), "n": np.int64(3)}, {"score": 0.5, "n": 3}),
+        ({"probs": np.array([[0.5, 0.25]])}, {"probs": [[0.5, 0.25]]}),
+        (
+            {"view": np.arange(6)[::2], "flag": np.bool_(True)},
+            {"view": [0, 2, 4], "flag": True},
+        ),
+        ({1: "int key", "big": 2**70}, {"1": "int key", "big": 2**70}),
+        (RecordView({"a": 1}, {"b": np.int8(2)}), {"b": 2, "a": 1}),
+        ([{"a": (1, 2)}], [{"a": [1, 2]}]),
+    ],
+)
+def test_encode_json(obj, expected, use_orjson):
+    assert json.loads(encode_json(obj, use_orjson=use_orjson)) == expected
+
+
+@pytest.mark.parametrize("use_orjson", ENCODERS)
+def test_encode_json_non_finite_floats(use_orjson):
+    obj = {
+        "nan": float("nan"),
+        "inf": [float("inf"), -float("inf"), 1.5],
+        "score": np.float32("nan"),
+        "probs": np.array([np.nan, 0.5]),
+        "view": RecordView({"a": 1}, {"b": np.float64("inf")}),
+    }
+    encoded = encode_json(obj, use_orjson=use_orjson)
+    assert json.loads(encoded) == {
+        "nan": None,
+        "inf": [None, None, 1.5],
+        "score": None,
+        "probs": [None, 0.5],
+        "view": {"b": None, "a": 1},
+    }
+    if orjson_available():
+        # Both encoders produce the same output
+        assert encoded == encode_json(obj, use_orjson=not use_orjson)
+
+
+@pytest.mark.parametrize("use_orjson", ENCODERS)
+def test_encode_json_unsupported_type(use_orjson):
+    with pytest.raises(TypeError):
+        encode_json({"a": object()}, use_orjson=use_orjson)
+
+
+@pytest.mark.parametrize("use_orjson", ENCODERS)
+@pytest.mark.parametrize("stream_type", [io.BytesIO, io.StringIO])
+def test_ndjson_sink_streams(stream_type, use_orjson):
+    stream = stream_type()
+    records = [{"i": np.int32(i), "label": "é"} for i in range(100)]
+
+    with NDJSONSink(stream, buffer_size=64, use_orjson=use_orjson) as sink:
+        sink.write({"first": True})
+        assert sink.write_many(iter(records)) == 100
+
+    assert sink.n_written == 101
+    assert not stream.closed
+
+    value = stream.getvalue()
+    lines = (value.decode("utf-8") if isinstance(value, bytes) else value).splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"first": True},
+        *({"i": i, "label": "é"} for i in range(100)),
+    ]
+
+
+def test_ndjson_sink_path(tmp_path):
+    path = tmp_path / "outputs.ndjson"
+    with NDJSONSink(path) as sink:
+        sink.write_many({"i": i} for i in range(3))
+
+    assert path.read_text().splitlines() == ['{"i":0}', '{"i":1}', '{"i":2}']
+
+
+def test_ndjson_sink_text_file(tmp_path):
+    path = tmp_path / "outputs.ndjson"
+    with path.open("w") as f:
+        f.write("header\n")
+        with NDJSONSink(f) as sink:
+            sink.write({"i": 0})
+        f.write("footer\n")
+
+    assert path.read_text().splitlines() == ["header", '{"i":0}', "footer"]
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Measure the per-request overhead of the packflow worker protocol against HTTP+JSON.
+
+Both servers wrap the same no-op backend, so the reported latency is pure transport and
+serialization overhead. The HTTP baseline uses a keep-alive connection to a stdlib
+http.server, which is the cheapest HTTP path available without extra dependencies.
+
+Run from the packflow/ directory:
+    python tools/bench_worker.py [--requests 5000] [--batch-size 8]
+"""
+
+import argparse
+import http.client
+import json
+import socket
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import packflow
+from packflow.serving import WorkerClient, WorkerServer
+from packflow.serving.protocol import msgpack_available
+
+
+class EchoBackend(packflow.InferenceBackend):
+    def execute(self, inputs):
+        return inputs
+
+
+def serve_http(backend):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            payload = json.dumps(backend(json.loads(body))).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_http(port, batch, n_requests):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.connect()
+    conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        conn.request(
+            "POST",
+            "/",
+            body=json.dumps(batch),
+            headers={"Content-Type": "application/json"},
+        )
+        json.loads(conn.getresponse().read())
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def bench_worker(client, batch, n_requests, pipelined=False):
+    start = time.perf_counter()
+    if pipelined:
+        for _ in client.infer_many(batch for _ in range(n_requests)):
+            pass
+    else:
+        for _ in range(n_requests):
+            client.infer(batch)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    backend = EchoBackend()
+    batch = [
+        {"src_ip": "10.0.0.1", "dst_port": 443, "bytes": 1024, "proto": "tcp"}
+    ] * args.batch_size
+
+    http_server = serve_http(backend)
+    results = {
+        "http+json": bench_http(http_server.server_address[1], batch, args.requests)
+    }
+    http_server.shutdown()
+
+    codecs = ["json"] + (["msgpack"] if msgpack_available() else [])
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = Path(tmp) / "bench.sock"
+        with WorkerServer(backend, socket_path=socket_path):
+            for codec in codecs:
+                with WorkerClient(socket_path, codec=codec) as client:
+                    results[f"uds+{codec}"] = bench_worker(client, batch, args.requests)
+                    results[f"uds+{codec} (pipelined)"] = bench_worker(
+                        client, batch, args.requests, pipelined=True
+                    )
+
+    baseline = results["http+json"]
+    print(f"{args.requests} requests of {args.batch_size} records")
+    for name, elapsed in results.items():
+        per_request_us = elapsed / args.requests * 1e6
+        print(
+            f"  {name:<24} {per_request_us:8.1f} us/request  ({baseline / elapsed:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()